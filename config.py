@@ -9,13 +9,57 @@ GRID_SIZE = 5
 CELL_SIZE = 60
 WINDOW_TITLE = "Modern Baccarat Analiz & Tahmin (Martingale+DB+WL Tahmin)"
 MAX_HISTORY_IN_GRID = GRID_SIZE * GRID_SIZE
+ROAD_ROWS = 6  # Big Road ve türetilmiş yolların satır sayısı
+ROAD_DISPLAY_COLS = 24  # Yol görünümünde gösterilecek son fiziksel sütun sayısı
 WL_GRID_ROWS = 12
 WL_GRID_COLS = 2
 WL_CELL_SIZE = int(CELL_SIZE * 0.55)
 MAX_WL_DISPLAY = WL_GRID_ROWS * WL_GRID_COLS
 DB_FILE = 'baccarat_history.db'
+DB_SHARD_FILE_PATTERN = 'baccarat_table_{table_id}.db'  # Masa başına ayrı veritabanı dosyası
+MAX_OPEN_SHARDS = 8  # Aynı anda açık tutulacak en fazla masa veritabanı sayısı
+MEMORY_DB_URI_PATTERN = 'file:baccarat_memory_{table_id}?mode=memory&cache=shared'  # Simülasyon için paylaşılan bellek içi veritabanı
+SIMULATION_DB_FILE = 'baccarat_simulation.db'  # Bellek içi veritabanının anlık görüntü dosyası
+SIMULATION_SHARD_FILE_PATTERN = 'baccarat_simulation_table_{table_id}.db'  # Masa başına anlık görüntü dosyası
+ARCHIVE_DB_FILE = 'baccarat_archive.db'  # Sıkıştırma ile taşınan eski shoe'ların arşiv veritabanı
+ARCHIVE_SHARD_FILE_PATTERN = 'baccarat_archive_table_{table_id}.db'  # Masa başına arşiv veritabanı dosyası
+COMPACTION_KEEP_SHOES = 20  # Sıkıştırmada sıcak veritabanında bırakılacak son shoe sayısı
 DB_LOOKBACK = 4  # Veritabanı modelinde ne kadar geriye bakılacağı (dizi uzunluğu)
 DB_WRITE_INTERVAL = 5000  # DB'ye yazma aralığı (milisaniye)
+CROSS_SHOE_DECAY = 0.85  # Shoe'lar arası modelde her eski shoe için ağırlık çarpanı
+CROSS_SHOE_MIN_WEIGHT = 1.0  # Shoe'lar arası modelin tahmin yapması için gereken minimum ağırlık
+EXPORT_BATCH_SIZE = 5000  # Dışa aktarmada her fetchmany çağrısında okunacak satır sayısı
+IMPORT_BATCH_SIZE = 50000  # İçe aktarmada her işlemde (transaction) yazılacak satır sayısı
+SQL_PROFILING = False  # True ise veritabanı sorguları ölçülür ve kapanışta rapor yazdırılır
+SQL_PROFILE_EXPLAIN = False  # Profillemede her sorgunun ilk çalışmasında EXPLAIN QUERY PLAN saklanır
+SQL_PROFILE_WINDOW = 1000  # Profillemede cümle başına p50/p95/p99 için tutulan son ölçüm sayısı
+ADAPTIVE_MAX_ORDER = 8  # Değişken dereceli adaptif modelde en uzun bağlam
+ADAPTIVE_MIN_SUPPORT = 2  # Bir bağlamın tahminde kullanılması için gereken en az hata sayısı
+MISTAKE_STORE_CAPACITY = 4096  # Shoe'lar arası hata hafızasında tutulacak en fazla desen
+MISTAKE_STORE_HALF_LIFE = 3.0  # Hata ağırlıklarının yarıya indiği süre (shoe)
+MISTAKE_STORE_MIN_WEIGHT = 0.05  # Bu ağırlığın altındaki desenler kullanılmaz ve atılır
+MISTAKE_STORE_EVICT_FRACTION = 0.1  # Kapasite aşıldığında bir seferde atılacak desen oranı
+MISTAKE_STORE_POLICY = 'lru'  # Atma politikası: 'lru' veya 'lfu'
+ADAPTIVE_COLOR_SYMMETRY = False  # True ise desen ve P/B ayna görüntüsü tek kayıtta birleştirilir
+GRID_WRITE_RETRIES = 5  # Grid hatası yazıcısının kilitli veritabanında toplu yazmayı deneme sayısı
+GRID_WRITE_RETRY_DELAY = 0.05  # İlk yeniden deneme beklemesi (saniye); her denemede iki katına çıkar
+ACCURACY_WINDOWS = (20, 50, 200)  # Model başına pencereli doğruluk için son tahmin sayıları
+ACCURACY_DECAY = 0.97  # Sönümlü doğrulukta her yeni tahminde eski ağırlık çarpanı
+MODEL_RANKING_METRIC = 'lifetime'  # En iyi modeli belirleyen ölçüt: 'lifetime', 'window_20', 'window_50', 'window_200' veya 'decayed'
+ENSEMBLE_LEARNING_RATE = 0.05  # Topluluk modelinin (lojistik regresyon) öğrenme oranı
+ENSEMBLE_L2 = 0.001  # Topluluk modelinde ağırlık küçültme katsayısı
+ENSEMBLE_MARGIN = 0.02  # Olasılık 0.5 ± bu değer içindeyse topluluk tahmin yapmaz
+MARKOV_ORDER = 6  # Markov zinciri modelinin derecesi (bağlamdaki son sonuç sayısı, en fazla 16)
+MARKOV_MIN_COUNT = 5  # Markov modelinin tahmin yapması için durumda gereken en az geçiş sayısı
+MODEL_LATENCY_WINDOW = 1000  # Model başına p50/p99 tahmin süresi için tutulan son ölçüm sayısı
+MODEL_SELECTOR = 'argmax'  # Oynanacak modeli seçen yöntem: 'argmax', 'thompson' veya 'ucb'
+MODEL_SELECTOR_PRIOR = (1.0, 1.0)  # Model seçicide her model için Beta ön dağılımı (alfa, beta)
+MODEL_SELECTOR_DISCOUNT = 1.0  # Seçicide her gözlemde eski sayımların çarpanı (1.0: unutma yok)
+MODEL_SELECTOR_UCB_EXPLORATION = 2.0  # UCB seçicide güven payı katsayısı
+RESULT_STORE_BACKEND = 'sqlite'  # Sonuç deposu: 'sqlite', 'memory' veya 'binlog'
+BINLOG_FILE = 'baccarat_results.binlog'  # 'binlog' deposunun günlük dosyası
+BINLOG_SHARD_FILE_PATTERN = 'baccarat_table_{table_id}.binlog'  # Masa başına günlük dosyası
+RESULT_STORAGE_LAYOUT = 'rows'  # Sonuç saklama düzeni: 'rows' (el başına satır) veya 'packed' (shoe başına bit paketli satır)
 
 # --- Emojiler ---
 UNDO_EMOJI = "↩️"
@@ -0,0 +1,261 @@
+"""
+baccarat veritabanı için toplu dışa ve içe aktarma araçları.
+Dışa aktarma, sunucu taraflı cursor üzerinde fetchmany ile parça parça okur; bellek
+kullanımı tablo boyutundan bağımsızdır. results dosyası paketlenmiş düzendeki
+(shoe_results) shoe'ları da el başına satır olarak içerir. İçe aktarma, sonuçları
+tek bir işlem içinde executemany ile yazar ve indeksleri yükleme bitince yeniden
+oluşturur; hata olursa hiçbir satır yazılmaz.
+"""
+import csv
+import json
+import os
+import sqlite3
+
+from config import DB_FILE, EXPORT_BATCH_SIZE, IMPORT_BATCH_SIZE
+from models.migrations import apply_migrations
+from models.packed_storage import unpack_outcomes
+from models.shoe_summary import backfill_summaries
+
+EXPORT_TABLES = ['results', 'shoe_tracker', 'shoe_summary', 'adaptive_learning', 'grid_mistake_patterns']
+EXPORT_FORMATS = {'csv': 'csv', 'jsonl': 'jsonl', 'parquet': 'parquet'}
+INSERT_RESULT_SQL = "INSERT INTO results (shoe_id, winner, timestamp) VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))"
+
+def _open_database(db_file):
+    """Göçleri uygulanmış bir veritabanı bağlantısı açar."""
+    connection = sqlite3.connect(db_file)
+    apply_migrations(connection)
+    return connection
+
+def _arrow_schema(connection, table):
+    """Tablonun SQLite kolon tiplerinden pyarrow şeması oluşturur."""
+    import pyarrow as pa
+
+    type_map = {'INTEGER': pa.int64(), 'REAL': pa.float64(), 'BLOB': pa.binary()}
+    cursor = connection.cursor()
+    cursor.execute(f"PRAGMA table_info({table})")
+    return pa.schema([(name, type_map.get(col_type.upper(), pa.string()))
+                      for _, name, col_type, *_ in cursor.fetchall()])
+
+def _iter_batches(cursor, batch_size):
+    """Cursor sonuçlarını fetchmany ile parça parça döndürür."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+def _iter_packed_result_rows(connection, columns, batch_size):
+    """Yalnızca paketlenmiş düzende bulunan shoe'ları results satırları olarak parça parça döndürür.
+
+    Satırlar verilen results kolonlarının sırasındadır; paketlenmiş ellerin id ve
+    zaman damgası yoktur (None yazılır).
+    """
+    shoe_index, winner_index = columns.index('shoe_id'), columns.index('winner')
+    cursor = connection.cursor()
+    cursor.execute("""
+        SELECT shoe_id, outcomes, hand_count FROM shoe_results s
+        WHERE hand_count > 0 AND NOT EXISTS (SELECT 1 FROM results r WHERE r.shoe_id = s.shoe_id)
+        ORDER BY shoe_id
+    """)
+    rows = []
+    for shoe_id, packed, hand_count in cursor:
+        for winner in unpack_outcomes(bytes(packed), hand_count):
+            row = [None] * len(columns)
+            row[shoe_index], row[winner_index] = shoe_id, winner
+            rows.append(tuple(row))
+        while len(rows) >= batch_size:
+            yield rows[:batch_size]
+            rows = rows[batch_size:]
+    if rows:
+        yield rows
+
+def _iter_export_batches(connection, table, batch_size):
+    """Tablonun kolon adlarını ve satır parçalarını döndürür.
+
+    Returns:
+        tuple: (kolon adları, satır parçalarının üreteci).
+    """
+    cursor = connection.cursor()
+    # Aktarılan tabloların hiçbiri WITHOUT ROWID değildir; rowid sırası ekleme sırasıdır
+    cursor.execute(f"SELECT * FROM {table} ORDER BY rowid")
+    columns = [description[0] for description in cursor.description]
+
+    def batches():
+        yield from _iter_batches(cursor, batch_size)
+        if table == 'results':
+            yield from _iter_packed_result_rows(connection, columns, batch_size)
+
+    return columns, batches()
+
+def export_table(connection, table, output_path, fmt='csv', batch_size=EXPORT_BATCH_SIZE):
+    """Bir tabloyu akış halinde dosyaya yazar.
+
+    Args:
+        connection (sqlite3.Connection): Veritabanı bağlantısı.
+        table (str): Tablo adı (EXPORT_TABLES içinden).
+        output_path (str): Hedef dosya yolu.
+        fmt (str, optional): 'csv', 'jsonl' veya 'parquet'.
+        batch_size (int, optional): Her fetchmany çağrısında okunacak satır sayısı.
+
+    Returns:
+        int: Yazılan satır sayısı.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Dışa aktarılamayan tablo: {table}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+    columns, batches = _iter_export_batches(connection, table, batch_size)
+    row_count = 0
+
+    if fmt == 'csv':
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for rows in batches:
+                writer.writerows(rows)
+                row_count += len(rows)
+
+    elif fmt == 'jsonl':
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for rows in batches:
+                f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+                row_count += len(rows)
+
+    else:
+        # Kolon bazlı format isteğe bağlı pyarrow paketini gerektirir
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema(connection, table)
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for rows in batches:
+                # Her parça ayrı bir row group olarak yazılır
+                writer.write_table(pa.Table.from_pydict(
+                    {name: [row[i] for row in rows] for i, name in enumerate(columns)}, schema=schema))
+                row_count += len(rows)
+
+    return row_count
+
+def export_database(output_dir, fmt='csv', tables=None, db_file=DB_FILE, batch_size=EXPORT_BATCH_SIZE):
+    """Sonuç, shoe ve hata tablolarını ayrı dosyalara dışa aktarır.
+
+    Args:
+        output_dir (str): Hedef klasör.
+        fmt (str, optional): 'csv', 'jsonl' veya 'parquet'.
+        tables (list, optional): Aktarılacak tablolar (varsayılan EXPORT_TABLES).
+        db_file (str, optional): Kaynak veritabanı dosyası.
+        batch_size (int, optional): fetchmany parça boyutu.
+
+    Returns:
+        dict: Tablo adı-satır sayısı çiftleri.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    connection = _open_database(db_file)
+    counts = {}
+    try:
+        for table in tables or EXPORT_TABLES:
+            output_path = os.path.join(output_dir, f"{table}.{EXPORT_FORMATS[fmt]}")
+            counts[table] = export_table(connection, table, output_path, fmt, batch_size)
+            print(f"{table}: {counts[table]} satır '{output_path}' dosyasına yazıldı.")
+    finally:
+        connection.close()
+    return counts
+
+def _iter_input_rows(input_path, fmt, batch_size):
+    """Girdi dosyasındaki satırları sözlük olarak akış halinde döndürür."""
+    if fmt == 'csv':
+        with open(input_path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    elif fmt == 'jsonl':
+        with open(input_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    else:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=['shoe_id', 'winner', 'timestamp']):
+            yield from batch.to_pylist()
+
+def import_results(input_path, fmt=None, db_file=DB_FILE, batch_size=IMPORT_BATCH_SIZE):
+    """Sonuçları dosyadan results tablosuna toplu olarak yükler.
+
+    Dosyada en az shoe_id ve winner kolonları bulunmalıdır (timestamp isteğe bağlıdır). results üzerindeki
+    ikincil indeksler yükleme süresince kaldırılır ve sonunda tek seferde
+    yeniden oluşturulur; satırlar batch_size boyutunda parçalarla tek bir işlemde
+    yazılır. Herhangi bir satırda hata olursa işlem geri alınır ve hata iletilir.
+    Shoe özetleri yüklenen sonuçlardan yeniden hesaplanır.
+
+    Args:
+        input_path (str): Girdi dosyası.
+        fmt (str, optional): 'csv', 'jsonl' veya 'parquet' (varsayılan dosya uzantısı).
+        db_file (str, optional): Hedef veritabanı dosyası.
+        batch_size (int, optional): Her işlemde yazılacak satır sayısı.
+
+    Returns:
+        int: Yüklenen sonuç sayısı.
+    """
+    fmt = fmt or os.path.splitext(input_path)[1].lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+    connection = _open_database(db_file)
+    cursor = connection.cursor()
+    imported = skipped = 0
+    shoe_ids = set()
+
+    # Yükleme süresince sağlamlık yerine hız: her işlemde fsync yapılmaz
+    cursor.execute("PRAGMA synchronous = OFF")
+
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'results' AND sql IS NOT NULL")
+    deferred_indexes = cursor.fetchall()
+    try:
+        # İndeks silme de aynı işlemdedir; geri almada indeksler de geri gelir
+        cursor.execute("BEGIN")
+        for name, _ in deferred_indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+        batch = []
+        for row in _iter_input_rows(input_path, fmt, batch_size):
+            winner = row.get('winner')
+            if winner not in ('P', 'B'):
+                skipped += 1
+                continue
+            shoe_id = int(row['shoe_id'])
+            shoe_ids.add(shoe_id)
+            batch.append((shoe_id, winner, row.get('timestamp') or None))
+
+            if len(batch) >= batch_size:
+                cursor.executemany(INSERT_RESULT_SQL, batch)
+                imported += len(batch)
+                batch.clear()
+
+        if batch:
+            cursor.executemany(INSERT_RESULT_SQL, batch)
+            imported += len(batch)
+
+        cursor.executemany("INSERT OR IGNORE INTO shoe_tracker (shoe_id) VALUES (?)",
+                           [(shoe_id,) for shoe_id in sorted(shoe_ids)])
+        # Shoe'lar arası desen özeti bir sonraki açılışta yeniden hesaplanır
+        cursor.execute("DELETE FROM pattern_aggregate_meta")
+        backfill_summaries(cursor, shoe_ids)
+
+        # Ertelenen indeksler tek geçişte yeniden oluşturulur
+        for _, sql in deferred_indexes:
+            cursor.execute(sql.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+        connection.commit()
+        cursor.execute("ANALYZE")
+        connection.commit()
+    except (sqlite3.Error, ValueError, KeyError):
+        connection.rollback()
+        print("İçe aktarma hatası: hiçbir sonuç yazılmadı.")
+        raise
+    finally:
+        connection.close()
+
+    print(f"{imported} sonuç içe aktarıldı ({skipped} geçersiz satır atlandı, {len(shoe_ids)} shoe).")
+    return imported
\ No newline at end of file
@@ -8,19 +8,68 @@ from PyQt6.QtWidgets import QApplication
 # Modülleri doğrudan içe aktar
 from models.game_history import GameHistory
 from models.prediction import PredictionModel
-from models.database import DatabaseManager
+from models.database import get_db_file, get_last_shoe_id
+from models.result_store import RESULT_STORE_BACKENDS, create_result_store
+from models.shard_router import ShardRouter
+from models.accuracy_tracker import RANKING_METRICS
+from models.model_selection import SELECTORS
 from ui.main_window import MainWindow
 
 # Veritabanı başlatıcıyı içe aktar
 from database_initializer import initialize_all_data
+from data_transfer import EXPORT_FORMATS, export_database, import_results
+from shoe_compaction import compact_database
+from selector_backtest import run_selector_backtest
+from config import (COMPACTION_KEEP_SHOES, RESULT_STORE_BACKEND, ARCHIVE_DB_FILE, ARCHIVE_SHARD_FILE_PATTERN,
+                    SIMULATION_DB_FILE, MODEL_RANKING_METRIC, MODEL_SELECTOR)
 
 def main():
     """Uygulamayı başlatır."""
     # Komut satırı argümanlarını işle
     parser = argparse.ArgumentParser(description='Baccarat Analiz & Tahmin Uygulaması')
     parser.add_argument('--init-db', action='store_true', help='Veritabanını test verileriyle başlat')
+    parser.add_argument('--table-id', type=int, metavar='MASA', help='Masa ID\'si; her masa ayrı veritabanı dosyası kullanır')
+    parser.add_argument('--memory-db', action='store_true',
+                        help=f'Veritabanını bellekte tut; diske yalnızca shoe sonlarında ve Ctrl+S ile anlık görüntü yaz ({SIMULATION_DB_FILE})')
+    parser.add_argument('--result-store', choices=RESULT_STORE_BACKENDS, default=RESULT_STORE_BACKEND,
+                        help=f'Sonuç deposu arka ucu (varsayılan: {RESULT_STORE_BACKEND})')
+    parser.add_argument('--ranking-metric', choices=RANKING_METRICS, default=MODEL_RANKING_METRIC,
+                        help=f'En iyi modeli belirleyen doğruluk ölçütü (varsayılan: {MODEL_RANKING_METRIC})')
+    parser.add_argument('--model-selector', choices=sorted(SELECTORS), default=MODEL_SELECTOR,
+                        help=f'Oynanacak modeli seçen yöntem (varsayılan: {MODEL_SELECTOR})')
+    parser.add_argument('--backtest-selectors', nargs='?', type=int, const=0, metavar='N',
+                        help='Model seçicilerini son N shoe (varsayılan tümü) üzerinde karşılaştır, pişmanlıklarını yazdır ve çık')
+    parser.add_argument('--export', metavar='KLASÖR', help='Sonuç, shoe ve hata tablolarını klasöre aktar ve çık')
+    parser.add_argument('--import-results', metavar='DOSYA', help='Sonuçları dosyadan toplu olarak yükle ve çık')
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), help='Dışa/içe aktarma formatı (varsayılan: csv / dosya uzantısı)')
+    parser.add_argument('--compact', nargs='?', type=int, const=COMPACTION_KEEP_SHOES, metavar='N',
+                        help=f'Son N shoe dışındakileri özetle, arşive taşı ve çık (varsayılan N={COMPACTION_KEEP_SHOES})')
+    parser.add_argument('--compact-older-than-days', type=int, metavar='GÜN', help='Sıkıştırmada yalnızca bu kadar günden eski shoe\'ları arşivle')
     args = parser.parse_args()
     
+    # Seçicilerin geriye dönük testi (arayüz açılmadan)
+    if args.backtest_selectors is not None:
+        run_selector_backtest(get_db_file(args.table_id), args.backtest_selectors or None)
+        return
+    
+    # Eski shoe'ları arşivle (arayüz açılmadan)
+    if args.compact is not None:
+        archive_file = ARCHIVE_DB_FILE if args.table_id is None else ARCHIVE_SHARD_FILE_PATTERN.format(table_id=args.table_id)
+        compact_database(args.compact, args.compact_older_than_days,
+                         db_file=get_db_file(args.table_id), archive_file=archive_file)
+        return
+    
+    # Toplu veri aktarımı (arayüz açılmadan)
+    if args.export or args.import_results:
+        try:
+            if args.export:
+                export_database(args.export, args.format or 'csv', db_file=get_db_file(args.table_id))
+            if args.import_results:
+                import_results(args.import_results, args.format, db_file=get_db_file(args.table_id))
+        except ImportError:
+            print("Parquet formatı için 'pyarrow' paketi gerekli.")
+        return
+    
     # Veritabanını başlat (istenirse)
     if args.init_db:
         initialize_all_data()
@@ -31,8 +80,23 @@ def main():
     
     # Model nesnelerini oluştur
     game_history = GameHistory()
-    prediction_model = PredictionModel()
-    db_manager = DatabaseManager()
+    # Bellek içi modda veritabanı önce açılır, anlık görüntü diğer modeller bağlanmadan yüklenir
+    shard_models = {}
+    if args.result_store == 'sqlite':
+        # Masanın sonuç deposu ve masa başına modelleri yönlendiricinin parçasından alınır
+        router = ShardRouter(in_memory=args.memory_db)
+        shard = router.shard(args.table_id)
+        db_manager = shard.results
+        shard_models = {'cross_shoe_model': shard.cross_shoe, 'markov_model': shard.markov}
+    else:
+        # Tahmin modelleri masanın SQLite dosyasını kullanmaya devam eder; shoe numaraları
+        # oradaki son shoe'dan devam etmezse modeller geriye giden shoe ID'leri görür
+        first_shoe_id = get_last_shoe_id(get_db_file(args.table_id, args.memory_db)) + 1
+        db_manager = create_result_store(args.result_store, table_id=args.table_id, first_shoe_id=first_shoe_id)
+    prediction_model = PredictionModel(table_id=args.table_id, in_memory=args.memory_db,
+                                       ranking_metric=args.ranking_metric, selector=args.model_selector,
+                                       **shard_models)
+    prediction_model.set_current_shoe_id(db_manager.current_shoe_id)
     
     # Veritabanı tahmin işlevini PredictionModel'e bağla
     prediction_model.set_db_prediction_function(
@@ -0,0 +1,71 @@
+"""
+Model başına pencereli ve sönümlü doğruluk takibi.
+Son tahmin sonuçları sabit boyutlu bir halka tamponda tutulur; her pencere
+(son 20/50/200 tahmin) için isabet sayısı tampona giren ve pencereden çıkan
+sonuçla güncellenir. Sönümlü doğruluk üstel ağırlıklı ortalamadır. Her
+kayıt pencere sayısından bağımsız olarak O(1) maliyetlidir.
+"""
+from config import ACCURACY_WINDOWS, ACCURACY_DECAY
+
+# Sıralamada kullanılabilecek ölçütler
+RANKING_METRICS = ['lifetime'] + [f'window_{window}' for window in ACCURACY_WINDOWS] + ['decayed']
+
+class AccuracyTracker:
+    """Bir modelin son tahminlerine göre doğruluk oranlarını tutan sınıf."""
+
+    def __init__(self, windows=ACCURACY_WINDOWS, decay=ACCURACY_DECAY):
+        """
+        Args:
+            windows (tuple, optional): Pencere boyutları.
+            decay (float, optional): Sönümlü doğruluk için her yeni tahminde eski ağırlık çarpanı (0-1 arasında).
+        """
+        self.windows = tuple(windows)
+        self.decay = decay
+        self.capacity = max(self.windows)
+        self.buffer = bytearray(self.capacity)  # Halka tampon: 1 doğru, 0 yanlış
+        self.position = 0
+        self.count = 0
+        self.window_hits = dict.fromkeys(self.windows, 0)
+        self.decayed_hits = 0.0
+        self.decayed_total = 0.0
+
+    def record(self, is_correct):
+        """Bir tahmin sonucunu ekler.
+
+        Args:
+            is_correct (bool): Tahmin doğru muydu?
+        """
+        hit = 1 if is_correct else 0
+        for window in self.windows:
+            # Pencereden çıkan en eski sonuç
+            if self.count >= window:
+                self.window_hits[window] -= self.buffer[(self.position - window) % self.capacity]
+            self.window_hits[window] += hit
+        self.buffer[self.position] = hit
+        self.position = (self.position + 1) % self.capacity
+        self.count += 1
+
+        self.decayed_hits = self.decay * self.decayed_hits + hit
+        self.decayed_total = self.decay * self.decayed_total + 1
+
+    def window_accuracy(self, window):
+        """Son window tahmindeki doğruluk oranını döndürür (yüzde)."""
+        size = min(self.count, window)
+        return self.window_hits[window] / size * 100 if size else 0.0
+
+    def decayed_accuracy(self):
+        """Üstel ağırlıklı doğruluk oranını döndürür (yüzde)."""
+        return self.decayed_hits / self.decayed_total * 100 if self.decayed_total else 0.0
+
+    def accuracy(self, metric):
+        """Ölçüte göre doğruluk oranını döndürür.
+
+        Args:
+            metric (str): 'window_<boyut>' veya 'decayed'.
+
+        Returns:
+            float: Doğruluk oranı (yüzde).
+        """
+        if metric == 'decayed':
+            return self.decayed_accuracy()
+        return self.window_accuracy(int(metric[len('window_'):]))
\ No newline at end of file
@@ -3,62 +3,65 @@ AdaptiveLearningModel için shoe takibi iyileştirmesi.
 Bu değişiklikler, farklı shoe'larda yapılan hataları ayrı şekilde izleyecektir.
 """
 
+import math
+import queue
 import sqlite3
+import threading
+import time
 from collections import Counter, defaultdict
-from config import DB_FILE
+from config import ADAPTIVE_COLOR_SYMMETRY, GRID_WRITE_RETRIES, GRID_WRITE_RETRY_DELAY
+from models.database import get_db_file, connect_database, create_profiler
+from models.migrations import apply_migrations, set_color_symmetry
+from models.sql_profiler import ProfiledConnection
+from models.pattern_keys import encode_sequence, encode_grid, canonical_key, FLIPPED_CELLS
+from models.mistake_store import DecayingMistakeStore
 
 class AdaptiveLearningModel:
     """Hatalı tahminlerden öğrenen tahmin modeli."""
     
-    def __init__(self, lookback=4):
+    def __init__(self, lookback=4, table_id=None, in_memory=False, profile_sql=None, color_symmetric=None):
         """
         Args:
             lookback (int): Dikkate alınacak önceki sonuç sayısı.
+            table_id (int, optional): Masa ID'si; masanın veritabanı dosyası kullanılır.
+            in_memory (bool, optional): True ise masanın bellek içi simülasyon veritabanı kullanılır.
+            profile_sql (bool, optional): Sorgu profillemesi; belirtilmezse SQL_PROFILING kullanılır.
+            color_symmetric (bool, optional): Desen ve P/B ayna görüntüsünü tek kayıtta birleştirir;
+                belirtilmezse ADAPTIVE_COLOR_SYMMETRY kullanılır.
         """
         self.lookback = lookback
+        self.color_symmetric = ADAPTIVE_COLOR_SYMMETRY if color_symmetric is None else color_symmetric
+        self.table_id = table_id
+        self.in_memory = in_memory
         self.connection = None
+        self.profiler = create_profiler("AdaptiveLearningModel", profile_sql)
         self.current_shoe_id = 1
         self._initialize_database()
-        self.mistake_memory = defaultdict(Counter)  # Hataları saklayacak hafıza yapısı
+        self.mistake_memory = defaultdict(Counter)  # Desen anahtarı -> yanlış tahmin sayıları
+        self.grid_mistakes = defaultdict(Counter)  # (grid anahtarı, grid_size) -> yanlış tahmin sayıları
+        # Önceki shoe'ların hataları sönümlenerek tutulur; mevcut shoe'da kayıt yoksa kullanılır
+        self.mistake_store = DecayingMistakeStore()
+        # Grid hataları SQLite'a arka plandaki yazıcı thread üzerinden yazılır. Paylaşılan
+        # önbellekli bellek içi veritabanında ikinci bağlantı tablo kilidine takılır
+        # (SQLITE_LOCKED, bekleme yok); orada yazmalar sahip bağlantıda doğrudan yapılır.
+        self._grid_write_queue = queue.Queue()
+        self._grid_writer = None
+        if self.connection and not self.in_memory:
+            self._grid_writer = threading.Thread(target=self._grid_write_loop, daemon=True)
+            self._grid_writer.start()
         self._load_mistake_memory()
+        self._load_mistake_store()
     
     def _initialize_database(self):
         """Veritabanı bağlantısını ve gerekli tabloları başlatır."""
         try:
-            self.connection = sqlite3.connect(DB_FILE)
-            cursor = self.connection.cursor()
-            
-            # Tahmin hafızası tablosu - shoe_id eklenmiş
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS adaptive_learning (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    shoe_id INTEGER NOT NULL,
-                    pattern TEXT NOT NULL,
-                    wrong_prediction TEXT NOT NULL,
-                    frequency INTEGER DEFAULT 1,
-                    UNIQUE(shoe_id, pattern, wrong_prediction)
-                )
-            ''')
-            
-            # Grid tabanlı hata desenler tablosu - shoe_id eklenmiş
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS grid_mistake_patterns (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    shoe_id INTEGER NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    grid_pattern TEXT NOT NULL,   
-                    grid_size INTEGER NOT NULL,   
-                    wrong_prediction TEXT NOT NULL,
-                    frequency INTEGER DEFAULT 1,
-                    UNIQUE(shoe_id, grid_pattern, grid_size, wrong_prediction)
-                )
-            ''')
-            
-            # İndeksler
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_pattern ON adaptive_learning(shoe_id, pattern)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_grid_pattern ON grid_mistake_patterns(shoe_id, grid_pattern, grid_size)')
-            
-            self.connection.commit()
+            self.connection = connect_database(get_db_file(self.table_id, self.in_memory))
+            # Tablolar DatabaseManager ile ortak göç adımlarından gelir
+            apply_migrations(self.connection)
+            # Kip değiştiyse mevcut kayıtlar bir kez birleştirilir/ayrıştırılır
+            set_color_symmetry(self.connection, self.color_symmetric)
+            if self.profiler:
+                self.connection = ProfiledConnection(self.connection, self.profiler)
             print("Adaptif öğrenme tablosu başarıyla başlatıldı.")
         except sqlite3.Error as e:
             print(f"Veritabanı hatası: {e}")
@@ -80,7 +83,7 @@ class AdaptiveLearningModel:
             
             # Mevcut shoe için hata kayıtlarını yükle
             cursor.execute("""
-                SELECT pattern, wrong_prediction, frequency 
+                SELECT pattern_key, wrong_prediction, frequency 
                 FROM adaptive_learning
                 WHERE shoe_id = ?
             """, (self.current_shoe_id,))
@@ -89,11 +92,62 @@ class AdaptiveLearningModel:
             
             for pattern, wrong_pred, freq in results:
                 self.mistake_memory[pattern][wrong_pred] = freq
+            
+            # Mevcut shoe için grid hatalarını yükle; grid tahminleri yalnızca bu sözlüğü okur
+            self.flush_grid_writes()
+            cursor.execute("""
+                SELECT grid_key, grid_size, wrong_prediction, frequency
+                FROM grid_mistake_patterns
+                WHERE shoe_id = ?
+            """, (self.current_shoe_id,))
+            grid_results = cursor.fetchall()
+            
+            for pattern, grid_size, wrong_pred, freq in grid_results:
+                self.grid_mistakes[(pattern, grid_size)][wrong_pred] = freq
                 
-            print(f"Shoe ID {self.current_shoe_id} için {len(results)} hata kaydı hafızaya yüklendi.")
+            print(f"Shoe ID {self.current_shoe_id} için {len(results)} hata kaydı ve "
+                  f"{len(grid_results)} grid hata kaydı hafızaya yüklendi.")
         except sqlite3.Error as e:
             print(f"Hata hafızası yükleme hatası: {e}")
     
+    def _load_mistake_store(self):
+        """Shoe'lar arası hata hafızasını son shoe'ların kayıtlarından doldurur."""
+        self.mistake_store.clear()
+        self.mistake_store.advance(self.current_shoe_id)
+        if not self.connection:
+            return
+        
+        # Ağırlığı min_weight altına düşecek kadar eski shoe'lar okunmaz
+        store = self.mistake_store
+        horizon = math.ceil(store.half_life * math.log2(1 / store.min_weight))
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT shoe_id, pattern_key, wrong_prediction, frequency
+                FROM adaptive_learning
+                WHERE shoe_id > ? AND shoe_id <= ?
+                ORDER BY shoe_id
+            """, (self.current_shoe_id - horizon, self.current_shoe_id))
+            for shoe_id, pattern_key, wrong_pred, freq in cursor.fetchall():
+                store.add(pattern_key, wrong_pred, freq, stamp=shoe_id)
+        except sqlite3.Error as e:
+            print(f"Shoe'lar arası hata hafızası yükleme hatası: {e}")
+    
+    def _canonical(self, key):
+        """Renk simetrisi açıksa anahtarın kanonik temsilcisini döndürür.
+        
+        Returns:
+            tuple: (anahtar, flipped); flipped True ise P/B değerleri çevrilmelidir.
+        """
+        if self.color_symmetric:
+            return canonical_key(key)
+        return key, False
+    
+    @staticmethod
+    def _oriented(value, flipped):
+        """Ayna desen için P/B değerini çevirir."""
+        return FLIPPED_CELLS.get(value, value) if flipped else value
+    
     def set_shoe_id(self, shoe_id):
         """Mevcut shoe ID'sini ayarlar ve hafızayı yeniden yükler.
         
@@ -103,10 +157,18 @@ class AdaptiveLearningModel:
         if self.current_shoe_id == shoe_id:
             return  # Değişiklik yok, işlem yapma
             
+        previous_shoe_id = self.current_shoe_id
         self.current_shoe_id = shoe_id
         # Hafızayı temizle ve yeni shoe için hafızayı yükle
         self.mistake_memory.clear()
+        self.grid_mistakes.clear()
         self._load_mistake_memory()
+        if shoe_id > previous_shoe_id:
+            # Önceki shoe'ların hataları hafızada kalır, yalnızca sönümlenir
+            self.mistake_store.advance(shoe_id)
+            self.mistake_store.prune()
+        else:
+            self._load_mistake_store()
         print(f"Adaptif öğrenme modeli için shoe ID {shoe_id} olarak ayarlandı.")
     
     def predict(self, history):
@@ -120,31 +182,51 @@ class AdaptiveLearningModel:
         """
         if len(history) < self.lookback:
             return '?'
+        # Son N sonucun tamsayı anahtarı
+        return self.predict_key(encode_sequence(history[-self.lookback:]))
+    
+    def predict_key(self, sequence_key):
+        """Son lookback sonucun desen anahtarına göre tahmin üretir.
+        
+        Args:
+            sequence_key (int): encode_sequence ile aynı kodlamada desen anahtarı
+                (HandFeatureStore.pattern_key).
             
-        # Son N sonucu al
-        pattern = "".join(history[-self.lookback:])
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        pattern_key, flipped = self._canonical(sequence_key)
         
         # Bu desen için yapılan hataları kontrol et
-        mistake_counter = self.mistake_memory.get(pattern, Counter())
+        mistake_counter = self.mistake_memory.get(pattern_key)
         
-        if not mistake_counter:
-            return '?'  # Henüz bu desen için hata kaydı yok
-        
-        # En çok hata yapılan tahmini bul
-        most_common_mistake = mistake_counter.most_common(1)[0][0]
+        if mistake_counter:
+            # En çok hata yapılan tahmini bul
+            most_common_mistake = mistake_counter.most_common(1)[0][0]
+        else:
+            # Bu shoe'da kayıt yok: önceki shoe'ların sönümlenmiş hatalarına bak
+            weights = self.mistake_store.lookup(pattern_key)
+            if not weights or weights['P'] == weights['B']:
+                return '?'  # Henüz bu desen için hata kaydı yok
+            most_common_mistake = 'P' if weights['P'] > weights['B'] else 'B'
         
         # Yanlış olduğunu öğrendiğimiz tahminin tersini yap
-        return 'B' if most_common_mistake == 'P' else 'P'
+        return self._oriented('B' if most_common_mistake == 'P' else 'P', flipped)
     
     def record_mistake(self, pattern, wrong_prediction):
         """Yapılan tahmin hatasını kaydeder.
         
         Args:
-            pattern (str): Hatanın yapıldığı durum/desen.
+            pattern (int | str): Hatanın yapıldığı desenin anahtarı ya da desen metni/listesi.
             wrong_prediction (str): Yanlış tahmin ('P' veya 'B').
         """
+        pattern_key = pattern if isinstance(pattern, int) else encode_sequence(pattern)
+        pattern_key, flipped = self._canonical(pattern_key)
+        wrong_prediction = self._oriented(wrong_prediction, flipped)
+        
         # Hafızaya kaydet
-        self.mistake_memory[pattern][wrong_prediction] += 1
+        self.mistake_memory[pattern_key][wrong_prediction] += 1
+        self.mistake_store.add(pattern_key, wrong_prediction)
         
         # Veritabanına kaydet
         if not self.connection:
@@ -155,11 +237,11 @@ class AdaptiveLearningModel:
             
             # Varsa güncelle, yoksa ekle
             cursor.execute("""
-                INSERT INTO adaptive_learning (shoe_id, pattern, wrong_prediction, frequency)
+                INSERT INTO adaptive_learning (shoe_id, pattern_key, wrong_prediction, frequency)
                 VALUES (?, ?, ?, 1)
-                ON CONFLICT(shoe_id, pattern, wrong_prediction) 
+                ON CONFLICT(shoe_id, pattern_key, wrong_prediction) 
                 DO UPDATE SET frequency = frequency + 1
-            """, (self.current_shoe_id, pattern, wrong_prediction))
+            """, (self.current_shoe_id, pattern_key, wrong_prediction))
             
             self.connection.commit()
         except sqlite3.Error as e:
@@ -178,8 +260,7 @@ class AdaptiveLearningModel:
             
         # Tahmin yanlışsa kaydet
         if prediction != actual_result:
-            pattern = "".join(history[-self.lookback:])
-            self.record_mistake(pattern, prediction)
+            self.record_mistake(encode_sequence(history[-self.lookback:]), prediction)
     
     def record_grid_mistake(self, grid_data, grid_size, wrong_prediction):
         """Grid deseninde yapılan hatayı kaydeder.
@@ -192,48 +273,78 @@ class AdaptiveLearningModel:
         if not self.connection:
             return
             
-        # Grid desenini düzleştir
-        pattern = self._flatten_grid(grid_data, grid_size)
+        grid_key, flipped = self._canonical(encode_grid(grid_data, grid_size))
+        wrong_prediction = self._oriented(wrong_prediction, flipped)
         
+        # Hafıza hemen güncellenir, veritabanı yazması arka planda yapılır
+        self.grid_mistakes[(grid_key, grid_size)][wrong_prediction] += 1
+        row = (self.current_shoe_id, grid_key, grid_size, wrong_prediction)
+        if self._grid_writer is None:
+            try:
+                self._write_grid_rows(self.connection, [row])
+            except sqlite3.Error as e:
+                print(f"Grid hatası kaydetme hatası: {e}")
+        else:
+            self._grid_write_queue.put(row)
+    
+    @staticmethod
+    def _write_grid_rows(connection, rows):
+        """Grid hatalarını tek işlemde yazar; hata olursa işlem geri alınır ve hata yükseltilir."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Varsa güncelle, yoksa ekle
-            cursor.execute("""
+            cursor = connection.cursor()
+            cursor.executemany("""
                 INSERT INTO grid_mistake_patterns 
-                (shoe_id, grid_pattern, grid_size, wrong_prediction, frequency)
+                (shoe_id, grid_key, grid_size, wrong_prediction, frequency)
                 VALUES (?, ?, ?, ?, 1)
-                ON CONFLICT(shoe_id, grid_pattern, grid_size, wrong_prediction) 
+                ON CONFLICT(shoe_id, grid_key, grid_size, wrong_prediction) 
                 DO UPDATE SET frequency = frequency + 1
-            """, (self.current_shoe_id, pattern, grid_size, wrong_prediction))
-            
-            self.connection.commit()
-        except sqlite3.Error as e:
-            print(f"Grid hatası kaydetme hatası: {e}")
+            """, rows)
+            connection.commit()
+        except sqlite3.Error:
+            # Yarım kalan toplu yazma tekrar denendiğinde sayımlar iki kez artmamalı
+            connection.rollback()
+            raise
     
-    def _flatten_grid(self, grid_data, size):
-        """Grid'i dizi olarak düzleştirir.
+    def _grid_write_loop(self):
+        """Kuyruktaki grid hatalarını toplu olarak veritabanına yazar (yazıcı thread)."""
+        # sqlite3 bağlantıları thread'e bağlı olduğundan yazıcı kendi bağlantısını açar
+        connection = connect_database(get_db_file(self.table_id, self.in_memory))
+        if self.profiler:
+            connection = ProfiledConnection(connection, self.profiler)
         
-        Args:
-            grid_data (list): 2D grid.
-            size (int): Grid boyutu.
+        pending = []  # Yazılamayan kayıtlar atılmaz, sonraki toplu yazmaya eklenir
+        running = True
+        while running:
+            batch = [self._grid_write_queue.get()]
+            # Kuyrukta bekleyen diğer kayıtlar aynı işlemde yazılır
+            while True:
+                try:
+                    batch.append(self._grid_write_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-        Returns:
-            str: Düzleştirilmiş grid.
-        """
-        result = ""
-        rows = len(grid_data)
-        cols = len(grid_data[0]) if rows > 0 else 0
-        
-        # Sağ alt köşeden grid'i al
-        for r in range(max(0, rows - size), rows):
-            for c in range(max(0, cols - size), cols):
-                if r < rows and c < cols and grid_data[r][c] is not None:
-                    result += grid_data[r][c]
-                else:
-                    result += "X"
+            pending.extend(item for item in batch if item is not None)
+            running = None not in batch
+            for attempt in range(GRID_WRITE_RETRIES):
+                if not pending:
+                    break
+                try:
+                    self._write_grid_rows(connection, pending)
+                    pending = []
+                except sqlite3.Error as e:
+                    print(f"Grid hatası kaydetme hatası (deneme {attempt + 1}/{GRID_WRITE_RETRIES}): {e}")
+                    time.sleep(GRID_WRITE_RETRY_DELAY * 2 ** attempt)
+            for _ in batch:
+                self._grid_write_queue.task_done()
         
-        return result
+        if pending:
+            print(f"{len(pending)} grid hatası veritabanına yazılamadı.")
+        connection.close()
+    
+    def flush_grid_writes(self):
+        """Bekleyen grid hatası yazmalarının bitmesini bekler."""
+        if self._grid_writer and self._grid_writer.is_alive():
+            self._grid_write_queue.join()
     
     def predict_from_grid(self, grid_data, grid_size=3):
         """Grid desenine göre tahmin yapar.
@@ -245,42 +356,27 @@ class AdaptiveLearningModel:
         Returns:
             str: Tahmin edilen değer ('P' veya 'B').
         """
-        if not self.connection:
+        # En çok hata yapılan tahmini bul (SQL yok, sadece hafıza)
+        grid_key, flipped = self._canonical(encode_grid(grid_data, grid_size))
+        mistake_counter = self.grid_mistakes.get((grid_key, grid_size))
+        if not mistake_counter:
             return '?'
-            
-        pattern = self._flatten_grid(grid_data, grid_size)
         
-        try:
-            cursor = self.connection.cursor()
-            
-            # En çok hata yapılan tahmini bul
-            cursor.execute("""
-                SELECT wrong_prediction, SUM(frequency) as total_freq
-                FROM grid_mistake_patterns
-                WHERE shoe_id = ? AND grid_pattern = ? AND grid_size = ?
-                GROUP BY wrong_prediction
-                ORDER BY total_freq DESC
-                LIMIT 1
-            """, (self.current_shoe_id, pattern, grid_size))
-            
-            result = cursor.fetchone()
-            if result:
-                wrong_prediction = result[0]
-                # Yanlış olduğunu öğrendiğimiz tahminin tersini yap
-                return 'B' if wrong_prediction == 'P' else 'P'
-            
-            return '?'
-        except sqlite3.Error as e:
-            print(f"Grid tahmin hatası: {e}")
-            return '?'
+        wrong_prediction = mistake_counter.most_common(1)[0][0]
+        # Yanlış olduğunu öğrendiğimiz tahminin tersini yap
+        return self._oriented('B' if wrong_prediction == 'P' else 'P', flipped)
     
     def clear_memory(self):
         """Hata hafızasını temizler."""
         self.mistake_memory.clear()
+        self.grid_mistakes.clear()
         
         if not self.connection:
+            self.mistake_store.clear()
             return
-            
+        
+        # Silmeden sonra eski kayıtların yazılmaması için kuyruk boşaltılır
+        self.flush_grid_writes()
         try:
             cursor = self.connection.cursor()
             # Sadece mevcut shoe için temizle
@@ -290,9 +386,27 @@ class AdaptiveLearningModel:
             print(f"Shoe ID {self.current_shoe_id} için adaptif öğrenme hafızası temizlendi.")
         except sqlite3.Error as e:
             print(f"Hafıza temizleme hatası: {e}")
+        # Silinen kayıtlar shoe'lar arası hafızadan da çıkarılır
+        self._load_mistake_store()
+    
+    def get_memory_metrics(self):
+        """Shoe'lar arası hata hafızasının metriklerini döndürür.
+        
+        Returns:
+            dict: size, capacity, hits, misses, hit_rate ve evictions değerleri.
+        """
+        return self.mistake_store.metrics()
     
     def close(self):
         """Veritabanı bağlantısını kapatır."""
+        if self._grid_writer and self._grid_writer.is_alive():
+            self._grid_write_queue.put(None)
+            self._grid_writer.join()
+        if self.profiler:
+            print(self.profiler.report())
+        metrics = self.get_memory_metrics()
+        print(f"Shoe'lar arası hata hafızası: {metrics['size']}/{metrics['capacity']} desen, "
+              f"isabet oranı %{metrics['hit_rate'] * 100:.1f}, atılan {metrics['evictions']}")
         if self.connection:
             self.connection.close()
             print("Adaptif öğrenme veritabanı bağlantısı kapatıldı.")
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Boncuk (bead) grid'in bitboard gösterimi.
+Grid sütun sütun doldurulur; k. sonuç (r = k % rows, c = k // rows) hücresine
+düşer ve bit numarası da k'dir. P ve B için ayrı maskeler tutulur. Pencere
+dolduğunda yeni el maskeleri bir bit sağa kaydırır, yani en eski sonuç düşer.
+Kare, çoğunluk ve çizgi kontrolleri önceden hesaplanmış maskelerle AND ve
+bit sayımı (popcount) işlemlerine indirgenir; grid boyutu sabit değildir.
+"""
+
+class BeadBitboard:
+    """Son sonuçları sütun öncelikli grid düzeninde tutan P/B bit maskeleri."""
+
+    def __init__(self, rows, cols, window=None):
+        """
+        Args:
+            rows (int): Satır sayısı.
+            cols (int): Sütun sayısı.
+            window (int, optional): Grid'de gösterilecek son sonuç sayısı (varsayılan rows * cols).
+        """
+        self.rows = rows
+        self.cols = cols
+        self.window = min(window or rows * cols, rows * cols)
+        self.p_mask = 0
+        self.b_mask = 0
+        self.count = 0
+        self._mask_cache = {}
+
+    @classmethod
+    def from_grid(cls, grid_data):
+        """2D grid listesinden bitboard oluşturur.
+
+        Args:
+            grid_data (list): grid_data[r][c] değerleri 'P', 'B' veya None.
+
+        Returns:
+            BeadBitboard: Grid'in bitboard karşılığı.
+        """
+        rows = len(grid_data)
+        cols = len(grid_data[0]) if rows > 0 else 0
+        board = cls(rows, cols)
+        for c in range(cols):
+            for r in range(rows):
+                value = grid_data[r][c]
+                if value is not None:
+                    board._set(c * rows + r, value)
+                    board.count = c * rows + r + 1
+        return board
+
+    def copy(self):
+        """Maskelerin anlık kopyasını döndürür (önceden hesaplanmış maskeler paylaşılır)."""
+        board = BeadBitboard(self.rows, self.cols, self.window)
+        board.p_mask, board.b_mask, board.count = self.p_mask, self.b_mask, self.count
+        board._mask_cache = self._mask_cache
+        return board
+
+    def _set(self, bit, winner):
+        if winner == 'P':
+            self.p_mask |= 1 << bit
+        elif winner == 'B':
+            self.b_mask |= 1 << bit
+
+    def push(self, winner):
+        """Yeni sonucu ekler; pencere doluysa en eski sonuç düşer.
+
+        Args:
+            winner (str): 'P' veya 'B'.
+        """
+        if self.count < self.window:
+            self._set(self.count, winner)
+            self.count += 1
+            return
+        self.p_mask >>= 1
+        self.b_mask >>= 1
+        self._set(self.window - 1, winner)
+
+    def load(self, results):
+        """Bitboard'u sonuç listesinin son penceresinden yeniden kurar.
+
+        Args:
+            results (list): Sonuçlar (en eski başta).
+        """
+        self.clear()
+        for winner in results[-self.window:] if self.window else []:
+            self.push(winner)
+
+    def clear(self):
+        """Tüm hücreleri boşaltır."""
+        self.p_mask = 0
+        self.b_mask = 0
+        self.count = 0
+
+    def cell(self, r, c):
+        """Hücre değerini döndürür ('P', 'B' veya None)."""
+        bit = 1 << (c * self.rows + r)
+        if self.p_mask & bit:
+            return 'P'
+        if self.b_mask & bit:
+            return 'B'
+        return None
+
+    def to_grid(self):
+        """Bitboard'u 2D grid listesine çevirir (arayüz ve desen anahtarları için).
+
+        Returns:
+            list: grid[r][c] değerleri 'P', 'B' veya None.
+        """
+        return [[self.cell(r, c) for c in range(self.cols)] for r in range(self.rows)]
+
+    def _bits(self, cells):
+        mask = 0
+        for r, c in cells:
+            mask |= 1 << (c * self.rows + r)
+        return mask
+
+    def square_mask(self, size):
+        """Sağ alt size x size bölgesinin maskesini döndürür (önbellekli).
+
+        Returns:
+            int: Bölge maskesi; bölge grid'e sığmıyorsa None.
+        """
+        key = ('square', size)
+        if key not in self._mask_cache:
+            if size > self.rows or size > self.cols or size <= 0:
+                self._mask_cache[key] = None
+            else:
+                self._mask_cache[key] = self._bits(
+                    (r, c) for r in range(self.rows - size, self.rows) for c in range(self.cols - size, self.cols))
+        return self._mask_cache[key]
+
+    def _run_masks(self, length):
+        """Çizgi kontrolü için yardımcı maskeleri döndürür (önbellekli).
+
+        Returns:
+            tuple: (dikey başlangıç maskesi, satır maskeleri listesi).
+        """
+        key = ('run', length)
+        if key not in self._mask_cache:
+            # Dikey çizgi yalnızca r <= rows - length satırlarında başlayabilir (sütun taşması olmasın)
+            vertical_starts = self._bits(
+                (r, c) for c in range(self.cols) for r in range(self.rows - length + 1))
+            row_masks = [self._bits((r, c) for c in range(self.cols)) for r in range(self.rows)]
+            self._mask_cache[key] = (vertical_starts, row_masks)
+        return self._mask_cache[key]
+
+    def uniform_value(self, mask):
+        """Maskedeki tüm hücreler aynı renkteyse o rengi döndürür.
+
+        Args:
+            mask (int): Hücre maskesi.
+
+        Returns:
+            str: 'P', 'B' veya None (boş hücre ya da karışık renk varsa).
+        """
+        if mask is None:
+            return None
+        if self.p_mask & mask == mask:
+            return 'P'
+        if self.b_mask & mask == mask:
+            return 'B'
+        return None
+
+    def region_counts(self, mask):
+        """Maskedeki P, B ve boş hücre sayılarını döndürür.
+
+        Returns:
+            tuple: (p_count, b_count, empty_count).
+        """
+        p_count = (self.p_mask & mask).bit_count()
+        b_count = (self.b_mask & mask).bit_count()
+        return p_count, b_count, mask.bit_count() - p_count - b_count
+
+    def _runs(self, mask, step, length):
+        """Başlangıcından itibaren step aralıklı length hücresi dolu olan bitleri döndürür."""
+        runs = mask
+        for i in range(1, length):
+            runs &= mask >> (step * i)
+        return runs
+
+    def line_value(self, length):
+        """Aynı renkten length uzunluğunda yatay ya da dikey çizgi arar.
+
+        Önce yatay çizgiler satır satır (soldan sağa), sonra dikey çizgiler sütun
+        sütun (yukarıdan aşağıya) taranır; ilk bulunan çizginin rengi döner.
+
+        Args:
+            length (int): Çizgi uzunluğu.
+
+        Returns:
+            str: 'P', 'B' veya None.
+        """
+        if length <= 0:
+            return None
+        vertical_starts, row_masks = self._run_masks(length)
+
+        # Yatay: aynı satırdaki komşu hücreler rows bit uzaklıktadır
+        if length <= self.cols:
+            p_runs = self._runs(self.p_mask, self.rows, length)
+            b_runs = self._runs(self.b_mask, self.rows, length)
+            for row_mask in row_masks:
+                starts = (p_runs | b_runs) & row_mask
+                if starts:
+                    first = starts & -starts
+                    return 'P' if p_runs & first else 'B'
+
+        # Dikey: aynı sütundaki komşu hücreler 1 bit uzaklıktadır
+        if length <= self.rows:
+            p_runs = self._runs(self.p_mask, 1, length) & vertical_starts
+            b_runs = self._runs(self.b_mask, 1, length) & vertical_starts
+            starts = p_runs | b_runs
+            if starts:
+                first = starts & -starts
+                return 'P' if p_runs & first else 'B'
+        return None
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Shoe'lar arası, yakınlık ağırlıklı desen istatistikleri modülü.
+Her shoe için desen -> sonraki sonuç sayımları shoe_pattern_counts tablosunda tutulur.
+pattern_aggregates tablosu bu sayımların üstel yakınlık ağırlıklı toplamını saklar:
+yeni shoe başladığında tüm özet satırları decay ile çarpılır, böylece tahmin
+maliyeti saklanan shoe sayısıyla büyümez. Her elin sayımı hafızada hemen
+güncellenir, veritabanına ise flush ile (sonuç tamponuyla birlikte) toplu yazılır.
+"""
+import sqlite3
+from collections import defaultdict
+from config import DB_LOOKBACK, CROSS_SHOE_DECAY, CROSS_SHOE_MIN_WEIGHT
+from models.database import get_db_file, connect_database
+from models.migrations import apply_migrations
+from models.packed_storage import iter_shoe_results
+
+class CrossShoePatternModel:
+    """Geçmiş shoe'ların desen sayımlarını yakınlık ağırlığıyla birleştiren tahmin modeli."""
+
+    def __init__(self, lookback=DB_LOOKBACK, decay=CROSS_SHOE_DECAY, min_weight=CROSS_SHOE_MIN_WEIGHT,
+                 table_id=None, in_memory=False, check_same_thread=True):
+        """
+        Args:
+            lookback (int): Desen uzunluğu.
+            decay (float): Her eski shoe için uygulanan ağırlık çarpanı (0-1 arasında).
+            min_weight (float): Tahmin için gereken minimum toplam ağırlık.
+            table_id (int, optional): Masa ID'si; masanın veritabanı dosyası kullanılır.
+            in_memory (bool, optional): True ise masanın bellek içi simülasyon veritabanı kullanılır.
+            check_same_thread (bool, optional): False ise bağlantı başka thread'lerden
+                kullanılabilir (erişimi çağıran senkronize etmelidir).
+        """
+        self.table_id = table_id
+        self.in_memory = in_memory
+        self.check_same_thread = check_same_thread
+        self.lookback = lookback
+        self.decay = decay
+        self.min_weight = min_weight
+        self.connection = None
+        self.current_shoe_id = 1
+        self.reference_shoe_id = 1  # Özet ağırlıklarının normalize edildiği shoe
+        self.aggregates = defaultdict(lambda: {'P': 0.0, 'B': 0.0})
+        self.pending_counts = defaultdict(int)  # (shoe_id, desen, sonuç) -> yazılmamış sayım
+        self._initialize_database()
+        self._load_aggregates()
+
+    def _initialize_database(self):
+        """Veritabanı bağlantısını başlatır ve göçleri uygular."""
+        try:
+            self.connection = connect_database(get_db_file(self.table_id, self.in_memory), self.check_same_thread)
+            apply_migrations(self.connection)
+            print("Shoe'lar arası desen tabloları başarıyla başlatıldı.")
+        except sqlite3.Error as e:
+            print(f"Veritabanı hatası: {e}")
+            self.connection = None
+
+    def _load_aggregates(self):
+        """Özet tabloyu hafızaya yükler, gerekirse yeniden oluşturur."""
+        if not self.connection:
+            return
+
+        try:
+            cursor = self.connection.cursor()
+
+            cursor.execute("SELECT MAX(shoe_id) FROM shoe_tracker")
+            result = cursor.fetchone()
+            if result and result[0] is not None:
+                self.current_shoe_id = result[0]
+
+            cursor.execute("SELECT reference_shoe_id, lookback, decay FROM pattern_aggregate_meta WHERE id = 1")
+            meta = cursor.fetchone()
+
+            if meta is None or meta[1] != self.lookback:
+                # İlk çalıştırma ya da desen uzunluğu değişmiş: sayımlar kayıtlı sonuçlardan çıkarılır
+                self.rebuild_counts_from_results()
+                return
+            if meta[2] != self.decay:
+                self.reference_shoe_id = meta[0]
+                self.rebuild_aggregates()
+                return
+
+            self.reference_shoe_id = meta[0]
+            cursor.execute("SELECT pattern, next_winner, weighted_count FROM pattern_aggregates")
+            for pattern, next_winner, weighted_count in cursor.fetchall():
+                self.aggregates[pattern][next_winner] = weighted_count
+
+            self._rescale_to(self.current_shoe_id)
+            print(f"Shoe'lar arası model için {len(self.aggregates)} desen özeti yüklendi.")
+        except sqlite3.Error as e:
+            print(f"Desen özeti yükleme hatası: {e}")
+
+    def _save_meta(self, cursor):
+        """Özet meta verisini yazar (commit çağırana aittir)."""
+        cursor.execute("""
+            INSERT INTO pattern_aggregate_meta (id, reference_shoe_id, lookback, decay)
+            VALUES (1, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                reference_shoe_id = excluded.reference_shoe_id,
+                lookback = excluded.lookback,
+                decay = excluded.decay
+        """, (self.reference_shoe_id, self.lookback, self.decay))
+
+    def _rescale_to(self, shoe_id):
+        """Özet ağırlıklarını yeni referans shoe'ya göre yeniden ölçekler.
+
+        Maliyet desen sayısıyla sınırlıdır (2^lookback * 2), shoe sayısından bağımsızdır.
+
+        Args:
+            shoe_id (int): Yeni referans shoe ID'si.
+        """
+        if shoe_id <= self.reference_shoe_id:
+            return
+
+        factor = self.decay ** (shoe_id - self.reference_shoe_id)
+        for counts in self.aggregates.values():
+            counts['P'] *= factor
+            counts['B'] *= factor
+        self.reference_shoe_id = shoe_id
+
+        cursor = self.connection.cursor()
+        cursor.execute("UPDATE pattern_aggregates SET weighted_count = weighted_count * ?", (factor,))
+        self._save_meta(cursor)
+        self.connection.commit()
+
+    def set_shoe_id(self, shoe_id, reset=False):
+        """Mevcut shoe ID'sini ayarlar ve özetleri yeni shoe'ya göre ölçekler.
+
+        Args:
+            shoe_id (int): Yeni shoe ID'si.
+            reset (bool, optional): True ise tüm veriler sıfırlanmıştır; sayımlar ve özetler silinir.
+        """
+        if self.current_shoe_id == shoe_id and not reset:
+            return
+
+        try:
+            if reset:
+                self.current_shoe_id = shoe_id
+                self.clear_all()
+                return
+            if not self.connection:
+                self.current_shoe_id = shoe_id
+                return
+            # Önceki shoe'nun bekleyen sayımları yeniden ölçeklemeden önce yazılır
+            self.flush()
+            self.current_shoe_id = shoe_id
+            if shoe_id < self.reference_shoe_id:
+                # Geriye giden shoe ID'si sayımları silmez; özet mevcut referans shoe'da kalır
+                print(f"Uyarı: shoe ID {shoe_id} referans shoe'dan ({self.reference_shoe_id}) küçük, desen özeti korunuyor.")
+            self._rescale_to(shoe_id)
+        except sqlite3.Error as e:
+            print(f"Desen özeti ölçekleme hatası: {e}")
+
+    def _shoe_weight(self, shoe_id):
+        """Shoe'nun referans shoe'ya göre yakınlık ağırlığını döndürür."""
+        return self.decay ** max(0, self.reference_shoe_id - shoe_id)
+
+    def observe(self, pattern, winner):
+        """Yeni sonucu mevcut shoe sayımlarına ve ağırlıklı özete ekler.
+
+        Hafızadaki özet hemen güncellenir; veritabanı yazmaları flush çağrılana kadar bekletilir.
+
+        Args:
+            pattern (str): Sonuçtan önceki son lookback sonucun metni.
+            winner (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        if len(pattern) < self.lookback or winner not in ('P', 'B'):
+            return
+
+        # Mevcut shoe normalde referans shoe'dur (ağırlık 1); geriye giden shoe ID'sinde daha azdır
+        self.aggregates[pattern][winner] += self._shoe_weight(self.current_shoe_id)
+        if self.connection:
+            self.pending_counts[(self.current_shoe_id, pattern, winner)] += 1
+
+    def flush(self):
+        """Bekleyen desen sayımlarını tek işlemde veritabanına yazar."""
+        if not self.connection or not self.pending_counts:
+            return
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany("""
+                INSERT INTO shoe_pattern_counts (shoe_id, pattern, next_winner, count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(shoe_id, pattern, next_winner)
+                DO UPDATE SET count = count + excluded.count
+            """, [(shoe_id, pattern, winner, count)
+                  for (shoe_id, pattern, winner), count in self.pending_counts.items()])
+            # Ağırlık yazma anındaki referans shoe'ya göre hesaplanır
+            cursor.executemany("""
+                INSERT INTO pattern_aggregates (pattern, next_winner, weighted_count)
+                VALUES (?, ?, ?)
+                ON CONFLICT(pattern, next_winner)
+                DO UPDATE SET weighted_count = weighted_count + excluded.weighted_count
+            """, [(pattern, winner, count * self._shoe_weight(shoe_id))
+                  for (shoe_id, pattern, winner), count in self.pending_counts.items()])
+            self.connection.commit()
+            self.pending_counts.clear()
+        except sqlite3.Error as e:
+            print(f"Desen sayımı yazma hatası: {e}")
+
+    def predict(self, pattern):
+        """Ağırlıklı desen özetine göre tahmin yapar.
+
+        Args:
+            pattern (str): Son lookback sonucun metni (HandFeatureStore.suffix).
+
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        if len(pattern) < self.lookback:
+            return '?'
+
+        counts = self.aggregates.get(pattern)
+        if not counts:
+            return '?'
+
+        p_weight, b_weight = counts['P'], counts['B']
+        if p_weight + b_weight < self.min_weight or p_weight == b_weight:
+            return '?'
+        return 'P' if p_weight > b_weight else 'B'
+
+    def clear_current_shoe(self):
+        """Mevcut shoe'nun sayımlarını siler ve özetten çıkarır."""
+        if not self.connection:
+            return
+
+        # Bekleyen sayımlar da silinecek sayımlara dahil olur
+        self.flush()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT pattern, next_winner, count FROM shoe_pattern_counts WHERE shoe_id = ?
+            """, (self.current_shoe_id,))
+            weight = self._shoe_weight(self.current_shoe_id)
+            for pattern, next_winner, count in cursor.fetchall():
+                self.aggregates[pattern][next_winner] = max(0.0, self.aggregates[pattern][next_winner] - count * weight)
+                cursor.execute("""
+                    UPDATE pattern_aggregates SET weighted_count = ?
+                    WHERE pattern = ? AND next_winner = ?
+                """, (self.aggregates[pattern][next_winner], pattern, next_winner))
+            cursor.execute("DELETE FROM shoe_pattern_counts WHERE shoe_id = ?", (self.current_shoe_id,))
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Desen sayımı temizleme hatası: {e}")
+
+    def clear_all(self):
+        """Tüm shoe sayımlarını ve özetleri siler."""
+        self.aggregates.clear()
+        self.pending_counts.clear()
+        self.reference_shoe_id = self.current_shoe_id
+
+        if not self.connection:
+            return
+
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM shoe_pattern_counts")
+        cursor.execute("DELETE FROM pattern_aggregates")
+        cursor.execute("DELETE FROM pattern_aggregate_meta")
+        self.connection.commit()
+
+    def rebuild_counts_from_results(self):
+        """Shoe bazlı desen sayımlarını kayıtlı sonuçlardan yeniden oluşturur."""
+        counts = defaultdict(int)
+        for shoe_id, winners in iter_shoe_results(self.connection):
+            for i in range(self.lookback, len(winners)):
+                counts[(shoe_id, "".join(winners[i - self.lookback:i]), winners[i])] += 1
+
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM shoe_pattern_counts")
+        cursor.executemany("""
+            INSERT INTO shoe_pattern_counts (shoe_id, pattern, next_winner, count) VALUES (?, ?, ?, ?)
+        """, [(shoe_id, pattern, winner, count) for (shoe_id, pattern, winner), count in counts.items()])
+        self.connection.commit()
+
+        self.reference_shoe_id = max([self.current_shoe_id] + [key[0] for key in counts])
+        self.rebuild_aggregates()
+
+    def rebuild_aggregates(self):
+        """Ağırlıklı özeti shoe bazlı sayımlardan yeniden hesaplar."""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT shoe_id, pattern, next_winner, count FROM shoe_pattern_counts")
+
+        self.aggregates.clear()
+        for shoe_id, pattern, next_winner, count in cursor.fetchall():
+            self.aggregates[pattern][next_winner] += count * self._shoe_weight(shoe_id)
+
+        cursor.execute("DELETE FROM pattern_aggregates")
+        cursor.executemany("""
+            INSERT INTO pattern_aggregates (pattern, next_winner, weighted_count) VALUES (?, ?, ?)
+        """, [(pattern, winner, weight)
+              for pattern, counts in self.aggregates.items()
+              for winner, weight in counts.items() if weight > 0])
+        self._save_meta(cursor)
+        self.connection.commit()
+
+        self._rescale_to(self.current_shoe_id)
+        print(f"Shoe'lar arası desen özeti yeniden oluşturuldu ({len(self.aggregates)} desen).")
+
+    def close(self):
+        """Bekleyen sayımları yazar ve veritabanı bağlantısını kapatır."""
+        if self.connection:
+            self.flush()
+            self.connection.close()
+            print("Shoe'lar arası model veritabanı bağlantısı kapatıldı.")
\ No newline at end of file
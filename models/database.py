@@ -3,18 +3,126 @@ Bu güncellenmiş DatabaseManager sınıfı, yeni shoe tespitini işleyebilir
 ve shoe değişimlerini veritabanında izler.
 """
 
+import os
 import sqlite3
 import time
-from collections import Counter
-from config import DB_FILE, DB_LOOKBACK
+from config import (DB_FILE, DB_LOOKBACK, RESULT_STORAGE_LAYOUT, DB_SHARD_FILE_PATTERN,
+                    MEMORY_DB_URI_PATTERN, SIMULATION_DB_FILE, SQL_PROFILING, SQL_PROFILE_EXPLAIN)
+from models.migrations import apply_migrations
+from models.packed_storage import PackedShoeStore
+from models.sql_profiler import SQLProfiler, ProfiledConnection
+from models.shoe_summary import load_summary, save_summary, update_summary
+from models.result_store import ResultStore, predict_next_from_results
 
-class DatabaseManager:
-    """Veritabanı bağlantısını ve işlemlerini yöneten sınıf."""
+def get_db_file(table_id=None, in_memory=False):
+    """Masa için veritabanı dosyasını döndürür.
     
-    def __init__(self):
-        """Veritabanı bağlantısını başlatır."""
+    Args:
+        table_id (int, optional): Masa ID'si. Belirtilmezse varsayılan DB_FILE kullanılır.
+        in_memory (bool, optional): True ise masanın paylaşılan bellek içi veritabanı URI'si döner.
+        
+    Returns:
+        str: Veritabanı dosya yolu (her masa kendi SQLite dosyasında tutulur) ya da URI.
+    """
+    if in_memory:
+        return MEMORY_DB_URI_PATTERN.format(table_id='default' if table_id is None else table_id)
+    if table_id is None:
+        return DB_FILE
+    return DB_SHARD_FILE_PATTERN.format(table_id=table_id)
+
+def create_profiler(name, profile_sql=None):
+    """Profilleme açıksa SQLProfiler oluşturur.
+    
+    Args:
+        name (str): Raporda kullanılacak ad.
+        profile_sql (bool, optional): Belirtilmezse config'deki SQL_PROFILING kullanılır.
+        
+    Returns:
+        SQLProfiler: Profil nesnesi ya da profilleme kapalıysa None.
+    """
+    if not (SQL_PROFILING if profile_sql is None else profile_sql):
+        return None
+    return SQLProfiler(name, explain=SQL_PROFILE_EXPLAIN)
+
+def connect_database(db_file, check_same_thread=True):
+    """Dosya yolu ya da 'file:' URI'si için SQLite bağlantısı açar.
+    
+    Args:
+        db_file (str): get_db_file ile elde edilen dosya yolu ya da URI.
+        check_same_thread (bool, optional): sqlite3.connect'e iletilir.
+        
+    Returns:
+        sqlite3.Connection: Veritabanı bağlantısı.
+    """
+    return sqlite3.connect(db_file, uri=db_file.startswith('file:'), check_same_thread=check_same_thread)
+
+def get_last_shoe_id(db_file):
+    """Veritabanında sonuç ya da model verisi yazılmış en büyük shoe ID'sini döndürür.
+    
+    SQLite dışındaki sonuç depoları shoe numaralarını buradan devam ettirir; böylece
+    tahmin modellerinin aynı dosyadaki verileri geriye giden shoe ID'leri görmez.
+    
+    Args:
+        db_file (str): Veritabanı dosyası ya da URI.
+        
+    Returns:
+        int: En büyük shoe ID'si; veri yoksa ya da okunamazsa 0.
+    """
+    try:
+        connection = connect_database(db_file)
+        try:
+            apply_migrations(connection)
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT MAX(shoe_id) FROM (
+                    SELECT MAX(shoe_id) AS shoe_id FROM shoe_tracker
+                    UNION ALL SELECT MAX(shoe_id) FROM adaptive_learning
+                    UNION ALL SELECT MAX(shoe_id) FROM grid_mistake_patterns
+                    UNION ALL SELECT MAX(shoe_id) FROM shoe_pattern_counts
+                    UNION ALL SELECT reference_shoe_id FROM pattern_aggregate_meta
+                )
+            """)
+            result = cursor.fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Shoe ID okuma hatası: {e}")
+        return 0
+    return result[0] if result and result[0] is not None else 0
+
+class DatabaseManager(ResultStore):
+    """Veritabanı bağlantısını ve işlemlerini yöneten sınıf (SQLite sonuç deposu)."""
+    
+    def __init__(self, storage_layout=None, table_id=None, check_same_thread=True,
+                 in_memory=False, snapshot_file=SIMULATION_DB_FILE, profile_sql=None, db_file=None):
+        """Veritabanı bağlantısını başlatır.
+        
+        Args:
+            storage_layout (str, optional): Sonuç saklama düzeni, 'rows' veya 'packed'.
+                Belirtilmezse config'deki RESULT_STORAGE_LAYOUT kullanılır.
+            table_id (int, optional): Masa ID'si; her masa ayrı bir veritabanı dosyası kullanır.
+            check_same_thread (bool, optional): False ise bağlantı başka thread'lerden
+                kullanılabilir (erişimi çağıran senkronize etmelidir).
+            in_memory (bool, optional): True ise veritabanı bellekte tutulur ve diske yalnızca
+                shoe sonlarında ya da snapshot() çağrıldığında yedekleme API'si ile yazılır.
+            snapshot_file (str, optional): Bellek içi modda anlık görüntü dosyası; varsa
+                açılışta buradan yüklenir.
+            profile_sql (bool, optional): Sorgu profillemesi; belirtilmezse SQL_PROFILING kullanılır.
+            db_file (str, optional): Veritabanı dosyası; belirtilirse table_id'den türetilen dosyanın yerine kullanılır.
+        """
+        super().__init__()
         self.connection = None
+        self.table_id = table_id
+        self.in_memory = in_memory
+        self.snapshot_file = snapshot_file
+        self.db_file = db_file or get_db_file(table_id, in_memory)
+        self.profiler = create_profiler(f"DatabaseManager ({self.db_file})", profile_sql)
+        self.check_same_thread = check_same_thread
+        self.packed_store = None
+        self.storage_layout = storage_layout or RESULT_STORAGE_LAYOUT
         self.write_buffer = []
+        self.summary_buffer = []  # (shoe_id, winner, is_win, kasa) - shoe özetleri için
+        self.shoe_summaries = {}  # shoe_id -> güncel özet (shoe_summary satırının bellekteki kopyası)
         self.current_shoe_id = 1  # Mevcut shoe ID'sini sakla
         self._initialize_database()
         self._load_current_shoe_id()
@@ -22,30 +130,20 @@ class DatabaseManager:
     def _initialize_database(self):
         """Veritabanını başlatır ve gerekli tabloları oluşturur."""
         try:
-            self.connection = sqlite3.connect(DB_FILE)
-            cursor = self.connection.cursor()
-            
-            # Sonuçlar tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    shoe_id INTEGER NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    winner TEXT NOT NULL
-                )
-            ''')
+            self.connection = connect_database(self.db_file, self.check_same_thread)
+            if self.in_memory and self.snapshot_file and os.path.exists(self.snapshot_file):
+                # Önceki simülasyonun anlık görüntüsü belleğe yüklenir
+                source = sqlite3.connect(self.snapshot_file)
+                source.backup(self.connection)
+                source.close()
+                print(f"Anlık görüntü '{self.snapshot_file}' belleğe yüklendi.")
+            # Tablolar ve indeksler sürümlü göç adımlarıyla oluşturulur/güncellenir
+            apply_migrations(self.connection)
+            if self.profiler:
+                self.connection = ProfiledConnection(self.connection, self.profiler)
+            self.packed_store = PackedShoeStore(self.connection)
             
-            # Shoe takip tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS shoe_tracker (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    start_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    shoe_id INTEGER NOT NULL UNIQUE
-                )
-            ''')
-            
-            self.connection.commit()
-            print(f"Veritabanı '{DB_FILE}' başarıyla başlatıldı.")
+            print(f"Veritabanı '{self.db_file}' başarıyla başlatıldı.")
         except sqlite3.Error as e:
             print(f"Veritabanı hatası: {e}")
             self.connection = None
@@ -88,36 +186,86 @@ class DatabaseManager:
     
     def new_shoe_detected(self):
         """Yeni shoe tespiti durumunda çağrılır, shoe ID'sini artırır."""
+        if self.in_memory:
+            # Biten shoe bellek içi modda diske yalnızca burada yazılır
+            self.snapshot()
         self.current_shoe_id += 1
         self._create_new_shoe_record()
         print(f"Yeni shoe başladı! Shoe ID: {self.current_shoe_id}")
         
         # Tampon temizleme - yeni shoe için yeni işlemlere başla
         self.write_buffer.clear()
+        self.summary_buffer.clear()
+        self.shoe_summaries.clear()
     
-    def add_result(self, winner):
+    def add_result(self, winner, is_win=None, kasa=None):
         """Sonucu veritabanı tamponuna ekler.
         
         Args:
             winner (str): Kazananı temsil eden 'P' veya 'B' değeri.
+            is_win (bool, optional): Bahis sonucu; bahis yapılmadıysa None.
+            kasa (float, optional): El sonrası kasa değeri (shoe özeti için).
         """
         if not self.connection:
             return
         # Shoe ID ile birlikte sonucu tampona ekle
         self.write_buffer.append((self.current_shoe_id, winner))
+        self.summary_buffer.append((self.current_shoe_id, winner, is_win, kasa))
+    
+    def _flush_summaries(self, cursor):
+        """Tampondaki elleri shoe özetlerine ekler ve yazar (commit çağırana aittir).
+        
+        Returns:
+            dict: Güncellenen shoe_id -> özet çiftleri (commit sonrası önbelleğe alınır).
+        """
+        updated = {}
+        for shoe_id, winner, is_win, kasa in self.summary_buffer:
+            if shoe_id not in updated:
+                cached = self.shoe_summaries.get(shoe_id)
+                updated[shoe_id] = dict(cached) if cached else load_summary(cursor, shoe_id)
+            update_summary(updated[shoe_id], winner, is_win, kasa)
+        for shoe_id, summary in updated.items():
+            save_summary(cursor, shoe_id, summary)
+        return updated
     
     def flush_buffer(self):
         """Tamponlanmış sonuçları veritabanına yazar."""
         if not self.connection or not self.write_buffer:
             return
         try:
-            cursor = self.connection.cursor()
-            cursor.executemany("INSERT INTO results (shoe_id, winner) VALUES (?, ?)", self.write_buffer)
+            if self.storage_layout == 'packed':
+                # Shoe başına tek satır: sonuçlar mevcut bit paketinin sonuna eklenir
+                self.packed_store.append_buffer(self.write_buffer)
+            else:
+                cursor = self.connection.cursor()
+                cursor.executemany("INSERT INTO results (shoe_id, winner) VALUES (?, ?)", self.write_buffer)
+            # Shoe özetleri sonuçlarla aynı işlemde güncellenir
+            updated = self._flush_summaries(self.connection.cursor())
             self.connection.commit()
+            self.shoe_summaries.update(updated)
             self.write_buffer.clear()
+            self.summary_buffer.clear()
         except sqlite3.Error as e:
             print(f"DB Yazma Hatası: {e}")
     
+    def get_current_shoe_results(self):
+        """Mevcut shoe'nun veritabanına yazılmış sonuçlarını döndürür.
+        
+        Returns:
+            list: 'P' veya 'B' değerlerinden oluşan sonuçlar.
+        """
+        if self.storage_layout == 'packed':
+            # Tüm shoe tek satır okumasıyla gelir
+            return self.packed_store.load_shoe(self.current_shoe_id)
+        
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT winner FROM results 
+            WHERE shoe_id = ? 
+            ORDER BY id
+        """, (self.current_shoe_id,))
+        return [row[0] for row in cursor.fetchall()]
+    
     def predict_from_history(self, current_sequence):
         """Veritabanındaki geçmiş verilerine göre tahmin yapar.
         
@@ -130,35 +278,9 @@ class DatabaseManager:
         if not self.connection or len(current_sequence) < DB_LOOKBACK:
             return '?'
         
-        lookup_sequence = "".join(current_sequence[-DB_LOOKBACK:])
-        
         try:
-            cursor = self.connection.cursor()
-            
             # Sadece MEVCUT shoe_id için tahmin yap
-            cursor.execute("""
-                SELECT winner FROM results 
-                WHERE shoe_id = ? 
-                ORDER BY id
-            """, (self.current_shoe_id,))
-            
-            all_results = [row[0] for row in cursor.fetchall()]
-            
-            if len(all_results) <= DB_LOOKBACK:
-                return '?'
-            
-            next_outcomes = []
-            for i in range(len(all_results) - DB_LOOKBACK):
-                current_seq = "".join(all_results[i: i + DB_LOOKBACK])
-                if current_seq == lookup_sequence:
-                    next_outcome = all_results[i + DB_LOOKBACK]
-                    next_outcomes.append(next_outcome)
-            
-            if not next_outcomes:
-                return '?'
-                
-            most_common = Counter(next_outcomes).most_common(1)
-            return most_common[0][0] if most_common else '?'
+            return predict_next_from_results(self.get_current_shoe_results(), current_sequence)
             
         except sqlite3.Error as e:
             print(f"DB Okuma Hatası: {e}")
@@ -175,7 +297,10 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             cursor.execute("DELETE FROM results WHERE shoe_id = ?", (self.current_shoe_id,))
+            self.packed_store.delete_shoe(self.current_shoe_id)
+            cursor.execute("DELETE FROM shoe_summary WHERE shoe_id = ?", (self.current_shoe_id,))
             self.connection.commit()
+            self.shoe_summaries.pop(self.current_shoe_id, None)
             print(f"Shoe ID {self.current_shoe_id} için veriler temizlendi.")
             return True
         except sqlite3.Error as e:
@@ -191,9 +316,12 @@ class DatabaseManager:
             cursor = self.connection.cursor()
             cursor.execute("DELETE FROM results")
             cursor.execute("DELETE FROM shoe_tracker")
+            self.packed_store.clear()
+            cursor.execute("DELETE FROM shoe_summary")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='results'")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='shoe_tracker'")
             self.connection.commit()
+            self.shoe_summaries.clear()
             
             # Shoe ID'yi sıfırla
             self.current_shoe_id = 1
@@ -205,9 +333,38 @@ class DatabaseManager:
             print(f"DB Temizleme Hatası: {e}")
             return False
     
+    def snapshot(self, target_file=None):
+        """Bellek içi veritabanını yedekleme API'si ile diske yazar.
+        
+        Args:
+            target_file (str, optional): Hedef dosya (varsayılan snapshot_file).
+            
+        Returns:
+            bool: Yazma başarılıysa True.
+        """
+        target_file = target_file or self.snapshot_file
+        if not self.connection or not target_file:
+            return False
+        
+        self.flush_buffer()
+        try:
+            start_time = time.time()
+            target = sqlite3.connect(target_file)
+            self.connection.backup(target)
+            target.close()
+            print(f"Anlık görüntü '{target_file}' dosyasına yazıldı ({(time.time() - start_time) * 1000:.1f} ms).")
+            return True
+        except sqlite3.Error as e:
+            print(f"Anlık görüntü hatası: {e}")
+            return False
+    
     def close(self):
         """Veritabanı bağlantısını kapatır."""
         self.flush_buffer()
+        if self.in_memory:
+            self.snapshot()
+        if self.profiler:
+            print(self.profiler.report())
         if self.connection:
             self.connection.close()
             print("Veritabanı bağlantısı kapatıldı.")
\ No newline at end of file
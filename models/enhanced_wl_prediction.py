@@ -205,12 +205,14 @@ class EnhancedWLPredictionModel:
         # Diğer tüm durumlar
         return "mixed"
     
-    def predict(self, wl_history):
+    def predict(self, wl_history, pattern_type=None):
         """
         Hem yatay hem dikey desenleri analiz ederek ağırlıklı bir tahmin yapar.
         
         Args:
             wl_history (list): 'W' ve 'L' değerlerinden oluşan kazanç/kayıp geçmişi.
+            pattern_type (str, optional): Hazır desen türü (HandFeatureStore.wl_pattern_type);
+                verilmezse geçmişten sınıflandırılır.
             
         Returns:
             str: Tahmin edilen değer ('W', 'L' veya '?').
@@ -229,7 +231,8 @@ class EnhancedWLPredictionModel:
             return horizontal_pred
         
         # Desen türünü belirle
-        pattern_type = self._classify_pattern(wl_history)
+        if pattern_type is None:
+            pattern_type = self._classify_pattern(wl_history)
         
         # Desen türüne göre ağırlıklandırma yap
         if pattern_type in self.pattern_type_successes:
@@ -257,13 +260,14 @@ class EnhancedWLPredictionModel:
         else:
             return vertical_pred
     
-    def should_reverse_bet(self, wl_history, main_prediction):
+    def should_reverse_bet(self, wl_history, main_prediction, pattern_type=None):
         """
         Ana tahmine karşı bahis yapılması gerekip gerekmediğini belirler.
         
         Args:
             wl_history (list): 'W' ve 'L' değerlerinden oluşan kazanç/kayıp geçmişi.
             main_prediction (str): Ana tahmin ('P' veya 'B').
+            pattern_type (str, optional): Hazır desen türü; verilmezse geçmişten sınıflandırılır.
             
         Returns:
             tuple: (should_reverse, predicted_wl, horizontal_pred, vertical_pred) - Tersine bahis yapılmalı mı, WL tahmini ve ayrı tahminler.
@@ -271,7 +275,7 @@ class EnhancedWLPredictionModel:
         if not wl_history:
             return False, '?', '?', '?'
             
-        predicted_wl = self.predict(wl_history)
+        predicted_wl = self.predict(wl_history, pattern_type)
         
         # Tahmin kayıp veya belirsizse, bahsi tersine çevir
         should_reverse = predicted_wl == 'L'
@@ -0,0 +1,116 @@
+"""
+Tüm tahmin modellerinin çıktılarını birleştiren çevrimiçi lojistik regresyon topluluğu.
+Her modelin tahmini bir özelliktir (P=+1, B=-1, tahmin yok=0). WL tahminleri
+(W=+1, L=-1) taban modellerin çoğunluk oyunun yönüyle çarpılarak eklenir
+(oylar eşitse 0).
+Ağırlıklar her elden sonra tek bir vektörel NumPy adımıyla güncellenir.
+Model yalnızca P/B değil, Player olasılığı da verir.
+NumPy isteğe bağlıdır; yüklü değilse PredictionModel bu modeli eklemez.
+"""
+import math
+
+import numpy as np
+
+from config import ENSEMBLE_LEARNING_RATE, ENSEMBLE_L2, ENSEMBLE_MARGIN
+
+RESULT_SIGNS = {'P': 1.0, 'B': -1.0}
+WL_SIGNS = {'W': 1.0, 'L': -1.0}
+
+class EnsembleModel:
+    """Model tahminlerini özellik olarak kullanan çevrimiçi lojistik regresyon."""
+
+    def __init__(self, model_names, wl_count=3, learning_rate=ENSEMBLE_LEARNING_RATE,
+                 l2=ENSEMBLE_L2, margin=ENSEMBLE_MARGIN):
+        """
+        Args:
+            model_names (list): Özellik olarak kullanılacak model adları (sıra sabittir).
+            wl_count (int, optional): WL tahmini özellik sayısı.
+            learning_rate (float, optional): Öğrenme oranı.
+            l2 (float, optional): Ağırlık küçültme (L2) katsayısı.
+            margin (float, optional): Olasılık 0.5 ± margin içindeyse tahmin yapılmaz.
+        """
+        self.model_names = list(model_names)
+        self.wl_count = wl_count
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.margin = margin
+        # Son eleman sabit terim (bias)
+        self.weights = np.zeros(len(self.model_names) + wl_count + 1)
+        self.updates = 0
+
+    def reset(self):
+        """Öğrenilen ağırlıkları siler."""
+        self.weights.fill(0.0)
+        self.updates = 0
+
+    def features(self, predictions, wl_predictions=()):
+        """Model ve WL tahminlerinden özellik vektörünü oluşturur.
+
+        Args:
+            predictions (dict): Model adı -> tahmin ('P', 'B' veya '?').
+            wl_predictions (iterable, optional): WL tahminleri ('W', 'L' veya '?').
+
+        Returns:
+            numpy.ndarray: Özellik vektörü.
+        """
+        x = np.zeros_like(self.weights)
+        for i, name in enumerate(self.model_names):
+            x[i] = RESULT_SIGNS.get(predictions.get(name), 0.0)
+        # WL tahmini "oynanan taraf kazanır/kaybeder" der; oynanan taraf çoğunluk oyudur.
+        # Oylar eşitse oynanan taraf belirsizdir ve WL özellikleri 0 kalır.
+        majority = np.sign(x[:len(self.model_names)].sum())
+        offset = len(self.model_names)
+        for i, wl_pred in enumerate(list(wl_predictions)[:self.wl_count]):
+            x[offset + i] = WL_SIGNS.get(wl_pred, 0.0) * majority
+        x[-1] = 1.0
+        return x
+
+    def probability(self, x):
+        """Player kazanma olasılığını döndürür.
+
+        Args:
+            x (numpy.ndarray): features ile oluşturulmuş özellik vektörü.
+
+        Returns:
+            float: P(Player), 0-1 arasında.
+        """
+        z = float(self.weights @ x)
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def predict(self, x):
+        """Olasılığa göre tahmin yapar.
+
+        Args:
+            x (numpy.ndarray): Özellik vektörü.
+
+        Returns:
+            str: 'P', 'B' veya olasılık belirsizse '?'.
+        """
+        if not self.updates:
+            return '?'
+        p = self.probability(x)
+        if p > 0.5 + self.margin:
+            return 'P'
+        if p < 0.5 - self.margin:
+            return 'B'
+        return '?'
+
+    def update(self, x, actual_result):
+        """Gerçekleşen sonuca göre ağırlıkları tek bir gradyan adımıyla günceller.
+
+        Args:
+            x (numpy.ndarray): Tahmin anındaki özellik vektörü.
+            actual_result (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        if actual_result not in RESULT_SIGNS:
+            return
+        y = 1.0 if actual_result == 'P' else 0.0
+        error = y - self.probability(x)
+        self.weights *= 1.0 - self.learning_rate * self.l2
+        self.weights += self.learning_rate * error * x
+        self.updates += 1
+
+    def get_weights(self):
+        """Özellik adı -> ağırlık sözlüğünü döndürür (ayrıntı görünümü için)."""
+        names = self.model_names + [f"WL {i + 1}" for i in range(self.wl_count)] + ["Sabit"]
+        return dict(zip(names, self.weights.tolist()))
\ No newline at end of file
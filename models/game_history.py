@@ -4,6 +4,9 @@ Bu modül, oyun sonuçlarını, kasa durumunu ve Martingale stratejisi takibini
 """
 from config import INITIAL_KASA, MARTINGALE_SEQUENCE, GRID_SIZE, MAX_HISTORY_IN_GRID
 from baccarat_simulator import is_new_shoe_detected
+from models.bitboard import BeadBitboard
+from models.roads import RoadEngine
+from models.hand_features import HandFeatureStore
 
 class GameHistory:
     """Oyun geçmişini ve istatistiklerini yöneten sınıf."""
@@ -14,6 +17,8 @@ class GameHistory:
     def reset(self):
         """Tüm geçmiş ve istatistikleri sıfırlar."""
         self.history = []
+        self.player_count = 0  # get_statistics'in history.count() yapmaması için artımlı sayaçlar
+        self.banker_count = 0
         self.win_loss_history = []
         self.kasa = INITIAL_KASA
         self.current_bet_index = 0
@@ -21,7 +26,13 @@ class GameHistory:
         self.current_loss_streak = 0
         self.longest_win_streak = 0
         self.longest_loss_streak = 0
-        self.grid_data = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        # Grid her elde bitboard'a eklenerek güncellenir; grid_data onun liste görünümüdür
+        self.bead_board = BeadBitboard(GRID_SIZE, GRID_SIZE, MAX_HISTORY_IN_GRID)
+        self.grid_data = self.bead_board.to_grid()
+        # Big Road ve türetilmiş yollar da her elde artımlı güncellenir
+        self.roads = RoadEngine()
+        # Seri uzunluğu, W/L desen türü gibi özellikler de her elde bir kez ilerletilir
+        self.features = HandFeatureStore()
         self.new_shoe_detected = False
         
         # Reverse betting statistics
@@ -58,10 +69,15 @@ class GameHistory:
     def clear_histories(self):
         """Sadece geçmiş verilerini sıfırlar, kasa durumunu korur."""
         self.history = []
+        self.player_count = 0
+        self.banker_count = 0
         self.win_loss_history = []
         self.current_win_streak = 0
         self.current_loss_streak = 0
-        self.grid_data = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.bead_board.clear()
+        self.grid_data = self.bead_board.to_grid()
+        self.roads.clear()
+        self.features.clear()
         self.new_shoe_detected = False
         
         # Reverse betting statistics reset
@@ -105,6 +121,7 @@ class GameHistory:
         self.new_shoe_detected = is_new_shoe_detected()
         
         self.history.append(winner)
+        self._count_result(winner, 1)
         
         bet_index = min(self.current_bet_index, len(MARTINGALE_SEQUENCE) - 1)
         current_bet = MARTINGALE_SEQUENCE[bet_index]
@@ -121,6 +138,7 @@ class GameHistory:
             if is_win:  # Kazanç
                 result_info['bet_change'] = current_bet
                 self.win_loss_history.append('W')
+                self.features.add_wl('W')
                 self.kasa += current_bet
                 self.current_win_streak += 1
                 self.current_loss_streak = 0
@@ -160,6 +178,7 @@ class GameHistory:
             else:  # Kayıp
                 result_info['bet_change'] = -current_bet
                 self.win_loss_history.append('L')
+                self.features.add_wl('L')
                 self.kasa -= current_bet
                 self.current_loss_streak += 1
                 self.current_win_streak = 0
@@ -210,10 +229,20 @@ class GameHistory:
             self.last_vertical_wl_pred = '?'
             self.last_pattern_type = None
         
-        self._rebuild_grid_from_history()
+        self.bead_board.push(winner)
+        self.grid_data = self.bead_board.to_grid()
+        self.roads.add_result(winner)
+        self.features.add_result(winner)
         
         return result_info
     
+    def _count_result(self, winner, delta):
+        """P/B sayaçlarını günceller."""
+        if winner == 'P':
+            self.player_count += delta
+        elif winner == 'B':
+            self.banker_count += delta
+    
     def _trim_recent_results(self, results_list):
         """Son sonuçlar listesini belirli bir uzunlukta tutar."""
         while len(results_list) > self.max_recent_results:
@@ -268,6 +297,7 @@ class GameHistory:
             return False
         
         removed_result = self.history.pop()
+        self._count_result(removed_result, -1)
         if self.win_loss_history:
             removed_wl = self.win_loss_history.pop()
             
@@ -283,25 +313,14 @@ class GameHistory:
             # if it was a reverse bet without additional tracking
         
         self._rebuild_grid_from_history()
+        self.roads.load(self.history)
+        self.features.load(self.history, self.win_loss_history)
         return True
     
     def _rebuild_grid_from_history(self):
-        """Geçmişteki sonuçlara göre grid verilerini yeniden oluşturur."""
-        start_index = max(0, len(self.history) - MAX_HISTORY_IN_GRID)
-        grid_relevant_history = self.history[start_index:]
-        
-        self.grid_data = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        current_r, current_c = 0, 0
-        
-        for item in grid_relevant_history:
-            if current_c < GRID_SIZE:
-                self.grid_data[current_r][current_c] = item
-                current_r += 1
-                if current_r >= GRID_SIZE:
-                    current_r = 0
-                    current_c += 1
-            else:
-                break
+        """Geçmişteki sonuçlara göre grid verilerini yeniden oluşturur (geri almada kullanılır)."""
+        self.bead_board.load(self.history)
+        self.grid_data = self.bead_board.to_grid()
     
     def get_current_bet(self):
         """Mevcut bahis miktarını döndürür.
@@ -319,8 +338,8 @@ class GameHistory:
             dict: İstatistikleri içeren sözlük.
         """
         total_hands = len(self.history)
-        p_wins = self.history.count('P')
-        b_wins = self.history.count('B')
+        p_wins = self.player_count
+        b_wins = self.banker_count
         
         # Calculate reverse betting effectiveness
         reverse_accuracy = 0
@@ -0,0 +1,153 @@
+"""
+El başına bir kez ilerletilen ortak özellik deposu.
+Tahmin modellerinin ve arayüzün sonuç listelerinden tekrar tekrar kesip
+birleştirdiği değerler (son sonuç, seri uzunluğu, zigzag uzunluğu, son k
+sonucun kodları, W/L desen türü) her yeni elde O(1) maliyetle güncellenir.
+Kodlar:
+    code(k)        - son k sonuç, P=0 / B=1 bitleri, en yeni sonuç en düşük bitte
+    pattern_key(k) - son k sonuç, hücre başına 2 bit (bkz. models/pattern_keys.py)
+    suffix(k)      - son k sonucun metni ("".join(history[-k:]) ile aynı)
+Geri alma ya da geçmiş temizleme durumunda depo listeden yeniden kurulur.
+"""
+from models.packed_storage import OUTCOME_BITS
+from models.pattern_keys import CELL_BITS, CELL_CODES
+
+MAX_CODE_LENGTH = 32  # code, pattern_key ve suffix için en uzun bağlam
+
+WL_PATTERN_LENGTH = 4  # W/L desen türü son 4 bahise göre belirlenir
+
+def _continues(values, length, last):
+    """Liste depodaki durumla aynı mı ya da tek bir ek eleman kadar ileride mi?"""
+    if len(values) not in (length, length + 1):
+        return False
+    return length == 0 or values[length - 1] == last
+
+class HandFeatureStore:
+    """Sonuç ve kazanç/kayıp geçmişinin artımlı özelliklerini tutan sınıf."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Tüm özellikleri sıfırlar."""
+        self.clear_results()
+        self.clear_wl()
+
+    def clear_results(self):
+        """Sonuç özelliklerini sıfırlar."""
+        self.length = 0
+        self.last_result = None
+        self.run_length = 0          # Son sonuçla aynı değerdeki ardışık el sayısı
+        self.alternation_length = 0  # Sonu sürekli değişen (PBPB...) kuyruğun uzunluğu
+        self._code = 0
+        self._pattern_key = 0
+        self._tail = ''
+
+    def clear_wl(self):
+        """Kazanç/kayıp özelliklerini sıfırlar."""
+        self.wl_length = 0
+        self.wl_last = None
+        self.wl_run_length = 0
+        self.wl_alternation_length = 0
+
+    def add_result(self, winner):
+        """Yeni eli ekler.
+
+        Args:
+            winner (str): 'P' veya 'B'.
+        """
+        if winner == self.last_result:
+            self.run_length += 1
+            self.alternation_length = 1
+        else:
+            self.run_length = 1
+            self.alternation_length = self.alternation_length + 1 if self.length else 1
+        self.length += 1
+        self.last_result = winner
+
+        self._code = ((self._code << 1) | OUTCOME_BITS.get(winner, 0)) & ((1 << MAX_CODE_LENGTH) - 1)
+        self._pattern_key = (((self._pattern_key << CELL_BITS) | CELL_CODES.get(winner, 0))
+                             & ((1 << (CELL_BITS * MAX_CODE_LENGTH)) - 1))
+        self._tail = (self._tail + winner)[-MAX_CODE_LENGTH:]
+
+    def add_wl(self, outcome):
+        """Yeni bahis sonucunu ekler.
+
+        Args:
+            outcome (str): 'W' veya 'L'.
+        """
+        if outcome == self.wl_last:
+            self.wl_run_length += 1
+            self.wl_alternation_length = 1
+        else:
+            self.wl_run_length = 1
+            self.wl_alternation_length = self.wl_alternation_length + 1 if self.wl_length else 1
+        self.wl_length += 1
+        self.wl_last = outcome
+
+    def load(self, history, wl_history=None):
+        """Depoyu listelerden yeniden kurar (geri almada kullanılır).
+
+        Args:
+            history (list): 'P'/'B' sonuçları (en eski başta).
+            wl_history (list, optional): 'W'/'L' bahis sonuçları (en eski başta).
+        """
+        self.clear_results()
+        for winner in history:
+            self.add_result(winner)
+        if wl_history is not None:
+            self.clear_wl()
+            for outcome in wl_history:
+                self.add_wl(outcome)
+
+    def follow(self, history, wl_history=None):
+        """Depoyu verilen listelere eşitler.
+
+        Listeler bir el uzamışsa yalnızca yeni el eklenir; başka bir değişiklik
+        (geri alma, temizleme) varsa depo yeniden kurulur.
+
+        Args:
+            history (list): Güncel sonuç listesi.
+            wl_history (list, optional): Güncel kazanç/kayıp listesi.
+        """
+        if not _continues(history, self.length, self.last_result):
+            self.clear_results()
+            for winner in history[:-1]:
+                self.add_result(winner)
+        if len(history) > self.length:
+            self.add_result(history[-1])
+
+        if wl_history is not None:
+            if not _continues(wl_history, self.wl_length, self.wl_last):
+                self.clear_wl()
+                for outcome in wl_history[:-1]:
+                    self.add_wl(outcome)
+            if len(wl_history) > self.wl_length:
+                self.add_wl(wl_history[-1])
+
+    def code(self, k):
+        """Son k sonucun bit kodunu döndürür (P=0, B=1; en yeni sonuç en düşük bitte).
+
+        Returns:
+            int: Kod; k sonuçtan az el varsa None.
+        """
+        if self.length < k:
+            return None
+        return self._code & ((1 << k) - 1)
+
+    def pattern_key(self, k):
+        """Son k sonucun 2 bitlik desen anahtarını döndürür (encode_sequence(history[-k:]) ile aynı)."""
+        return self._pattern_key & ((1 << (CELL_BITS * k)) - 1)
+
+    def suffix(self, k):
+        """Son k sonucun metnini döndürür ("".join(history[-k:]) ile aynı)."""
+        return self._tail[-k:] if k else ''
+
+    @property
+    def wl_pattern_type(self):
+        """Son 4 bahisin desen türü: 'streak' (WWWW/LLLL), 'alternating' (WLWL/LWLW) ya da 'mixed'."""
+        if self.wl_run_length >= WL_PATTERN_LENGTH:
+            return "streak"
+        if self.wl_alternation_length >= WL_PATTERN_LENGTH:
+            return "alternating"
+        return "mixed"
\ No newline at end of file
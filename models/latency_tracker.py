@@ -0,0 +1,83 @@
+"""
+Model başına tahmin süresi (gecikme) takibi.
+Her predict_func çağrısının süresi time.perf_counter_ns ile ölçülür; çağrı
+içinde hesaplanan diğer modellerin süresi düşülür. Son window ölçüm sabit
+boyutlu bir halka tamponda tutulur. Kayıt O(1)'dir; p50/p99 yüzdelikleri
+yalnızca istendiğinde (ayrıntı penceresi, rapor) tampondan hesaplanır.
+"""
+from array import array
+
+from config import MODEL_LATENCY_WINDOW
+
+class LatencyTracker:
+    """Bir modelin son tahmin sürelerini ve toplam çağrı sayısını tutan sınıf."""
+
+    def __init__(self, window=MODEL_LATENCY_WINDOW):
+        """
+        Args:
+            window (int, optional): Yüzdelik hesabında kullanılacak son ölçüm sayısı.
+        """
+        self.window = window
+        self.buffer = array('q', bytes(8 * window))  # Halka tampon (nanosaniye)
+        self.position = 0
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, elapsed_ns):
+        """Bir çağrının süresini ekler.
+
+        Args:
+            elapsed_ns (int): Süre (nanosaniye).
+        """
+        self.buffer[self.position] = elapsed_ns
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        self.total_ns += elapsed_ns
+
+    def percentile(self, percent):
+        """Son ölçümlerde en yakın sıra yöntemiyle yüzdelik süreyi döndürür.
+
+        Args:
+            percent (float): Yüzdelik (0-100).
+
+        Returns:
+            float: Süre (mikrosaniye); ölçüm yoksa 0.0.
+        """
+        size = min(self.count, self.window)
+        if not size:
+            return 0.0
+        latencies = sorted(self.buffer[:size])
+        index = max(0, min(size - 1, int(round(percent / 100.0 * size)) - 1))
+        return latencies[index] / 1000.0
+
+    def mean(self):
+        """Tüm çağrıların ortalama süresini döndürür (mikrosaniye)."""
+        return self.total_ns / self.count / 1000.0 if self.count else 0.0
+
+    def summary(self):
+        """Çağrı sayısı, ortalama, p50 ve p99 sürelerini döndürür.
+
+        Returns:
+            dict: 'count', 'mean_us', 'p50_us' ve 'p99_us' anahtarlı sözlük.
+        """
+        return {
+            'count': self.count,
+            'mean_us': self.mean(),
+            'p50_us': self.percentile(50),
+            'p99_us': self.percentile(99),
+        }
+
+def format_latency_report(rows):
+    """Model gecikme özetlerinden okunabilir rapor üretir.
+
+    Args:
+        rows (list): PredictionModel.get_latency_summary çıktısı.
+
+    Returns:
+        str: Rapor metni.
+    """
+    lines = ["--- Model tahmin süreleri ---"]
+    for row in rows:
+        lines.append(f"{row['count']:>7} çağrı  ort. {row['mean_us']:9.1f}  p50 {row['p50_us']:9.1f}  "
+                     f"p99 {row['p99_us']:9.1f} µs  {row['name']}")
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Model sıralamasını artımlı olarak tutan modül.
+Modeller doğruluk oranına (ya da verilen ölçüte) göre sıralı bir listede tutulur; bir modelin kaydı
+değiştiğinde yalnızca o modelin yeri ikili aramayla (bisect) güncellenir.
+En iyi model listenin başındadır, her sorguda yeniden sıralama yapılmaz.
+"""
+import bisect
+
+class ModelLeaderboard:
+    """Model kayıtlarını (sözlük) tutan ve doğruluk sırasını güncel tutan yapı.
+
+    Liste gibi okunabilir (for, len, indeks); sıra listedeki ekleme sırası
+    korunarak döner. Sıralamada yalnızca en az bir tahmini olan modeller bulunur,
+    eşit doğruluktaki modeller ekleme sırasına göre dizilir (sorted ile aynı).
+    """
+
+    def __init__(self, models, score=None):
+        """
+        Args:
+            models (list): 'name', 'wins', 'total' ve 'accuracy' anahtarlı model sözlükleri.
+            score (callable, optional): Model kaydından sıralama puanı üreten fonksiyon
+                (varsayılan ömür boyu doğruluk, 'accuracy').
+        """
+        self._score = score or (lambda model: model['accuracy'])
+        self._models = list(models)
+        self._by_name = {model['name']: model for model in self._models}
+        self._order = {model['name']: index for index, model in enumerate(self._models)}
+        self._keys = {}     # Model adı -> sıralamadaki anahtarı
+        self._ranked = []   # (-doğruluk, ekleme sırası, model adı)
+        for model in self._models:
+            self.update(model)
+
+    def __iter__(self):
+        return iter(self._models)
+
+    def __len__(self):
+        return len(self._models)
+
+    def __getitem__(self, index):
+        return self._models[index]
+
+    def get(self, name):
+        """Adı verilen modelin kaydını döndürür (yoksa None)."""
+        return self._by_name.get(name)
+
+    def update(self, model):
+        """Kaydı değişen modelin sıradaki yerini günceller.
+
+        Args:
+            model (dict): Doğruluğu ya da tahmin sayısı değişmiş model kaydı.
+        """
+        name = model['name']
+        old_key = self._keys.pop(name, None)
+        if old_key is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, old_key)]
+
+        if model['total'] > 0:
+            key = (-self._score(model), self._order[name], name)
+            bisect.insort(self._ranked, key)
+            self._keys[name] = key
+
+    def set_score(self, score):
+        """Sıralama ölçütünü değiştirir ve sırayı yeniden kurar.
+
+        Args:
+            score (callable): Model kaydından sıralama puanı üreten fonksiyon.
+        """
+        self._score = score
+        self._keys.clear()
+        self._ranked.clear()
+        for model in self._models:
+            self.update(model)
+
+    def best(self, min_predictions=1, exclude=None):
+        """Yeterli tahmini olan en yüksek doğruluklu modeli döndürür.
+
+        Sıralamanın başından itibaren ilk uygun model alınır; çoğu durumda
+        ilk eleman uygundur.
+
+        Args:
+            min_predictions (int, optional): Minimum tahmin sayısı.
+            exclude (str, optional): Sıralamada atlanacak model adı.
+
+        Returns:
+            dict: Model kaydı; uygun model yoksa None.
+        """
+        for _, _, name in self._ranked:
+            model = self._by_name[name]
+            if name != exclude and model['total'] >= min_predictions:
+                return model
+        return None
+
+    def top(self, count, min_predictions=1):
+        """Yeterli tahmini olan ilk count modeli doğruluk sırasıyla döndürür.
+
+        Args:
+            count (int): Model sayısı.
+            min_predictions (int, optional): Minimum tahmin sayısı.
+
+        Returns:
+            list: Model kayıtları.
+        """
+        ranked = []
+        for _, _, name in self._ranked:
+            model = self._by_name[name]
+            if model['total'] >= min_predictions:
+                ranked.append(model)
+                if len(ranked) == count:
+                    break
+        return ranked
\ No newline at end of file
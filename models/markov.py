@@ -0,0 +1,122 @@
+"""
+Sabit dereceli (k) Markov zinciri tahmin modeli.
+Durum, son k sonucun tamsayı kodudur (P=0, B=1 bitleri, en yeni sonuç en
+düşük bitte); kayan kod el başına HandFeatureStore'da ilerletilir. Geçiş
+sayımları 2^k x 2 boyutlu yoğun bir NumPy dizisindedir: counts[durum,
+sonraki sonuç]. Dizi açılışta veritabanındaki tüm sonuçlardan vektörel
+olarak hesaplanır, sonra her elde tek hücre artırılır. Tahmin, durumla tek
+bir dizi indekslemesidir. Geçişler shoe sınırlarını aşmaz.
+"""
+import sqlite3
+
+import numpy as np
+
+from config import MARKOV_ORDER, MARKOV_MIN_COUNT
+from models.database import get_db_file, connect_database
+from models.packed_storage import OUTCOME_BITS, iter_shoe_results
+
+MAX_MARKOV_ORDER = 16  # 2^16 x 2 sayım dizisi (~1 MB)
+
+class MarkovChainModel:
+    """Son k sonuca göre sonraki sonucun sayımlarını tutan Markov zinciri."""
+
+    def __init__(self, order=MARKOV_ORDER, min_count=MARKOV_MIN_COUNT, table_id=None, in_memory=False):
+        """
+        Args:
+            order (int, optional): Zincirin derecesi (bağlamdaki sonuç sayısı).
+            min_count (int, optional): Tahmin için durumda gereken en az geçiş sayısı.
+            table_id (int, optional): Masa ID'si; sayımlar masanın sonuçlarından hesaplanır.
+            in_memory (bool, optional): True ise masanın bellek içi simülasyon veritabanı okunur.
+        """
+        if not 1 <= order <= MAX_MARKOV_ORDER:
+            raise ValueError(f"Markov derecesi 1 ile {MAX_MARKOV_ORDER} arasında olmalı: {order}")
+        self.order = order
+        self.min_count = min_count
+        self.counts = np.zeros((1 << order, 2), dtype=np.int64)
+        # Mevcut shoe'nun geçişleri ayrıca tutulur; shoe temizlenince toplamdan çıkarılır
+        self.shoe_id = None
+        self.shoe_counts = np.zeros_like(self.counts)
+        self._load_counts(get_db_file(table_id, in_memory))
+
+    def _load_counts(self, db_file):
+        """Geçiş sayımlarını veritabanındaki tüm shoe'lardan hesaplar."""
+        try:
+            connection = connect_database(db_file)
+            try:
+                last_winners = []
+                for shoe_id, winners in iter_shoe_results(connection):
+                    self.add_sequence(winners)
+                    if self.shoe_id is None or shoe_id >= self.shoe_id:
+                        self.shoe_id, last_winners = shoe_id, winners
+                # Son shoe mevcut shoe sayılır; farklıysa set_shoe_id bu sayımları bırakır
+                self._add_transitions(self.shoe_counts, last_winners)
+            finally:
+                connection.close()
+            print(f"Markov modeli (k={self.order}) için {int(self.counts.sum())} geçiş yüklendi.")
+        except sqlite3.Error as e:
+            print(f"Markov sayımları yükleme hatası: {e}")
+
+    def add_sequence(self, winners):
+        """Bir shoe'nun tüm geçişlerini sayımlara vektörel olarak ekler.
+
+        Args:
+            winners (list): 'P'/'B' sonuçları (en eski başta).
+        """
+        self._add_transitions(self.counts, winners)
+
+    def _add_transitions(self, counts, winners):
+        """Sonuç dizisinin geçişlerini verilen sayım dizisine ekler."""
+        bits = np.fromiter((OUTCOME_BITS[w] for w in winners if w in OUTCOME_BITS), dtype=np.int64)
+        if len(bits) <= self.order:
+            return
+        # Her pencerenin durumu: en yeni sonuç en düşük bitte
+        weights = 1 << np.arange(self.order - 1, -1, -1, dtype=np.int64)
+        states = np.lib.stride_tricks.sliding_window_view(bits, self.order) @ weights
+        np.add.at(counts, (states[:-1], bits[self.order:]), 1)
+
+    def predict(self, state):
+        """Durumun geçiş sayımlarına göre tahmin yapar.
+
+        Args:
+            state (int): Son k sonucun kodu (HandFeatureStore.code(k)); k el yoksa None.
+
+        Returns:
+            str: 'P', 'B' veya yeterli veri yoksa '?'.
+        """
+        if state is None:
+            return '?'
+        p_count, b_count = self.counts[state]
+        if p_count + b_count < self.min_count or p_count == b_count:
+            return '?'
+        return 'P' if p_count > b_count else 'B'
+
+    def observe(self, state, winner):
+        """Durumdan sonra gelen sonucu sayımlara ekler.
+
+        Args:
+            state (int): Sonuçtan önceki son k sonucun kodu; k el yoksa None.
+            winner (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        if state is not None and winner in OUTCOME_BITS:
+            self.counts[state, OUTCOME_BITS[winner]] += 1
+            self.shoe_counts[state, OUTCOME_BITS[winner]] += 1
+
+    def set_shoe_id(self, shoe_id):
+        """Mevcut shoe'yu ayarlar; yeni shoe'nun geçişleri sıfırdan sayılır.
+
+        Args:
+            shoe_id (int): Mevcut shoe ID'si.
+        """
+        if shoe_id != self.shoe_id:
+            self.shoe_id = shoe_id
+            self.shoe_counts.fill(0)
+
+    def clear_current_shoe(self):
+        """Mevcut shoe'nun geçişlerini sayımlardan çıkarır."""
+        self.counts -= self.shoe_counts
+        self.shoe_counts.fill(0)
+
+    def clear_all(self):
+        """Tüm geçiş sayımlarını siler (veritabanındaki sonuçlar silindiğinde)."""
+        self.counts.fill(0)
+        self.shoe_counts.fill(0)
\ No newline at end of file
@@ -0,0 +1,379 @@
+"""
+Veritabanı şema göçlerini (migration) yöneten modül.
+Her göç adımı bir sürüm numarasına sahiptir, sırayla ve yalnızca bir kez uygulanır.
+Uygulanan sürümler schema_version tablosunda tutulur; böylece mevcut
+veritabanı dosyaları açılışta yerinde güncellenir.
+"""
+import sqlite3
+
+from models.pattern_keys import encode_sequence, flip_key, canonical_key, FLIPPED_CELLS
+from models.shoe_summary import backfill_summaries
+
+def _register_pattern_encoder(cursor):
+    """Metin desen anahtarlarını tamsayıya çeviren SQL fonksiyonunu kaydeder."""
+    cursor.connection.create_function('encode_pattern', 1, encode_sequence, deterministic=True)
+
+def _register_symmetry_functions(connection):
+    """Renk simetrisi birleştirmesi için SQL fonksiyonlarını kaydeder."""
+    def canonical_prediction(key, prediction):
+        return FLIPPED_CELLS.get(prediction, prediction) if canonical_key(key)[1] else prediction
+
+    def flip_prediction(prediction):
+        return FLIPPED_CELLS.get(prediction, prediction)
+
+    connection.create_function('canonical_pattern', 1, lambda key: canonical_key(key)[0], deterministic=True)
+    connection.create_function('canonical_prediction', 2, canonical_prediction, deterministic=True)
+    connection.create_function('flip_pattern', 1, flip_key, deterministic=True)
+    connection.create_function('flip_prediction', 1, flip_prediction, deterministic=True)
+
+# (sürüm, açıklama, adımlar) - adımlar SQL cümleleri ya da cursor alan fonksiyonlardır
+MIGRATIONS = [
+    (1, "Temel tablolar", [
+        '''
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shoe_id INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            winner TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS shoe_tracker (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            start_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            shoe_id INTEGER NOT NULL UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS adaptive_learning (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shoe_id INTEGER NOT NULL,
+            pattern TEXT NOT NULL,
+            wrong_prediction TEXT NOT NULL,
+            frequency INTEGER DEFAULT 1,
+            UNIQUE(shoe_id, pattern, wrong_prediction)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS grid_mistake_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shoe_id INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            grid_pattern TEXT NOT NULL,
+            grid_size INTEGER NOT NULL,
+            wrong_prediction TEXT NOT NULL,
+            frequency INTEGER DEFAULT 1,
+            UNIQUE(shoe_id, grid_pattern, grid_size, wrong_prediction)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_pattern ON adaptive_learning(shoe_id, pattern)',
+        'CREATE INDEX IF NOT EXISTS idx_grid_pattern ON grid_mistake_patterns(shoe_id, grid_pattern, grid_size)',
+    ]),
+    (2, "Sık kullanılan sorgular için kapsayan indeksler", [
+        # predict_from_history ve clear_current_shoe_data shoe_id ile filtreler,
+        # id ile sıralar ve sadece winner okur: indeks sorguyu tek başına karşılar
+        'CREATE INDEX IF NOT EXISTS idx_results_shoe ON results(shoe_id, id, winner)',
+        # Eski indeksler UNIQUE kısıtlarının oluşturduğu indekslerin önekidir, gereksizdir
+        'DROP INDEX IF EXISTS idx_pattern',
+        'DROP INDEX IF EXISTS idx_grid_pattern',
+    ]),
+    (3, "Bit paketli shoe sonuç tablosu ve uyumluluk görünümü", [
+        # Her el tek bit: n. el, (n / 8). baytın (n % 8). biti (P=0, B=1)
+        '''
+        CREATE TABLE IF NOT EXISTS shoe_results (
+            shoe_id INTEGER PRIMARY KEY,
+            hand_count INTEGER NOT NULL DEFAULT 0,
+            outcomes BLOB NOT NULL DEFAULT x''
+        )
+        ''',
+        # Paketlenmiş veriyi el başına satır olarak sunar; bayt değeri hex() ile okunur
+        '''
+        CREATE VIEW IF NOT EXISTS shoe_results_hands AS
+        WITH RECURSIVE hand_index(n) AS (
+            SELECT 0
+            UNION ALL
+            SELECT n + 1 FROM hand_index
+            WHERE n + 1 < (SELECT COALESCE(MAX(hand_count), 0) FROM shoe_results)
+        )
+        SELECT s.shoe_id AS shoe_id,
+               h.n AS hand_index,
+               CASE ((instr('0123456789ABCDEF',
+                            substr(hex(substr(s.outcomes, h.n / 8 + 1, 1)), 2 - (h.n % 8) / 4, 1)) - 1)
+                     >> (h.n % 4)) & 1
+                   WHEN 1 THEN 'B' ELSE 'P'
+               END AS winner
+        FROM shoe_results s
+        JOIN hand_index h ON h.n < s.hand_count
+        ''',
+    ]),
+    (4, "Shoe'lar arası desen sayımları ve ağırlıklı özetler", [
+        '''
+        CREATE TABLE IF NOT EXISTS shoe_pattern_counts (
+            shoe_id INTEGER NOT NULL,
+            pattern TEXT NOT NULL,
+            next_winner TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (shoe_id, pattern, next_winner)
+        ) WITHOUT ROWID
+        ''',
+        # Tüm shoe'ların reference_shoe_id'ye göre üstel ağırlıklı toplamı
+        '''
+        CREATE TABLE IF NOT EXISTS pattern_aggregates (
+            pattern TEXT NOT NULL,
+            next_winner TEXT NOT NULL,
+            weighted_count REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (pattern, next_winner)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS pattern_aggregate_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            reference_shoe_id INTEGER NOT NULL,
+            lookback INTEGER NOT NULL,
+            decay REAL NOT NULL
+        )
+        ''',
+    ]),
+    (5, "Arşivlenen shoe'lar için özet tablosu", [
+        '''
+        CREATE TABLE IF NOT EXISTS shoe_archive_summary (
+            shoe_id INTEGER PRIMARY KEY,
+            start_timestamp DATETIME,
+            hands INTEGER NOT NULL,
+            player_count INTEGER NOT NULL,
+            banker_count INTEGER NOT NULL,
+            longest_p_run INTEGER NOT NULL,
+            longest_b_run INTEGER NOT NULL,
+            pattern_counts TEXT NOT NULL,
+            mistake_count INTEGER NOT NULL DEFAULT 0,
+            grid_mistake_count INTEGER NOT NULL DEFAULT 0,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    (6, "Sürekli güncellenen shoe özet tablosu", [
+        '''
+        CREATE TABLE IF NOT EXISTS shoe_summary (
+            shoe_id INTEGER PRIMARY KEY,
+            hands INTEGER NOT NULL DEFAULT 0,
+            player_count INTEGER NOT NULL DEFAULT 0,
+            banker_count INTEGER NOT NULL DEFAULT 0,
+            longest_p_run INTEGER NOT NULL DEFAULT 0,
+            longest_b_run INTEGER NOT NULL DEFAULT 0,
+            run_winner TEXT,
+            run_length INTEGER NOT NULL DEFAULT 0,
+            win_count INTEGER NOT NULL DEFAULT 0,
+            loss_count INTEGER NOT NULL DEFAULT 0,
+            final_kasa REAL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Mevcut sonuçlardan özetler bir kez oluşturulur
+        backfill_summaries,
+    ]),
+    (7, "Hata tablolarında tamsayı desen anahtarları", [
+        # Hücre başına 2 bit (boş/X=0, P=1, B=2); bkz. models/pattern_keys.py
+        _register_pattern_encoder,
+        '''
+        CREATE TABLE adaptive_learning_v7 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shoe_id INTEGER NOT NULL,
+            pattern_key INTEGER NOT NULL,
+            wrong_prediction TEXT NOT NULL,
+            frequency INTEGER DEFAULT 1,
+            UNIQUE(shoe_id, pattern_key, wrong_prediction)
+        )
+        ''',
+        '''
+        INSERT INTO adaptive_learning_v7 (shoe_id, pattern_key, wrong_prediction, frequency)
+        SELECT shoe_id, encode_pattern(pattern), wrong_prediction, SUM(frequency)
+        FROM adaptive_learning
+        GROUP BY shoe_id, encode_pattern(pattern), wrong_prediction
+        ORDER BY MIN(id)
+        ''',
+        'DROP TABLE adaptive_learning',
+        'ALTER TABLE adaptive_learning_v7 RENAME TO adaptive_learning',
+        '''
+        CREATE TABLE grid_mistake_patterns_v7 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shoe_id INTEGER NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            grid_key INTEGER NOT NULL,
+            grid_size INTEGER NOT NULL,
+            wrong_prediction TEXT NOT NULL,
+            frequency INTEGER DEFAULT 1,
+            UNIQUE(shoe_id, grid_key, grid_size, wrong_prediction)
+        )
+        ''',
+        '''
+        INSERT INTO grid_mistake_patterns_v7 (shoe_id, timestamp, grid_key, grid_size, wrong_prediction, frequency)
+        SELECT shoe_id, MIN(timestamp), encode_pattern(grid_pattern), grid_size, wrong_prediction, SUM(frequency)
+        FROM grid_mistake_patterns
+        GROUP BY shoe_id, encode_pattern(grid_pattern), grid_size, wrong_prediction
+        ORDER BY MIN(id)
+        ''',
+        'DROP TABLE grid_mistake_patterns',
+        'ALTER TABLE grid_mistake_patterns_v7 RENAME TO grid_mistake_patterns',
+    ]),
+    (8, "Hata tablolarının desen kodlama kipi", [
+        # Kayıtların renk simetrisiyle birleştirilip birleştirilmediği; bkz. set_color_symmetry
+        '''
+        CREATE TABLE IF NOT EXISTS pattern_key_mode (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            color_symmetric INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        'INSERT OR IGNORE INTO pattern_key_mode (id, color_symmetric) VALUES (1, 0)',
+    ]),
+    (9, "Model seçici kol durumları", [
+        # Model başına Beta sonsalı sayımları; bkz. models/model_selection.py
+        '''
+        CREATE TABLE IF NOT EXISTS model_selector_arms (
+            model_name TEXT PRIMARY KEY,
+            successes REAL NOT NULL DEFAULT 0,
+            failures REAL NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+    ]),
+]
+
+# (tablo, desen kolonu, diğer gruplama kolonları)
+SYMMETRIC_TABLES = [
+    ('adaptive_learning', 'pattern_key', ['shoe_id']),
+    ('grid_mistake_patterns', 'grid_key', ['shoe_id', 'grid_size']),
+]
+
+def get_schema_version(connection):
+    """Veritabanının mevcut şema sürümünü döndürür.
+
+    Args:
+        connection (sqlite3.Connection): Veritabanı bağlantısı.
+
+    Returns:
+        int: Uygulanmış en yüksek sürüm (hiç yoksa 0).
+    """
+    cursor = connection.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    result = cursor.fetchone()
+    return result[0] if result and result[0] is not None else 0
+
+def apply_migrations(connection, migrations=None):
+    """Bekleyen göç adımlarını sırayla uygular.
+
+    Her sürüm kendi işlemi (transaction) içinde uygulanır; bir adım hata
+    verirse o sürüm geri alınır ve hata çağırana iletilir. En az bir sürüm
+    uygulandıysa sorgu planlayıcısı için ANALYZE çalıştırılır.
+
+    Args:
+        connection (sqlite3.Connection): Veritabanı bağlantısı.
+        migrations (list, optional): Uygulanacak göç listesi (varsayılan MIGRATIONS).
+
+    Returns:
+        int: Uygulanan sürüm sayısı.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    current_version = get_schema_version(connection)
+    connection.commit()
+
+    applied = 0
+    for version, description, steps in sorted(migrations, key=lambda m: m[0]):
+        if version <= current_version:
+            continue
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                           (version, description))
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+
+        applied += 1
+        print(f"Şema göçü uygulandı: v{version} - {description}")
+
+    if applied:
+        connection.execute("ANALYZE")
+        connection.commit()
+
+    return applied
+
+def set_color_symmetry(connection, enabled):
+    """Hata tablolarını istenen renk simetrisi kipine tek seferlik dönüştürür.
+
+    Açılırken her desen ve P/B ayna görüntüsünün satırları kanonik anahtarda
+    birleştirilir (yanlış tahminler gerekirse çevrilir). Kapatılırken her
+    kanonik satır iki renklendirmeye bölünür: birleşmiş sayımlar ayrıştırılamadığından
+    her renklendirme sıklığın yarısını (yukarı yuvarlanarak) alır, böylece toplam
+    sayım iki katına çıkmaz. Ayna görüntüsü kendisiyle aynı olan desenler tek
+    satırda tam sıklıkla kalır.
+    Kip zaten istenen durumdaysa hiçbir şey yapılmaz.
+
+    Args:
+        connection (sqlite3.Connection): Göçleri uygulanmış veritabanı bağlantısı.
+        enabled (bool): Renk simetrisi açık mı.
+
+    Returns:
+        bool: Dönüşüm yapıldıysa True.
+    """
+    cursor = connection.cursor()
+    cursor.execute("SELECT color_symmetric FROM pattern_key_mode WHERE id = 1")
+    row = cursor.fetchone()
+    if row is not None and bool(row[0]) == bool(enabled):
+        return False
+
+    _register_symmetry_functions(connection)
+    connection.commit()
+    try:
+        cursor.execute("BEGIN")
+        for table, key_column, group_columns in SYMMETRIC_TABLES:
+            groups = ', '.join(group_columns)
+            if enabled:
+                select_sql = f"""
+                    SELECT {groups}, canonical_pattern({key_column}) AS {key_column},
+                           canonical_prediction({key_column}, wrong_prediction) AS wrong_prediction, frequency
+                    FROM {table}
+                """
+            else:
+                # Tamsayı bölme: (f + 1) / 2 yarıyı yukarı yuvarlar
+                half = f"CASE WHEN flip_pattern({key_column}) != {key_column} THEN (frequency + 1) / 2 ELSE frequency END"
+                select_sql = f"""
+                    SELECT {groups}, {key_column}, wrong_prediction, {half} AS frequency FROM {table}
+                    UNION ALL
+                    SELECT {groups}, flip_pattern({key_column}), flip_prediction(wrong_prediction), {half}
+                    FROM {table} WHERE flip_pattern({key_column}) != {key_column}
+                """
+            cursor.execute(f"""
+                CREATE TEMP TABLE symmetry_rows AS
+                SELECT {groups}, {key_column}, wrong_prediction, SUM(frequency) AS frequency
+                FROM ({select_sql})
+                GROUP BY {groups}, {key_column}, wrong_prediction
+            """)
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"""
+                INSERT INTO {table} ({groups}, {key_column}, wrong_prediction, frequency)
+                SELECT {groups}, {key_column}, wrong_prediction, frequency FROM symmetry_rows
+            """)
+            cursor.execute("DROP TABLE symmetry_rows")
+        cursor.execute("INSERT OR REPLACE INTO pattern_key_mode (id, color_symmetric) VALUES (1, ?)",
+                       (1 if enabled else 0,))
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+    print(f"Hata tabloları renk simetrisi kipine dönüştürüldü: {'açık' if enabled else 'kapalı'}")
+    return True
\ No newline at end of file
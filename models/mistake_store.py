@@ -0,0 +1,164 @@
+"""
+Shoe'lar arası, zamanla sönümlenen ve boyutu sınırlı hata hafızası.
+Her desenin yanlış tahmin ağırlıkları shoe başına yarılanma süresine göre
+üstel olarak azalır. Sönüm tembel uygulanır: ağırlık yalnızca desene
+erişildiğinde güncellenir. Kapasite aşıldığında soğuk desenler toplu halde
+(LRU ya da LFU) atılır; isabet oranı ve boyut metrik olarak okunabilir.
+"""
+import heapq
+from config import (MISTAKE_STORE_CAPACITY, MISTAKE_STORE_HALF_LIFE, MISTAKE_STORE_MIN_WEIGHT,
+                    MISTAKE_STORE_EVICT_FRACTION, MISTAKE_STORE_POLICY)
+
+EVICTION_POLICIES = ['lru', 'lfu']
+
+# Kayıt: [P ağırlığı, B ağırlığı, ağırlıkların ait olduğu zaman, son erişim sırası]
+_P, _B, _STAMP, _ACCESS = 0, 1, 2, 3
+_WEIGHT_INDEX = {'P': _P, 'B': _B}
+
+class DecayingMistakeStore:
+    """Desen anahtarı -> sönümlenen yanlış tahmin ağırlıkları."""
+
+    def __init__(self, capacity=MISTAKE_STORE_CAPACITY, half_life=MISTAKE_STORE_HALF_LIFE,
+                 min_weight=MISTAKE_STORE_MIN_WEIGHT, evict_fraction=MISTAKE_STORE_EVICT_FRACTION,
+                 policy=MISTAKE_STORE_POLICY):
+        """
+        Args:
+            capacity (int, optional): Tutulacak en fazla desen sayısı.
+            half_life (float, optional): Ağırlıkların yarıya indiği süre (shoe).
+            min_weight (float, optional): Bu ağırlığın altına düşen desenler tahminde kullanılmaz ve ilk atılır.
+            evict_fraction (float, optional): Kapasite aşıldığında bir seferde atılacak oran.
+            policy (str, optional): 'lru' (en uzun süre erişilmeyen) ya da 'lfu' (en düşük ağırlıklı).
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Bilinmeyen atma politikası: {policy}")
+        self.capacity = capacity
+        self.half_life = half_life
+        self.min_weight = min_weight
+        self.evict_batch = max(1, int(capacity * evict_fraction))
+        self.policy = policy
+        self.now = 0
+        self.entries = {}
+        self._access_counter = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _decay(self, entry):
+        """Kaydın ağırlıklarını güncel zamana getirir."""
+        elapsed = self.now - entry[_STAMP]
+        if elapsed:
+            factor = 0.5 ** (elapsed / self.half_life)
+            entry[_P] *= factor
+            entry[_B] *= factor
+            entry[_STAMP] = self.now
+
+    def _touch(self, entry):
+        self._access_counter += 1
+        entry[_ACCESS] = self._access_counter
+
+    def advance(self, now):
+        """Zamanı ilerletir (yeni shoe başladığında çağrılır).
+
+        Args:
+            now (int): Güncel zaman (shoe ID'si). Geriye giden zaman hafızayı sıfırlar.
+        """
+        if now < self.now:
+            self.clear()
+        self.now = now
+
+    def add(self, key, wrong_prediction, weight=1.0, stamp=None):
+        """Desen için yanlış tahmin ağırlığı ekler.
+
+        Args:
+            key (int): Desen anahtarı.
+            wrong_prediction (str): Yanlış tahmin ('P' veya 'B').
+            weight (float, optional): Eklenecek ağırlık.
+            stamp (int, optional): Ağırlığın ait olduğu zaman (varsayılan güncel zaman).
+        """
+        if stamp is not None and stamp != self.now:
+            weight *= 0.5 ** ((self.now - stamp) / self.half_life)
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0.0, 0.0, self.now, 0]
+        else:
+            self._decay(entry)
+        entry[_WEIGHT_INDEX[wrong_prediction]] += weight
+        self._touch(entry)
+
+        if len(self.entries) > self.capacity:
+            self._evict()
+
+    def lookup(self, key):
+        """Desenin güncel ağırlıklarını döndürür.
+
+        Args:
+            key (int): Desen anahtarı.
+
+        Returns:
+            dict: {'P': ağırlık, 'B': ağırlık}; desen yoksa ya da ağırlığı min_weight altındaysa None.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self._decay(entry)
+            if entry[_P] + entry[_B] >= self.min_weight:
+                self._touch(entry)
+                self.hits += 1
+                return {'P': entry[_P], 'B': entry[_B]}
+        self.misses += 1
+        return None
+
+    def _current_weight(self, entry):
+        return (entry[_P] + entry[_B]) * 0.5 ** ((self.now - entry[_STAMP]) / self.half_life)
+
+    def _evict(self):
+        """Soğuk desenleri toplu olarak atar."""
+        if self.policy == 'lru':
+            rank = lambda item: item[1][_ACCESS]
+        else:
+            rank = lambda item: self._current_weight(item[1])
+        # Tek seferde bir grup atılır; sıralama maliyeti her eklemeye yayılmaz
+        coldest = heapq.nsmallest(self.evict_batch, self.entries.items(), key=rank)
+        for key, _ in coldest:
+            del self.entries[key]
+        self.evictions += len(coldest)
+
+    def prune(self):
+        """Ağırlığı min_weight altına düşmüş desenleri siler.
+
+        Returns:
+            int: Silinen desen sayısı.
+        """
+        cold_keys = [key for key, entry in self.entries.items() if self._current_weight(entry) < self.min_weight]
+        for key in cold_keys:
+            del self.entries[key]
+        self.evictions += len(cold_keys)
+        return len(cold_keys)
+
+    def clear(self):
+        """Tüm desenleri ve metrikleri sıfırlar."""
+        self.entries.clear()
+        self.now = 0
+        self._access_counter = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def metrics(self):
+        """Hafıza metriklerini döndürür.
+
+        Returns:
+            dict: size, capacity, hits, misses, hit_rate ve evictions değerleri.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self):
+        return len(self.entries)
\ No newline at end of file
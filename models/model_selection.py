@@ -0,0 +1,264 @@
+"""
+Tahmin modelleri arasından oynanacak modeli seçen çok kollu haydut (bandit) seçicileri.
+Her model bir koldur; modelin isabetleri ve kaçırmaları Beta(alfa, beta) sonsal
+dağılımını oluşturur. Tüm modellerin tahmini her elde gözlendiği için her elden
+sonra tahmin yapan tüm kollar güncellenir. Seçiciler:
+    argmax   - en yüksek doğruluk (en az min_predictions tahmin), keşif yok
+    thompson - her kolun sonsalından örnek çekilir, en büyük örnek seçilir
+    ucb      - ortalama + güven aralığı (UCB1) en büyük olan kol seçilir
+Kol durumları model_selector_arms tablosunda saklanır ve shoe'lar arasında korunur.
+"""
+import math
+import random
+import sqlite3
+from abc import ABC, abstractmethod
+
+from config import MODEL_SELECTOR_PRIOR, MODEL_SELECTOR_DISCOUNT, MODEL_SELECTOR_UCB_EXPLORATION
+from models.database import get_db_file, connect_database
+from models.migrations import apply_migrations
+
+class ModelSelector(ABC):
+    """Model başına Beta sonsalını tutan seçici tabanı."""
+
+    name = None
+
+    def __init__(self, prior=MODEL_SELECTOR_PRIOR, discount=MODEL_SELECTOR_DISCOUNT):
+        """
+        Args:
+            prior (tuple, optional): Beta ön dağılımının (alfa, beta) değerleri.
+            discount (float, optional): Her yeni gözlemde kolun eski sayımlarının çarpanı
+                (1.0 ise hiçbir gözlem unutulmaz).
+        """
+        self.prior_alpha, self.prior_beta = prior
+        self.discount = discount
+        self.arms = {}  # Model adı -> [isabet, kaçırma] (ağırlıklı sayımlar)
+
+    def _counts(self, name):
+        return self.arms.get(name) or (0.0, 0.0)
+
+    def trials(self, name):
+        """Kolun (ağırlıklı) gözlem sayısını döndürür."""
+        successes, failures = self._counts(name)
+        return successes + failures
+
+    def posterior(self, name):
+        """Kolun Beta sonsalının (alfa, beta) değerlerini döndürür."""
+        successes, failures = self._counts(name)
+        return self.prior_alpha + successes, self.prior_beta + failures
+
+    def mean(self, name):
+        """Kolun sonsal ortalamasını (beklenen isabet oranı) döndürür."""
+        alpha, beta = self.posterior(name)
+        return alpha / (alpha + beta)
+
+    def update(self, name, is_correct):
+        """Bir modelin tahmin sonucunu koluna ekler.
+
+        Args:
+            name (str): Model adı.
+            is_correct (bool): Tahmin doğru muydu?
+        """
+        counts = self.arms.setdefault(name, [0.0, 0.0])
+        if self.discount != 1.0:
+            counts[0] *= self.discount
+            counts[1] *= self.discount
+        counts[0 if is_correct else 1] += 1.0
+
+    def observe(self, predictions, winner):
+        """Eldeki tüm model tahminlerini gerçekleşen sonuçla günceller.
+
+        Args:
+            predictions (dict): Model adı -> tahmin ('P', 'B' veya '?').
+            winner (str): Gerçekleşen sonuç.
+        """
+        for name, prediction in predictions.items():
+            if prediction in ('P', 'B'):
+                self.update(name, prediction == winner)
+
+    @abstractmethod
+    def select(self, predictions):
+        """Oynanacak modeli seçer.
+
+        Args:
+            predictions (dict): Model adı -> bu eldeki tahmin (kayıt sırasıyla).
+
+        Returns:
+            str: Seçilen model adı; seçilebilecek model yoksa None.
+        """
+
+    def reset(self):
+        """Tüm kol durumlarını siler."""
+        self.arms.clear()
+
+class ArgmaxSelector(ModelSelector):
+    """En yüksek doğruluklu modeli seçer (önceki sıralama davranışı).
+
+    Tahmini '?' olsa da en iyi model seçilir; eşitlikte kayıt sırası belirleyicidir.
+    """
+
+    name = 'argmax'
+
+    def __init__(self, min_predictions=5, prior=MODEL_SELECTOR_PRIOR, discount=1.0):
+        """
+        Args:
+            min_predictions (int, optional): Seçilebilmek için gereken en az tahmin sayısı.
+            prior (tuple, optional): Beta ön dağılımı.
+            discount (float, optional): Sayım unutma çarpanı.
+        """
+        super().__init__(prior, discount)
+        self.min_predictions = min_predictions
+
+    def select(self, predictions):
+        best_name, best_accuracy = None, -1.0
+        for name in predictions:
+            successes, failures = self._counts(name)
+            total = successes + failures
+            if total > 0 and total >= self.min_predictions and successes / total > best_accuracy:
+                best_name, best_accuracy = name, successes / total
+        return best_name
+
+class ThompsonSelector(ModelSelector):
+    """Thompson örneklemesi: her kolun Beta sonsalından örnek çekip en büyüğünü seçer."""
+
+    name = 'thompson'
+
+    def __init__(self, prior=MODEL_SELECTOR_PRIOR, discount=MODEL_SELECTOR_DISCOUNT, seed=None):
+        """
+        Args:
+            prior (tuple, optional): Beta ön dağılımı.
+            discount (float, optional): Sayım unutma çarpanı.
+            seed (int, optional): Rastgele sayı üreteci tohumu (geriye dönük testte tekrar üretilebilirlik için).
+        """
+        super().__init__(prior, discount)
+        self.random = random.Random(seed)
+
+    def select(self, predictions):
+        best_name, best_sample = None, -1.0
+        for name, prediction in predictions.items():
+            if prediction not in ('P', 'B'):
+                continue
+            sample = self.random.betavariate(*self.posterior(name))
+            if sample > best_sample:
+                best_name, best_sample = name, sample
+        return best_name
+
+class UCBSelector(ModelSelector):
+    """UCB1: sonsal ortalamaya az denenmiş kollar için güven payı ekleyerek seçer."""
+
+    name = 'ucb'
+
+    def __init__(self, prior=MODEL_SELECTOR_PRIOR, discount=MODEL_SELECTOR_DISCOUNT,
+                 exploration=MODEL_SELECTOR_UCB_EXPLORATION):
+        """
+        Args:
+            prior (tuple, optional): Beta ön dağılımı.
+            discount (float, optional): Sayım unutma çarpanı.
+            exploration (float, optional): Güven payı katsayısı (UCB1 için 2.0).
+        """
+        super().__init__(prior, discount)
+        self.exploration = exploration
+
+    def select(self, predictions):
+        candidates = [name for name, prediction in predictions.items() if prediction in ('P', 'B')]
+        total = sum(self.trials(name) for name in candidates)
+        best_name, best_score = None, -1.0
+        for name in candidates:
+            trials = self.trials(name)
+            if trials == 0:
+                # Hiç denenmemiş kol önce denenir
+                return name
+            score = self.mean(name) + math.sqrt(self.exploration * math.log(max(total, 1.0)) / trials)
+            if score > best_score:
+                best_name, best_score = name, score
+        return best_name
+
+SELECTORS = {
+    'argmax': ArgmaxSelector,
+    'thompson': ThompsonSelector,
+    'ucb': UCBSelector,
+}
+
+def create_selector(name, **kwargs):
+    """Adı verilen seçiciyi oluşturur.
+
+    Args:
+        name (str): SELECTORS içinden seçici adı.
+        **kwargs: Seçici sınıfına iletilecek parametreler.
+
+    Returns:
+        ModelSelector: Seçici nesnesi.
+    """
+    if name not in SELECTORS:
+        raise ValueError(f"Bilinmeyen model seçici: {name}")
+    return SELECTORS[name](**kwargs)
+
+class SelectorStateStore:
+    """Seçici kol durumlarını masanın veritabanında saklayan sınıf."""
+
+    def __init__(self, table_id=None, in_memory=False):
+        """
+        Args:
+            table_id (int, optional): Masa ID'si; masanın veritabanı dosyası kullanılır.
+            in_memory (bool, optional): True ise masanın bellek içi simülasyon veritabanı kullanılır.
+        """
+        self.connection = None
+        try:
+            self.connection = connect_database(get_db_file(table_id, in_memory))
+            apply_migrations(self.connection)
+        except sqlite3.Error as e:
+            print(f"Veritabanı hatası: {e}")
+            self.connection = None
+
+    def load(self, selector):
+        """Kayıtlı kol durumlarını seçiciye yükler.
+
+        Args:
+            selector (ModelSelector): Durumu yüklenecek seçici.
+        """
+        if not self.connection:
+            return
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT model_name, successes, failures FROM model_selector_arms")
+            selector.arms = {name: [successes, failures] for name, successes, failures in cursor.fetchall()}
+            if selector.arms:
+                print(f"Model seçici için {len(selector.arms)} kol durumu yüklendi.")
+        except sqlite3.Error as e:
+            print(f"Seçici durumu yükleme hatası: {e}")
+
+    def save(self, selector):
+        """Seçicinin kol durumlarını yazar.
+
+        Args:
+            selector (ModelSelector): Durumu yazılacak seçici.
+        """
+        if not self.connection:
+            return
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany("""
+                INSERT INTO model_selector_arms (model_name, successes, failures)
+                VALUES (?, ?, ?)
+                ON CONFLICT(model_name) DO UPDATE SET
+                    successes = excluded.successes,
+                    failures = excluded.failures
+            """, [(name, counts[0], counts[1]) for name, counts in selector.arms.items()])
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Seçici durumu yazma hatası: {e}")
+
+    def clear(self):
+        """Kayıtlı tüm kol durumlarını siler."""
+        if not self.connection:
+            return
+        try:
+            self.connection.execute("DELETE FROM model_selector_arms")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Seçici durumu silme hatası: {e}")
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
\ No newline at end of file
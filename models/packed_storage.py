@@ -0,0 +1,183 @@
+"""
+Shoe başına tek satırda, bit paketli sonuç saklama modülü.
+Her el tek bit ile tutulur (P=0, B=1); bir shoe'nun tüm sonuçları shoe_results
+tablosunda tek bir BLOB ve el sayısı olarak saklanır. shoe_results_hands görünümü
+bu veriyi eski results tablosu gibi el başına satır olarak sunar.
+"""
+from collections import defaultdict
+
+OUTCOME_BITS = {'P': 0, 'B': 1}
+BIT_OUTCOMES = ('P', 'B')
+
+def pack_outcomes(winners, packed=b'', hand_count=0):
+    """Sonuçları bit dizisine paketler, varsa mevcut paketin sonuna ekler.
+
+    Args:
+        winners (list): 'P' veya 'B' değerlerinden oluşan sonuçlar.
+        packed (bytes, optional): Mevcut paketlenmiş veri.
+        hand_count (int, optional): Mevcut paketteki el sayısı.
+
+    Returns:
+        tuple: (paketlenmiş veri, yeni el sayısı).
+    """
+    data = bytearray(packed)
+    for winner in winners:
+        bit = OUTCOME_BITS.get(winner)
+        if bit is None:
+            raise ValueError(f"Geçersiz sonuç değeri: {winner!r}")
+        byte_index, bit_index = divmod(hand_count, 8)
+        if byte_index >= len(data):
+            data.append(0)
+        if bit:
+            data[byte_index] |= 1 << bit_index
+        hand_count += 1
+    return bytes(data), hand_count
+
+def unpack_outcomes(packed, hand_count):
+    """Paketlenmiş veriyi sonuç listesine açar.
+
+    Args:
+        packed (bytes): Paketlenmiş veri.
+        hand_count (int): Paketteki el sayısı.
+
+    Returns:
+        list: 'P' veya 'B' değerlerinden oluşan sonuçlar.
+    """
+    return [BIT_OUTCOMES[(packed[i >> 3] >> (i & 7)) & 1] for i in range(hand_count)]
+
+class PackedShoeStore:
+    """shoe_results tablosu üzerinde ekleme ve okuma işlemlerini yöneten sınıf."""
+
+    def __init__(self, connection):
+        """
+        Args:
+            connection (sqlite3.Connection): Göçleri uygulanmış veritabanı bağlantısı.
+        """
+        self.connection = connection
+        self._tail_cache = {}  # shoe_id -> (paket, el sayısı)
+
+    def _load_row(self, shoe_id):
+        """Shoe satırını önbellekten ya da veritabanından okur."""
+        if shoe_id in self._tail_cache:
+            return self._tail_cache[shoe_id]
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT outcomes, hand_count FROM shoe_results WHERE shoe_id = ?", (shoe_id,))
+        row = cursor.fetchone()
+        state = (bytes(row[0]), row[1]) if row else (b'', 0)
+        self._tail_cache[shoe_id] = state
+        return state
+
+    def append(self, shoe_id, winners):
+        """Sonuçları shoe satırının sonuna ekler (commit çağırana aittir).
+
+        Args:
+            shoe_id (int): Shoe ID'si.
+            winners (list): Eklenecek 'P'/'B' sonuçları.
+        """
+        if not winners:
+            return
+        packed, hand_count = self._load_row(shoe_id)
+        packed, hand_count = pack_outcomes(winners, packed, hand_count)
+
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT INTO shoe_results (shoe_id, hand_count, outcomes)
+            VALUES (?, ?, ?)
+            ON CONFLICT(shoe_id)
+            DO UPDATE SET hand_count = excluded.hand_count, outcomes = excluded.outcomes
+        """, (shoe_id, hand_count, packed))
+        self._tail_cache[shoe_id] = (packed, hand_count)
+
+    def append_buffer(self, buffer):
+        """(shoe_id, winner) çiftlerinden oluşan tamponu shoe bazında ekler.
+
+        Args:
+            buffer (list): DatabaseManager yazma tamponu.
+        """
+        grouped = defaultdict(list)
+        for shoe_id, winner in buffer:
+            grouped[shoe_id].append(winner)
+        for shoe_id, winners in grouped.items():
+            self.append(shoe_id, winners)
+
+    def load_shoe(self, shoe_id):
+        """Bir shoe'nun tüm sonuçlarını tek satır okumasıyla döndürür.
+
+        Args:
+            shoe_id (int): Shoe ID'si.
+
+        Returns:
+            list: 'P' veya 'B' değerlerinden oluşan sonuçlar.
+        """
+        packed, hand_count = self._load_row(shoe_id)
+        return unpack_outcomes(packed, hand_count)
+
+    def delete_shoe(self, shoe_id):
+        """Bir shoe'nun paketlenmiş satırını siler (commit çağırana aittir)."""
+        self.connection.cursor().execute("DELETE FROM shoe_results WHERE shoe_id = ?", (shoe_id,))
+        self._tail_cache.pop(shoe_id, None)
+
+    def clear(self):
+        """Tüm paketlenmiş satırları siler (commit çağırana aittir)."""
+        self.connection.cursor().execute("DELETE FROM shoe_results")
+        self._tail_cache.clear()
+
+    def rebuild_from_results(self):
+        """Mevcut results tablosundan paketlenmiş satırları yeniden oluşturur.
+
+        Returns:
+            int: Paketlenen shoe sayısı.
+        """
+        self.clear()
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT shoe_id, winner FROM results WHERE winner IN ('P', 'B') ORDER BY shoe_id, id")
+
+        shoe_count = 0
+        current_shoe, winners = None, []
+        for shoe_id, winner in cursor:
+            if shoe_id != current_shoe:
+                if winners:
+                    self.append(current_shoe, winners)
+                    shoe_count += 1
+                current_shoe, winners = shoe_id, []
+            winners.append(winner)
+        if winners:
+            self.append(current_shoe, winners)
+            shoe_count += 1
+
+        self.connection.commit()
+        return shoe_count
+
+def iter_shoe_results(connection):
+    """Veritabanındaki tüm shoe'ları sırayla (shoe_id, sonuçlar) olarak döndürür.
+
+    Önce el başına satır düzenindeki results tablosu okunur, ardından yalnızca
+    paketlenmiş düzende bulunan shoe'lar eklenir.
+
+    Args:
+        connection (sqlite3.Connection): Veritabanı bağlantısı.
+
+    Yields:
+        tuple: (shoe_id, 'P'/'B' sonuç listesi).
+    """
+    seen_shoes = set()
+    cursor = connection.cursor()
+    cursor.execute("SELECT shoe_id, winner FROM results ORDER BY shoe_id, id")
+
+    current_shoe, winners = None, []
+    for shoe_id, winner in cursor:
+        if shoe_id != current_shoe:
+            if winners:
+                yield current_shoe, winners
+            seen_shoes.add(shoe_id)
+            current_shoe, winners = shoe_id, []
+        winners.append(winner)
+    if winners:
+        yield current_shoe, winners
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT shoe_id, outcomes, hand_count FROM shoe_results ORDER BY shoe_id")
+    for shoe_id, packed, hand_count in cursor:
+        if shoe_id not in seen_shoes and hand_count:
+            yield shoe_id, unpack_outcomes(bytes(packed), hand_count)
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Desen anahtarlarını tamsayı olarak kodlayan modül.
+Her hücre 2 bit ile tutulur (boş=0, P=1, B=2); n uzunluğundaki bir dizi ya da
+grid bölgesi tek bir tamsayıya paketlenir. Yalnızca P/B içeren dizilerde ilk
+hücre sıfır olmadığından farklı uzunluktaki diziler farklı anahtar üretir; boş
+hücreyle başlayan diziler ise başındaki boşlukları atılmış haliyle çakışır
+(ör. 'XP' ile 'P'), bu yüzden böyle anahtarlar uzunlukla birlikte saklanmalıdır.
+RollingPatternKey, her yeni elde anahtarı kaydırarak günceller; anahtar
+yeniden kurulmaz.
+Renk simetrisi için bir anahtarın P/B ayna görüntüsü (flip_key) ve ikisinden
+küçük olanı temsilci alan kanonik anahtar (canonical_key) hesaplanır.
+"""
+
+CELL_BITS = 2
+CELL_MASK = (1 << CELL_BITS) - 1
+CELL_CODES = {'P': 1, 'B': 2}
+CODE_CELLS = {0: 'X', 1: 'P', 2: 'B'}
+FLIPPED_CELLS = {'P': 'B', 'B': 'P'}
+
+def encode_sequence(sequence):
+    """Sonuç dizisini tamsayı anahtara kodlar (ilk eleman en yüksek bitlerde).
+
+    Args:
+        sequence (iterable): 'P'/'B' değerleri (liste ya da metin). Diğer değerler boş sayılır.
+
+    Returns:
+        int: Desen anahtarı.
+    """
+    key = 0
+    for cell in sequence:
+        key = (key << CELL_BITS) | CELL_CODES.get(cell, 0)
+    return key
+
+def decode_key(key, length):
+    """Anahtarı okunabilir metne çevirir (boş hücreler 'X').
+
+    Args:
+        key (int): Desen anahtarı.
+        length (int): Hücre sayısı.
+
+    Returns:
+        str: Desen metni.
+    """
+    cells = []
+    for _ in range(length):
+        cells.append(CODE_CELLS.get(key & CELL_MASK, 'X'))
+        key >>= CELL_BITS
+    return "".join(reversed(cells))
+
+def encode_grid(grid_data, size):
+    """Grid'in sağ alt size x size bölgesini satır satır tamsayı anahtara kodlar.
+
+    AdaptiveLearningModel'in eski metin anahtarıyla aynı hücre sırasını kullanır.
+
+    Args:
+        grid_data (list): 2D grid.
+        size (int): Bölge boyutu.
+
+    Returns:
+        int: Grid anahtarı.
+    """
+    rows = len(grid_data)
+    cols = len(grid_data[0]) if rows > 0 else 0
+    key = 0
+    for r in range(max(0, rows - size), rows):
+        row = grid_data[r]
+        for c in range(max(0, cols - size), cols):
+            key = (key << CELL_BITS) | CELL_CODES.get(row[c], 0)
+    return key
+
+def flip_key(key):
+    """Anahtardaki P ve B hücrelerini yer değiştirir (boş hücreler değişmez).
+
+    Args:
+        key (int): Desen anahtarı.
+
+    Returns:
+        int: Ayna desenin anahtarı.
+    """
+    cells = (key.bit_length() + 1) // CELL_BITS
+    low_bits = ((1 << (CELL_BITS * cells)) - 1) // 3  # Her hücrenin düşük biti: 0b0101...
+    occupied = (key | (key >> 1)) & low_bits
+    # Dolu hücrelerde 01 <-> 10
+    return key ^ (occupied | (occupied << 1))
+
+def canonical_key(key):
+    """Anahtarı ve ayna görüntüsünü tek bir temsilciye indirger.
+
+    Args:
+        key (int): Desen anahtarı.
+
+    Returns:
+        tuple: (kanonik anahtar, flipped). flipped True ise desen temsilcinin ayna görüntüsüdür
+            ve desene ait P/B değerleri de çevrilmelidir.
+    """
+    flipped_key = flip_key(key)
+    if flipped_key < key:
+        return flipped_key, True
+    return key, False
+
+class RollingPatternKey:
+    """Son n sonucun anahtarını her elde kaydırarak güncelleyen sınıf."""
+
+    def __init__(self, length):
+        """
+        Args:
+            length (int): Desen uzunluğu.
+        """
+        self.length = length
+        self.mask = (1 << (CELL_BITS * length)) - 1
+        self.key = 0
+        self.count = 0
+
+    def push(self, cell):
+        """Yeni sonucu ekler ve en eski sonucu anahtardan çıkarır.
+
+        Args:
+            cell (str): 'P' veya 'B'.
+
+        Returns:
+            int: Güncel anahtar.
+        """
+        self.key = ((self.key << CELL_BITS) | CELL_CODES.get(cell, 0)) & self.mask
+        self.count += 1
+        return self.key
+
+    def is_full(self):
+        """Anahtarın tam desen uzunluğunu kapsayıp kapsamadığını döndürür."""
+        return self.count >= self.length
+
+    def reset(self):
+        """Anahtarı sıfırlar."""
+        self.key = 0
+        self.count = 0
\ No newline at end of file
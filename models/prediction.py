@@ -1,34 +1,89 @@
 """
 Tahmin algoritmalarını ve model istatistiklerini içeren modül.
 """
-from config import GRID_SIZE
+import time
+
+from config import GRID_SIZE, MODEL_RANKING_METRIC, MODEL_SELECTOR
 from models.adaptive_learning import AdaptiveLearningModel
+from models.cross_shoe import CrossShoePatternModel
+from models.variable_order_adaptive import VariableOrderAdaptiveModel
 from models.enhanced_wl_prediction import EnhancedWLPredictionModel
+from models.leaderboard import ModelLeaderboard
+from models.accuracy_tracker import AccuracyTracker, RANKING_METRICS
+from models.latency_tracker import LatencyTracker
+from models.bitboard import BeadBitboard
+from models.hand_features import HandFeatureStore
+from models.roads import RED
+from models.model_selection import create_selector, SelectorStateStore
+
+try:
+    # Topluluk ve Markov modelleri isteğe bağlı numpy paketini gerektirir
+    from models.ensemble import EnsembleModel
+    from models.markov import MarkovChainModel
+except ImportError:
+    EnsembleModel = None
+    MarkovChainModel = None
 
 class PredictionModel:
     """Tahmin modellerini ve ilgili istatistikleri yöneten sınıf."""
     
-    def __init__(self, grid_data=None):
+    def __init__(self, grid_data=None, table_id=None, in_memory=False, ranking_metric=None, selector=None,
+                 cross_shoe_model=None, markov_model=None):
         """
         Args:
             grid_data (list, optional): Grid verileri için referans.
+            table_id (int, optional): Masa ID'si; veritabanı tabanlı modeller masanın dosyasını kullanır.
+            in_memory (bool, optional): True ise veritabanı tabanlı modeller bellek içi veritabanını kullanır.
+            ranking_metric (str, optional): En iyi modeli belirleyen ölçüt; belirtilmezse MODEL_RANKING_METRIC.
+            selector (str, optional): Oynanacak modeli seçen yöntem ('argmax', 'thompson', 'ucb');
+                belirtilmezse MODEL_SELECTOR. 'argmax' sıralama ölçütüne göre en iyi modeli kullanır.
+            cross_shoe_model (CrossShoePatternModel, optional): Masanın açık shoe'lar arası modeli
+                (ShardRouter parçası); verilmezse masanın veritabanından oluşturulur.
+            markov_model (MarkovChainModel, optional): Masanın açık Markov modeli; verilmezse oluşturulur.
         """
+        self.table_id = table_id
+        self.ranking_metric = ranking_metric or MODEL_RANKING_METRIC
+        if self.ranking_metric not in RANKING_METRICS:
+            raise ValueError(f"Bilinmeyen sıralama ölçütü: {self.ranking_metric}")
         self.grid_data = grid_data if grid_data else [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.adaptive_model = AdaptiveLearningModel()
+        self.bead_board = BeadBitboard.from_grid(self.grid_data)  # Grid desen kontrolleri bu maskeleri kullanır
+        self.roads = None  # GameHistory'nin RoadEngine'i; update_grid_data ile bağlanır
+        # Son sonuç, k'lık kodlar ve W/L desen türü tahmin edilen elin durumundan bir kez hesaplanır.
+        # GameHistory sonucu modeller güncellenmeden önce eklediği için depo burada ayrıca tutulur.
+        self.features = HandFeatureStore()
+        self.adaptive_model = AdaptiveLearningModel(table_id=table_id, in_memory=in_memory)
+        self.cross_shoe_model = cross_shoe_model or CrossShoePatternModel(table_id=table_id, in_memory=in_memory)
+        self.variable_adaptive_model = VariableOrderAdaptiveModel()
+        if markov_model is None and MarkovChainModel:
+            markov_model = MarkovChainModel(table_id=table_id, in_memory=in_memory)
+        self.markov_model = markov_model
         self.wl_model = EnhancedWLPredictionModel(lookback_pairs=5)  # Geliştirilmiş WL tahmin modeli
+        self.ensemble_model = None
         self.models = self._initialize_models()
+        # Seçici kol durumları masanın veritabanında saklanır ve shoe'lar arasında korunur
+        self.selector = create_selector(selector or MODEL_SELECTOR)
+        self.selector_store = SelectorStateStore(table_id=table_id, in_memory=in_memory)
+        self.selector_store.load(self.selector)
         self.current_wl_prediction = '?'
         self.current_horizontal_wl_pred = '?' 
         self.current_vertical_wl_pred = '?'
         self.should_reverse_bet = False
+        self.ensemble_probability = None
+        # Aynı durum için model tahminleri bir kez hesaplanır; durum değişince sürüm artar
+        self.state_version = 0
+        self._cache_token = None
+        self._prediction_cache = {}
+        self._wl_cache = {}
+        self._nested_latency = 0  # Hesaplanmakta olan tahmin içinde çağrılan modellerin süresi (ns)
+        self._selected_model = None
     
     def _initialize_models(self):
         """Tahmin modellerini başlatır.
         
         Returns:
-            list: Tahmin modellerinin listesi.
+            ModelLeaderboard: Doğruluk sırasını tutan model listesi.
         """
-        return [
+        models = [
             {'name': 'Sonu Takip', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_follow_last},
             {'name': 'Tersi Takip', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_follow_opposite},
             {'name': 'Hep Player', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_always_player},
@@ -40,7 +95,53 @@ class PredictionModel:
             {'name': 'Adaptif Öğr.', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_adaptive},
             {'name': 'Grid Adaptif', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_grid_adaptive},
             {'name': 'WL Tersine', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_wl_reverse},
+            {'name': 'Çapraz Shoe', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_cross_shoe},
+            {'name': 'Değişken Adaptif', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_variable_adaptive},
+            {'name': 'Türetilmiş Yol', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_derived_roads},
         ]
+        if self.markov_model is not None:
+            models.append({'name': 'Markov', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_markov})
+        # Topluluk modeli diğer tüm modellerin tahminlerini özellik olarak kullanır
+        # ('WL Tersine' en iyi modele bağlı olduğu için dışarıda bırakılır; WL tahminleri ayrıca eklenir)
+        if EnsembleModel is not None:
+            if self.ensemble_model is None:
+                self.ensemble_model = EnsembleModel([m['name'] for m in models if m['name'] != 'WL Tersine'])
+            models.append({'name': 'Topluluk', 'wins': 0, 'total': 0, 'accuracy': 0.0, 'predict_func': self.predict_ensemble})
+        
+        # Pencereli ve sönümlü doğruluklar ile tahmin süreleri model başına ayrı tutulur
+        for model in models:
+            model['tracker'] = AccuracyTracker()
+            model['latency'] = LatencyTracker()
+        return ModelLeaderboard(models, self._ranking_score)
+    
+    def _ranking_score(self, model):
+        """Modelin seçili ölçüte göre sıralama puanını döndürür."""
+        if self.ranking_metric == 'lifetime':
+            return model['accuracy']
+        return model['tracker'].accuracy(self.ranking_metric)
+    
+    def set_ranking_metric(self, metric):
+        """En iyi modeli belirleyen ölçütü değiştirir.
+        
+        Args:
+            metric (str): RANKING_METRICS içinden ölçüt adı.
+        """
+        if metric not in RANKING_METRICS:
+            raise ValueError(f"Bilinmeyen sıralama ölçütü: {metric}")
+        self.ranking_metric = metric
+        self.models.set_score(self._ranking_score)
+        self.invalidate_predictions()
+    
+    def set_selector(self, name):
+        """Oynanacak modeli seçen yöntemi değiştirir; kol durumları korunur.
+        
+        Args:
+            name (str): 'argmax', 'thompson' veya 'ucb'.
+        """
+        arms = self.selector.arms
+        self.selector = create_selector(name)
+        self.selector.arms = arms
+        self.invalidate_predictions()
     
     def set_db_prediction_function(self, db_predict_func):
         """Veritabanı tahmin fonksiyonunu ayarlar.
@@ -48,18 +149,108 @@ class PredictionModel:
         Args:
             db_predict_func (callable): Veritabanı tahmin fonksiyonu.
         """
-        for model in self.models:
-            if model['name'] == 'Veritabanı':
-                model['predict_func'] = db_predict_func
-                break
+        self.models.get('Veritabanı')['predict_func'] = db_predict_func
+        self.invalidate_predictions()
+    
+    def invalidate_predictions(self):
+        """Önbellekteki tahminleri geçersiz kılar (model durumu değiştiğinde çağrılır)."""
+        self.state_version += 1
     
-    def update_grid_data(self, grid_data):
+    def _check_cache(self, history):
+        """Geçmiş ya da sürüm değiştiyse tahmin önbelleğini boşaltır."""
+        token = (self.state_version, len(history), history[-1] if history else None)
+        if token != self._cache_token:
+            self._cache_token = token
+            self._prediction_cache.clear()
+            self._wl_cache.clear()
+            self._selected_model = None
+    
+    def _cached_prediction(self, model, history):
+        """Modelin bu durumdaki tahminini önbellekten döndürür, yoksa hesaplar.
+        
+        Args:
+            model (dict): Model kaydı.
+            history (list): Oyun geçmişi.
+            
+        Returns:
+            str: Tahmin ('P', 'B' veya '?').
+        """
+        self._check_cache(history)
+        name = model['name']
+        if name not in self._prediction_cache:
+            if model['predict_func']:
+                # Yalnızca modelin kendi süresi kaydedilir; içinde önbellekten hesaplanan
+                # diğer modellerin süresi ('WL Tersine', 'Topluluk') kendi kayıtlarına yazılır
+                outer_nested = self._nested_latency
+                self._nested_latency = 0
+                start_time = time.perf_counter_ns()
+                try:
+                    self._prediction_cache[name] = model['predict_func'](history)
+                finally:
+                    elapsed = time.perf_counter_ns() - start_time
+                    model['latency'].record(elapsed - self._nested_latency)
+                    self._nested_latency = outer_nested + elapsed
+            else:
+                self._prediction_cache[name] = '?'
+        return self._prediction_cache[name]
+    
+    def _cached_wl_decision(self, history, wl_history, main_prediction):
+        """WL modelinin ters bahis kararını önbellekten döndürür, yoksa hesaplar.
+        
+        Args:
+            history (list): Oyun geçmişi.
+            wl_history (list): Kazanç/kayıp geçmişi.
+            main_prediction (str): Ana tahmin.
+            
+        Returns:
+            tuple: (should_reverse, wl_pred, h_pred, v_pred).
+        """
+        self._check_cache(history)
+        # WL kararı yalnızca WL geçmişine bağlıdır; ana tahmin sonucu değiştirmez
+        key = (len(wl_history), wl_history[-1])
+        decision = self._wl_cache.get(key)
+        if decision is None:
+            decision = self._wl_cache[key] = self.wl_model.should_reverse_bet(
+                wl_history, main_prediction, self.features.wl_pattern_type)
+        else:
+            # Arayüz WL modelinin son yatay/dikey tahminlerini doğrudan okur
+            self.wl_model.last_horizontal_pred, self.wl_model.last_vertical_pred = decision[2], decision[3]
+        if decision[1] != self.current_wl_prediction:
+            # 'WL Tersine' mevcut WL tahminine bağlıdır; çağıran bu değeri güncelleyecek
+            self._prediction_cache.pop('WL Tersine', None)
+        return decision
+    
+    def set_current_shoe_id(self, shoe_id, reset=False):
+        """Shoe değişimini shoe'ya bağlı modellere iletir.
+        
+        Args:
+            shoe_id (int): Yeni shoe ID'si.
+            reset (bool, optional): True ise tüm veriler sıfırlanmıştır; shoe'lar arası sayımlar da silinir.
+        """
+        self.adaptive_model.set_shoe_id(shoe_id)
+        self.cross_shoe_model.set_shoe_id(shoe_id, reset=reset)
+        if self.markov_model is not None:
+            self.markov_model.set_shoe_id(shoe_id)
+        self.variable_adaptive_model.set_shoe_id(shoe_id)
+        self.selector_store.save(self.selector)
+        self.invalidate_predictions()
+    
+    def update_grid_data(self, grid_data, bead_board=None, roads=None):
         """Grid verilerini günceller.
         
         Args:
             grid_data (list): Yeni grid verileri.
+            bead_board (BeadBitboard, optional): Grid'in artımlı tutulan bitboard'u;
+                verilmezse grid listesinden oluşturulur.
+            roads (RoadEngine, optional): Geçmişin yolları; verilirse 'Türetilmiş Yol' modeli
+                bunları okur. Tahminler sonuç eklenmeden önce alındığı için kopyalanmaz.
         """
         self.grid_data = grid_data
+        self.bead_board = bead_board if bead_board is not None else BeadBitboard.from_grid(grid_data)
+        if roads is not None:
+            self.roads = roads
+        # Grid yerinde değiştirildiği için her güncelleme yeni durum sayılır
+        self.invalidate_predictions()
     
     def get_predictions(self, history, wl_history=None):
         """Tüm modeller için tahminleri döndürür.
@@ -73,22 +264,11 @@ class PredictionModel:
         """
         # Geçmiş kopyasını saklayalım (adaptif model için kullanacağız)
         self.history_snapshot = history.copy()
+        self.features.follow(history, wl_history)
         
         # WL tahmini yap (geliştirilmiş model kullanılıyor)
         if wl_history:
-            # Desen türünü belirle
-            pattern_type = "mixed"
-            if len(wl_history) >= 4:
-                last_four = wl_history[-4:]
-                
-                # Streak (WWWW veya LLLL)
-                if all(x == 'W' for x in last_four) or all(x == 'L' for x in last_four):
-                    pattern_type = "streak"
-                # Alternating (WLWL veya LWLW)
-                elif (last_four == ['W', 'L', 'W', 'L'] or last_four == ['L', 'W', 'L', 'W']):
-                    pattern_type = "alternating"
-            
-            should_reverse, wl_pred, h_pred, v_pred = self.wl_model.should_reverse_bet(wl_history, None)
+            should_reverse, wl_pred, h_pred, v_pred = self._cached_wl_decision(history, wl_history, None)
             self.should_reverse_bet = should_reverse
             self.current_wl_prediction = wl_pred
             self.current_horizontal_wl_pred = h_pred
@@ -96,14 +276,33 @@ class PredictionModel:
         
         predictions = {}
         for model in self.models:
-            if model['predict_func']:
-                predictions[model['name']] = model['predict_func'](history)
-            else:
-                predictions[model['name']] = '?'
+            predictions[model['name']] = self._cached_prediction(model, history)
         return predictions
     
+    def _select_model(self, history, min_predictions):
+        """Oynanacak modeli seçiciye göre belirler.
+        
+        Aynı durumda seçim bir kez yapılır; Thompson örneklemesi aynı el için
+        tekrar çağrıldığında farklı model seçmez.
+        
+        Args:
+            history (list): Oyun geçmişi.
+            min_predictions (int): 'argmax' için minimum tahmin sayısı.
+            
+        Returns:
+            dict: Seçilen model kaydı; uygun model yoksa None.
+        """
+        if self.selector.name == 'argmax':
+            return self.models.best(min_predictions)
+        
+        self._check_cache(history)
+        if self._selected_model is None:
+            predictions = {model['name']: self._cached_prediction(model, history) for model in self.models}
+            self._selected_model = self.selector.select(predictions) or ''
+        return self.models.get(self._selected_model)
+    
     def get_best_model_prediction(self, history, wl_history=None, min_predictions=5, pattern_type=None):
-        """En yüksek doğruluk oranına sahip modelin tahminini döndürür.
+        """Seçicinin belirlediği modelin (varsayılan: en yüksek doğruluklu) tahminini döndürür.
         
         Args:
             history (list): Oyun geçmişi.
@@ -114,26 +313,23 @@ class PredictionModel:
         Returns:
             tuple: (tahmin, ters_bahis_yapılmalı) - Tahmin ('P', 'B' veya '?') ve ters bahis yapılıp yapılmayacağı.
         """
+        self.features.follow(history, wl_history)
+        
         # WL tahmini güncelle
         if wl_history:
             best_model_pred = None
             
             # En iyi modeli bul
-            ranked_models = sorted(
-                [m for m in self.models if m['total'] >= min_predictions],
-                key=lambda m: m['accuracy'],
-                reverse=True
-            )
+            best_model = self._select_model(history, min_predictions)
             
-            if ranked_models:
-                best_model = ranked_models[0]
-                best_model_pred = best_model['predict_func'](history)
+            if best_model:
+                best_model_pred = self._cached_prediction(best_model, history)
             else:
                 # Yeterli veri yoksa varsayılan olarak son sonucu takip et
                 best_model_pred = self.predict_follow_last(history)
             
             # Desen tipini WL modeline ilet
-            should_reverse, wl_pred, h_pred, v_pred = self.wl_model.should_reverse_bet(wl_history, best_model_pred)
+            should_reverse, wl_pred, h_pred, v_pred = self._cached_wl_decision(history, wl_history, best_model_pred)
             self.should_reverse_bet = should_reverse
             self.current_wl_prediction = wl_pred
             self.current_horizontal_wl_pred = h_pred
@@ -147,15 +343,10 @@ class PredictionModel:
             return best_model_pred, False
         
         # WL geçmişi yoksa normal tahmin yap
-        ranked_models = sorted(
-            [m for m in self.models if m['total'] >= min_predictions],
-            key=lambda m: m['accuracy'],
-            reverse=True
-        )
+        best_model = self._select_model(history, min_predictions)
         
-        if ranked_models:
-            best_model = ranked_models[0]
-            return best_model['predict_func'](history), False
+        if best_model:
+            return self._cached_prediction(best_model, history), False
         
         # Yeterli veri yoksa varsayılan olarak son sonucu takip et
         return self.predict_follow_last(history), False
@@ -167,6 +358,25 @@ class PredictionModel:
             winner (str): Gerçek sonuç ('P' veya 'B').
             predictions (dict): Model adı-tahmin çiftlerini içeren sözlük.
         """
+        self.invalidate_predictions()
+        
+        # Topluluk ağırlıkları tahmin anındaki model çıktılarıyla güncellenir
+        if self.ensemble_model is not None:
+            self.ensemble_model.update(
+                self.ensemble_model.features(predictions, self._wl_predictions()),
+                winner
+            )
+        
+        # Özellik deposu hâlâ tahmin edilen elin durumundadır (get_predictions'ta eşitlendi)
+        self._observe_counts(winner)
+        
+        # Değişken dereceli model her elde (tahmin yapamasa da) tek geçişte güncellenir
+        self.variable_adaptive_model.update_from_key(
+            self.features.pattern_key(self.variable_adaptive_model.max_order),
+            predictions.get('Değişken Adaptif', '?'),
+            winner
+        )
+        
         for model in self.models:
             model_pred = predictions.get(model['name'], '?')
             if model_pred != '?':
@@ -191,21 +401,87 @@ class PredictionModel:
                             )
                 
                 model['accuracy'] = (model['wins'] / model['total'] * 100) if model['total'] > 0 else 0.0
+                model['tracker'].record(model_pred == winner)
+                self.models.update(model)
+                self.selector.update(model['name'], model_pred == winner)
+    
+    def _observe_counts(self, winner):
+        """Sonucu özellik deposunun durumundan sayım tabanlı modellere ekler."""
+        # Shoe'lar arası desen sayımlarını güncelle
+        self.cross_shoe_model.observe(self.features.suffix(self.cross_shoe_model.lookback), winner)
+        
+        # Markov geçiş sayımları her elde tek hücre artırılır
+        if self.markov_model is not None:
+            self.markov_model.observe(self.features.code(self.markov_model.order), winner)
+    
+    def observe_result(self, history, winner):
+        """Tahmin alınmadan kaydedilen eli sayım tabanlı modellere ekler.
+        
+        Shoe'lar arası ve Markov sayımları açılışta kayıtlı tüm sonuçlardan kurulduğu için
+        bahis yapılmayan (izleme modundaki) eller de sayılmalıdır.
+        
+        Args:
+            history (list): Sonuç eklenmeden önceki oyun geçmişi.
+            winner (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        self.features.follow(history)
+        self._observe_counts(winner)
+        self.invalidate_predictions()
+    
+    def get_latency_summary(self):
+        """Model başına tahmin süresi istatistiklerini en yavaştan başlayarak döndürür.
+        
+        Returns:
+            list: Her model için 'name', 'count', 'mean_us', 'p50_us' ve 'p99_us' içeren sözlükler.
+        """
+        rows = [dict(name=model['name'], **model['latency'].summary()) for model in self.models]
+        return sorted(rows, key=lambda row: row['p99_us'], reverse=True)
     
-    def reset_models(self):
-        """Model istatistiklerini sıfırlar."""
+    def reset_models(self, clear_all=False):
+        """Model istatistiklerini sıfırlar ve mevcut shoe'nun öğrenilen verilerini siler.
+        
+        Args:
+            clear_all (bool, optional): True ise tüm sonuçlar silinmiştir; Markov sayımları
+                ve seçici kol durumları da (kayıtlı olanlar dahil) tamamen silinir.
+        """
         self.models = self._initialize_models()
+        if self.ensemble_model is not None:
+            self.ensemble_model.reset()
         if hasattr(self, 'adaptive_model'):
             self.adaptive_model.clear_memory()
+        if hasattr(self, 'cross_shoe_model'):
+            self.cross_shoe_model.clear_current_shoe()
+        if hasattr(self, 'variable_adaptive_model'):
+            self.variable_adaptive_model.clear_memory()
+        if self.markov_model is not None:
+            if clear_all:
+                self.markov_model.clear_all()
+            else:
+                self.markov_model.clear_current_shoe()
+        if clear_all:
+            # close() kol durumlarını yeniden yazdığı için kayıtlı durumlar da silinir
+            self.selector.reset()
+            self.selector_store.clear()
         self.current_wl_prediction = '?'
         self.current_horizontal_wl_pred = '?'
         self.current_vertical_wl_pred = '?'
         self.should_reverse_bet = False
+        self.invalidate_predictions()
+    
+    def flush_writes(self):
+        """Sayım tabanlı modellerin bekleyen veritabanı yazmalarını yazar."""
+        if hasattr(self, 'cross_shoe_model'):
+            self.cross_shoe_model.flush()
     
     def close(self):
         """Kaynakları serbest bırakır."""
         if hasattr(self, 'adaptive_model'):
             self.adaptive_model.close()
+        if hasattr(self, 'cross_shoe_model'):
+            self.cross_shoe_model.close()
+        if hasattr(self, 'selector_store'):
+            self.selector_store.save(self.selector)
+            self.selector_store.close()
     
     def update_wl_weights(self, h_accuracy, v_accuracy):
         """WL tahmin ağırlıklarını günceller.
@@ -216,6 +492,7 @@ class PredictionModel:
         """
         if hasattr(self, 'wl_model') and hasattr(self.wl_model, 'update_weights'):
             self.wl_model.update_weights(h_accuracy/100.0, v_accuracy/100.0)
+            self.invalidate_predictions()
     
     # Tahmin algoritmaları
     def predict_follow_last(self, current_history):
@@ -227,9 +504,7 @@ class PredictionModel:
         Returns:
             str: Tahmin ('P', 'B' veya '?').
         """
-        if not current_history:
-            return '?'
-        return current_history[-1]
+        return self.features.last_result or '?'
     
     def predict_follow_opposite(self, current_history):
         """Son sonucun tersini takip et.
@@ -240,9 +515,9 @@ class PredictionModel:
         Returns:
             str: Tahmin ('P', 'B' veya '?').
         """
-        if not current_history:
+        last = self.features.last_result
+        if last is None:
             return '?'
-        last = current_history[-1]
         return 'B' if last == 'P' else 'P'
     
     def predict_always_player(self, current_history):
@@ -276,8 +551,7 @@ class PredictionModel:
         Returns:
             str: 'P' veya 'B'.
         """
-        n = len(current_history)
-        return 'P' if n % 2 == 0 else 'B'
+        return 'P' if self.features.length % 2 == 0 else 'B'
     
     def predict_wl_reverse(self, current_history):
         """WL modeline göre tersine tahmin yapar.
@@ -291,15 +565,10 @@ class PredictionModel:
         # Eğer normal tahminimiz ve WL tahmini varsa
         if hasattr(self, 'current_wl_prediction') and self.current_wl_prediction == 'L':
             # En iyi modelin tahmininin tersini al
-            ranked_models = sorted(
-                [m for m in self.models if m['name'] != 'WL Tersine' and m['total'] > 0],
-                key=lambda m: m['accuracy'],
-                reverse=True
-            )
+            best_model = self.models.best(exclude='WL Tersine')
             
-            if ranked_models:
-                best_model = ranked_models[0]
-                best_pred = best_model['predict_func'](current_history)
+            if best_model:
+                best_pred = self._cached_prediction(best_model, current_history)
                 
                 if best_pred != '?':
                     return 'P' if best_pred == 'B' else 'B'
@@ -315,26 +584,8 @@ class PredictionModel:
         Returns:
             str: Desen değeri ('P', 'B' veya None).
         """
-        start_row = GRID_SIZE - size
-        start_col = GRID_SIZE - size
-        
-        if start_row < 0 or start_col < 0:
-            return None
-        
-        try:
-            first_val = self.grid_data[start_row][start_col]
-            if first_val is None:
-                return None
-                
-            for r in range(start_row, GRID_SIZE):
-                for c in range(start_col, GRID_SIZE):
-                    # Grid verisinin geçerliliğini kontrol et
-                    if r >= len(self.grid_data) or c >= len(self.grid_data[r]) or self.grid_data[r][c] != first_val:
-                        return None
-            
-            return first_val
-        except IndexError:
-            return None
+        # Sağ alt bölgenin tüm hücreleri aynı renkte mi (iki AND işlemi)
+        return self.bead_board.uniform_value(self.bead_board.square_mask(size))
     
     def _check_grid_pattern(self, size):
         """Esnek grid desen algılama.
@@ -345,29 +596,12 @@ class PredictionModel:
         Returns:
             str: Çoğunluk değeri ('P', 'B' veya None).
         """
-        start_row = GRID_SIZE - size
-        start_col = GRID_SIZE - size
-        
-        if start_row < 0 or start_col < 0:
+        mask = self.bead_board.square_mask(size)
+        if mask is None:
             return None
         
-        # Desenin kaç P ve B içerdiğini say
-        p_count = 0
-        b_count = 0
-        empty_count = 0
-        
-        for r in range(start_row, GRID_SIZE):
-            for c in range(start_col, GRID_SIZE):
-                if r >= len(self.grid_data) or c >= len(self.grid_data[r]):
-                    return None
-                    
-                val = self.grid_data[r][c]
-                if val == 'P':
-                    p_count += 1
-                elif val == 'B':
-                    b_count += 1
-                else:
-                    empty_count += 1
+        # Desenin kaç P ve B içerdiğini say (popcount)
+        p_count, b_count, empty_count = self.bead_board.region_counts(mask)
         
         # Eğer boş hücre yoksa ve bir değer baskınsa
         total_cells = size * size
@@ -390,39 +624,7 @@ class PredictionModel:
         Returns:
             str: Çizgi değeri ('P', 'B' veya None).
         """
-        # Yatay çizgileri kontrol et
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE - length + 1):
-                first_val = self.grid_data[r][c]
-                if first_val is None:
-                    continue
-                    
-                all_same = True
-                for i in range(1, length):
-                    if self.grid_data[r][c+i] != first_val:
-                        all_same = False
-                        break
-                
-                if all_same:
-                    return first_val
-        
-        # Dikey çizgileri kontrol et
-        for c in range(GRID_SIZE):
-            for r in range(GRID_SIZE - length + 1):
-                first_val = self.grid_data[r][c]
-                if first_val is None:
-                    continue
-                    
-                all_same = True
-                for i in range(1, length):
-                    if self.grid_data[r+i][c] != first_val:
-                        all_same = False
-                        break
-                
-                if all_same:
-                    return first_val
-        
-        return None
+        return self.bead_board.line_value(length)
     
     def predict_grid_pattern_2x2(self, current_history):
         """2x2 grid deseni tahmini.
@@ -471,7 +673,9 @@ class PredictionModel:
         Returns:
             str: Tahmin ('P', 'B' veya '?').
         """
-        return self.adaptive_model.predict(current_history)
+        if self.features.length < self.adaptive_model.lookback:
+            return '?'
+        return self.adaptive_model.predict_key(self.features.pattern_key(self.adaptive_model.lookback))
     
     def predict_grid_adaptive(self, current_history):
         """Grid tabanlı adaptif öğrenme modelinden tahmin alır.
@@ -494,4 +698,89 @@ class PredictionModel:
                 return pred
         
         # Grid desenine dayalı tahmin yoksa adaptif model kullan
-        return self.adaptive_model.predict(current_history)
\ No newline at end of file
+        return self.predict_adaptive(current_history)
+    
+    def predict_cross_shoe(self, current_history):
+        """Önceki shoe'ların yakınlık ağırlıklı desen özetinden tahmin alır.
+        
+        Args:
+            current_history (list): Oyun geçmişi.
+            
+        Returns:
+            str: Tahmin ('P', 'B' veya '?').
+        """
+        return self.cross_shoe_model.predict(self.features.suffix(self.cross_shoe_model.lookback))
+    
+    def predict_variable_adaptive(self, current_history):
+        """Değişken dereceli (geri çekilmeli) adaptif modelden tahmin alır.
+        
+        Args:
+            current_history (list): Oyun geçmişi.
+            
+        Returns:
+            str: Tahmin ('P', 'B' veya '?').
+        """
+        return self.variable_adaptive_model.predict_key(
+            self.features.pattern_key(self.variable_adaptive_model.max_order))
+    
+    def predict_derived_roads(self, current_history):
+        """Türetilmiş yolların düzenini sürdüren sonucu tahmin eder.
+        
+        Her aday sonuç için Big Eye Boy, Small Road ve Cockroach Pig'e eklenecek
+        renkler önizlenir; daha çok kırmızı (düzenli) hücre veren sonuç seçilir.
+        
+        Args:
+            current_history (list): Oyun geçmişi.
+            
+        Returns:
+            str: Tahmin ('P', 'B' veya '?').
+        """
+        if self.roads is None:
+            return '?'
+        player_red = sum(color == RED for color in self.roads.preview('P').values())
+        banker_red = sum(color == RED for color in self.roads.preview('B').values())
+        if player_red > banker_red:
+            return 'P'
+        if banker_red > player_red:
+            return 'B'
+        return '?'
+    
+    def predict_markov(self, current_history):
+        """Markov zinciri modeli ile tahmin yapar.
+        
+        Args:
+            current_history (list): Mevcut oyun geçmişi.
+            
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        return self.markov_model.predict(self.features.code(self.markov_model.order))
+    
+    def _wl_predictions(self):
+        """Topluluk modeline özellik olarak verilen WL tahminlerini döndürür."""
+        return (self.current_wl_prediction, self.current_horizontal_wl_pred, self.current_vertical_wl_pred)
+    
+    def predict_ensemble(self, current_history):
+        """Tüm modellerin tahminlerini birleştiren topluluk modelinden tahmin alır.
+        
+        Args:
+            current_history (list): Oyun geçmişi.
+            
+        Returns:
+            str: Tahmin ('P', 'B' veya '?').
+        """
+        predictions = {
+            name: self._cached_prediction(self.models.get(name), current_history)
+            for name in self.ensemble_model.model_names
+        }
+        features = self.ensemble_model.features(predictions, self._wl_predictions())
+        self.ensemble_probability = self.ensemble_model.probability(features)
+        return self.ensemble_model.predict(features)
+    
+    def get_ensemble_probability(self):
+        """Topluluk modelinin son hesapladığı Player olasılığını döndürür.
+        
+        Returns:
+            float: P(Player) 0-1 arasında; topluluk modeli yoksa ya da henüz tahmin yapılmadıysa None.
+        """
+        return self.ensemble_probability
\ No newline at end of file
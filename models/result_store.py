@@ -0,0 +1,302 @@
+"""
+Sonuç deposu arayüzü ve SQLite dışındaki depo uygulamaları.
+ResultStore, MainWindow ve PredictionModel'in kullandığı işlemleri (sonuç ekleme,
+tampon yazma, mevcut shoe okuma, desen araması ve shoe geçişi) tanımlar.
+DatabaseManager SQLite uygulamasıdır; burada saf bellek içi ve yalnızca
+sona ekleme yapan ikili günlük (binary log) uygulamaları bulunur.
+"""
+import os
+import struct
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from config import DB_LOOKBACK, RESULT_STORE_BACKEND, BINLOG_FILE, BINLOG_SHARD_FILE_PATTERN
+from models.pattern_keys import RollingPatternKey, encode_sequence
+
+RESULT_STORE_BACKENDS = ['sqlite', 'memory', 'binlog']
+
+def predict_next_from_results(results, current_sequence, lookback=DB_LOOKBACK):
+    """Shoe sonuçlarında son desenden sonra en sık gelen sonucu bulur.
+
+    Args:
+        results (list): Mevcut shoe'nun sonuçları.
+        current_sequence (list): Mevcut sonuç dizisi.
+        lookback (int, optional): Desen uzunluğu.
+
+    Returns:
+        str: Tahmin edilen değer ('P', 'B' veya '?').
+    """
+    if len(current_sequence) < lookback or len(results) <= lookback:
+        return '?'
+
+    # Pencere anahtarı her elde kaydırılarak güncellenir, dilim ve metin oluşturulmaz
+    lookup_key = encode_sequence(current_sequence[-lookback:])
+    rolling_key = RollingPatternKey(lookback)
+    next_outcomes = []
+    for i in range(len(results) - 1):
+        rolling_key.push(results[i])
+        if rolling_key.is_full() and rolling_key.key == lookup_key:
+            next_outcomes.append(results[i + 1])
+
+    if not next_outcomes:
+        return '?'
+    most_common = Counter(next_outcomes).most_common(1)
+    return most_common[0][0] if most_common else '?'
+
+class ResultStore(ABC):
+    """Sonuç deposu arayüzü. Tüm arka uçlar bu işlemleri aynı anlamla sağlamalıdır."""
+
+    # Kapatılıp yeniden açıldığında verilerin korunup korunmadığı
+    durable = True
+
+    def __init__(self):
+        self.table_id = None
+        self.current_shoe_id = 1
+        self.write_buffer = []
+
+    @abstractmethod
+    def add_result(self, winner, is_win=None, kasa=None):
+        """Sonucu yazma tamponuna ekler.
+
+        Args:
+            winner (str): Kazananı temsil eden 'P' veya 'B' değeri.
+            is_win (bool, optional): Bahis sonucu; bahis yapılmadıysa None.
+            kasa (float, optional): El sonrası kasa değeri.
+        """
+
+    @abstractmethod
+    def flush_buffer(self):
+        """Tamponlanmış sonuçları depoya yazar."""
+
+    @abstractmethod
+    def get_current_shoe_results(self):
+        """Mevcut shoe'nun yazılmış sonuçlarını döndürür.
+
+        Returns:
+            list: 'P' veya 'B' değerlerinden oluşan sonuçlar.
+        """
+
+    def predict_from_history(self, current_sequence):
+        """Mevcut shoe'daki desen aramasına göre tahmin yapar.
+
+        Args:
+            current_sequence (list): Mevcut sonuç dizisi.
+
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        if len(current_sequence) < DB_LOOKBACK:
+            return '?'
+        return predict_next_from_results(self.get_current_shoe_results(), current_sequence)
+
+    @abstractmethod
+    def new_shoe_detected(self):
+        """Yeni shoe başladığında shoe ID'sini artırır."""
+
+    @abstractmethod
+    def clear_current_shoe_data(self):
+        """Sadece mevcut shoe'nun sonuçlarını siler.
+
+        Returns:
+            bool: İşlemin başarılı olup olmadığı.
+        """
+
+    @abstractmethod
+    def clear_table(self):
+        """Tüm sonuçları siler ve shoe ID'sini 1'e döndürür.
+
+        Returns:
+            bool: İşlemin başarılı olup olmadığı.
+        """
+
+    @abstractmethod
+    def close(self):
+        """Tamponu yazar ve kaynakları serbest bırakır."""
+
+class MemoryResultStore(ResultStore):
+    """Tüm sonuçları yalnızca bellekte tutan depo (simülasyonlar için, kalıcı değildir)."""
+
+    durable = False
+
+    def __init__(self, table_id=None, first_shoe_id=1):
+        """
+        Args:
+            table_id (int, optional): Masa ID'si (yalnızca bilgi amaçlı).
+            first_shoe_id (int, optional): İlk shoe'nun ID'si; tahmin veritabanındaki
+                shoe numaralarının devam etmesi için verilir.
+        """
+        super().__init__()
+        self.table_id = table_id
+        self.current_shoe_id = first_shoe_id
+        self.shoes = {first_shoe_id: []}  # shoe_id -> sonuçlar
+
+    def add_result(self, winner, is_win=None, kasa=None):
+        self.write_buffer.append((self.current_shoe_id, winner))
+
+    def flush_buffer(self):
+        for shoe_id, winner in self.write_buffer:
+            self.shoes.setdefault(shoe_id, []).append(winner)
+        self.write_buffer.clear()
+
+    def get_current_shoe_results(self):
+        return list(self.shoes.get(self.current_shoe_id, []))
+
+    def new_shoe_detected(self):
+        self.current_shoe_id += 1
+        self.shoes[self.current_shoe_id] = []
+        # DatabaseManager ile aynı: yazılmamış sonuçlar yeni shoe'ya taşınmaz
+        self.write_buffer.clear()
+        print(f"Yeni shoe başladı! Shoe ID: {self.current_shoe_id}")
+
+    def clear_current_shoe_data(self):
+        self.shoes[self.current_shoe_id] = []
+        return True
+
+    def clear_table(self):
+        self.shoes = {1: []}
+        self.current_shoe_id = 1
+        self.write_buffer.clear()
+        return True
+
+    def close(self):
+        self.flush_buffer()
+
+class BinaryLogResultStore(ResultStore):
+    """Sonuçları yalnızca sona ekleme yapılan ikili bir günlük dosyasında tutan depo.
+
+    Her el tek bayttır (P=0, B=1). Shoe geçişi ve shoe temizleme, arkasından
+    4 baytlık shoe ID gelen işaret baytlarıyla kaydedilir. Açılışta günlük baştan
+    okunur; bellekte yalnızca mevcut shoe tutulur.
+    """
+
+    RECORD_CODES = {'P': 0x00, 'B': 0x01}
+    CODE_RESULTS = {0x00: 'P', 0x01: 'B'}
+    NEW_SHOE = 0xFE
+    CLEAR_SHOE = 0xFD
+    SHOE_ID = struct.Struct('<I')
+
+    def __init__(self, table_id=None, log_file=None, sync=False, first_shoe_id=1):
+        """
+        Args:
+            table_id (int, optional): Masa ID'si; masa başına ayrı günlük dosyası kullanılır.
+            log_file (str, optional): Günlük dosyası (varsayılan BINLOG_FILE).
+            sync (bool, optional): True ise her yazmadan sonra os.fsync çağrılır.
+            first_shoe_id (int, optional): Günlük yeni oluşturuluyorsa ilk shoe'nun ID'si.
+        """
+        super().__init__()
+        self.table_id = table_id
+        if log_file is None:
+            log_file = BINLOG_FILE if table_id is None else BINLOG_SHARD_FILE_PATTERN.format(table_id=table_id)
+        self.log_file = log_file
+        self.sync = sync
+        self.current_results = []
+        is_new_log = not self._replay()
+        self.log = open(self.log_file, 'ab')
+        if is_new_log:
+            # Yeni günlük ilk shoe ID'siyle başlar, yeniden açılışta aynı ID okunur
+            self.current_shoe_id = first_shoe_id
+            self._append(self._marker(self.NEW_SHOE))
+
+    def _replay(self):
+        """Günlüğü baştan okuyarak mevcut shoe durumunu kurar.
+
+        Returns:
+            bool: Günlükte kayıt varsa True.
+        """
+        if not os.path.exists(self.log_file):
+            return False
+
+        with open(self.log_file, 'rb') as f:
+            data = f.read()
+        if not data:
+            return False
+
+        position = 0
+        while position < len(data):
+            code = data[position]
+            position += 1
+            if code in self.CODE_RESULTS:
+                self.current_results.append(self.CODE_RESULTS[code])
+            elif code in (self.NEW_SHOE, self.CLEAR_SHOE):
+                if position + self.SHOE_ID.size > len(data):
+                    break  # Yarım kalmış son kayıt yok sayılır
+                (self.current_shoe_id,) = self.SHOE_ID.unpack_from(data, position)
+                position += self.SHOE_ID.size
+                self.current_results = []
+            else:
+                print(f"Günlükte bilinmeyen kayıt ({code:#x}), okuma {position - 1}. baytta durdu.")
+                break
+        print(f"İkili günlük '{self.log_file}' okundu. Mevcut shoe ID: {self.current_shoe_id}")
+        return True
+
+    def _append(self, payload):
+        """Günlüğün sonuna yazar."""
+        self.log.write(payload)
+        self.log.flush()
+        if self.sync:
+            os.fsync(self.log.fileno())
+
+    def _marker(self, code):
+        return bytes([code]) + self.SHOE_ID.pack(self.current_shoe_id)
+
+    def add_result(self, winner, is_win=None, kasa=None):
+        if winner not in self.RECORD_CODES:
+            raise ValueError(f"Geçersiz sonuç değeri: {winner!r}")
+        self.write_buffer.append((self.current_shoe_id, winner))
+
+    def flush_buffer(self):
+        if not self.write_buffer:
+            return
+        winners = [winner for _, winner in self.write_buffer]
+        self._append(bytes(self.RECORD_CODES[winner] for winner in winners))
+        self.current_results.extend(winners)
+        self.write_buffer.clear()
+
+    def get_current_shoe_results(self):
+        return list(self.current_results)
+
+    def new_shoe_detected(self):
+        self.current_shoe_id += 1
+        self.write_buffer.clear()
+        self.current_results = []
+        self._append(self._marker(self.NEW_SHOE))
+        print(f"Yeni shoe başladı! Shoe ID: {self.current_shoe_id}")
+
+    def clear_current_shoe_data(self):
+        self.current_results = []
+        self._append(self._marker(self.CLEAR_SHOE))
+        return True
+
+    def clear_table(self):
+        # Tam sıfırlama günlüğü kısaltır; diğer tüm işlemler yalnızca sona ekler
+        self.log.truncate(0)
+        self.current_shoe_id = 1
+        self.current_results = []
+        self.write_buffer.clear()
+        self._append(self._marker(self.NEW_SHOE))
+        return True
+
+    def close(self):
+        self.flush_buffer()
+        self.log.close()
+
+def create_result_store(backend=None, **kwargs):
+    """Ayarlanan arka uç için sonuç deposu oluşturur.
+
+    Args:
+        backend (str, optional): 'sqlite', 'memory' veya 'binlog' (varsayılan RESULT_STORE_BACKEND).
+        **kwargs: Deponun kurucusuna iletilen parametreler.
+
+    Returns:
+        ResultStore: Sonuç deposu.
+    """
+    backend = backend or RESULT_STORE_BACKEND
+    if backend == 'sqlite':
+        # DatabaseManager bu modülü içe aktardığı için burada yüklenir
+        from models.database import DatabaseManager
+        return DatabaseManager(**kwargs)
+    if backend == 'memory':
+        return MemoryResultStore(**kwargs)
+    if backend == 'binlog':
+        return BinaryLogResultStore(**kwargs)
+    raise ValueError(f"Bilinmeyen sonuç deposu: {backend}")
\ No newline at end of file
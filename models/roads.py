@@ -0,0 +1,176 @@
+"""
+Big Road ve türetilmiş yolların (Big Eye Boy, Small Road, Cockroach Pig) artımlı motoru.
+Her el Big Road'a bir kez eklenir ve türetilmiş yolların yeni hücresi yalnızca
+Big Road'un sütun uzunluklarından hesaplanır. Yollar baştan kurulmaz, her el
+amortize O(1) maliyetlidir. Hücreler hem mantıksal sütunlar (tahmin için) hem
+de ejderha kuyruklu fiziksel yerleşim (arayüz için) olarak okunabilir.
+"""
+from config import ROAD_ROWS
+
+RED = 'K'   # Kırmızı: Big Road düzenli (tekrar eden) görünüyor
+BLUE = 'M'  # Mavi: Big Road düzensiz görünüyor
+
+# Türetilmiş yol adı -> karşılaştırılan sütun uzaklığı
+DERIVED_ROADS = {
+    'big_eye_boy': 1,
+    'small_road': 2,
+    'cockroach_pig': 3,
+}
+
+class RoadLayout:
+    """Aynı değer aşağı, farklı değer yeni sütun kuralıyla dolan yol ızgarası.
+
+    Sütun alt sınıra ya da dolu bir hücreye ulaşınca sağa döner (ejderha kuyruğu).
+    """
+
+    def __init__(self, rows=ROAD_ROWS):
+        """
+        Args:
+            rows (int, optional): Fiziksel satır sayısı.
+        """
+        self.rows = rows
+        self.clear()
+
+    def clear(self):
+        """Yolu boşaltır."""
+        self.column_lengths = []   # Mantıksal sütun uzunlukları
+        self.column_values = []    # Mantıksal sütun değerleri
+        self.cells = {}            # (satır, fiziksel sütun) -> değer
+        self.width = 0
+        self._position = None      # Son hücrenin fiziksel konumu
+        self._column_start = -1    # Son mantıksal sütunun başladığı fiziksel sütun
+        self._turned = False       # Son sütun sağa döndü mü
+
+    def add(self, value):
+        """Yeni değeri ekler.
+
+        Args:
+            value (str): Hücre değeri.
+
+        Returns:
+            tuple: (mantıksal sütun, mantıksal satır).
+        """
+        if self.column_values and self.column_values[-1] == value:
+            self.column_lengths[-1] += 1
+            row, col = self._position
+            if not self._turned and row + 1 < self.rows and (row + 1, col) not in self.cells:
+                self._position = (row + 1, col)
+            else:
+                # Ejderha kuyruğu: aynı satırda sağa devam eder
+                self._turned = True
+                self._position = (row, col + 1)
+        else:
+            self.column_values.append(value)
+            self.column_lengths.append(1)
+            col = self._column_start + 1
+            while (0, col) in self.cells:
+                col += 1
+            self._column_start = col
+            self._turned = False
+            self._position = (0, col)
+
+        self.cells[self._position] = value
+        self.width = max(self.width, self._position[1] + 1)
+        return len(self.column_lengths) - 1, self.column_lengths[-1] - 1
+
+    def to_grid(self, cols=None):
+        """Fiziksel yerleşimin son cols sütununu 2D liste olarak döndürür.
+
+        Args:
+            cols (int, optional): Sütun sayısı (varsayılan tüm genişlik).
+
+        Returns:
+            list: grid[satır][sütun] değerleri ya da None.
+        """
+        cols = self.width if cols is None else cols
+        first = max(0, self.width - cols)
+        return [[self.cells.get((row, first + c)) for c in range(cols)] for row in range(self.rows)]
+
+class RoadEngine:
+    """Big Road ve türetilmiş yolları her elde artımlı olarak güncelleyen motor."""
+
+    def __init__(self, rows=ROAD_ROWS):
+        """
+        Args:
+            rows (int, optional): Yolların fiziksel satır sayısı.
+        """
+        self.big_road = RoadLayout(rows)
+        self.derived = {name: RoadLayout(rows) for name in DERIVED_ROADS}
+
+    def clear(self):
+        """Tüm yolları boşaltır."""
+        self.big_road.clear()
+        for road in self.derived.values():
+            road.clear()
+
+    def load(self, results):
+        """Yolları sonuç listesinden yeniden kurar (geri almada kullanılır).
+
+        Args:
+            results (list): 'P'/'B' sonuçları (en eski başta).
+        """
+        self.clear()
+        for winner in results:
+            self.add_result(winner)
+
+    def _derived_color(self, col, row, offset, lengths):
+        """Big Road'un (col, row) hücresi için türetilmiş yol rengini hesaplar.
+
+        Args:
+            col (int): Mantıksal sütun.
+            row (int): Mantıksal satır.
+            offset (int): Karşılaştırılan sütun uzaklığı (1, 2 veya 3).
+            lengths (list): Big Road mantıksal sütun uzunlukları.
+
+        Returns:
+            str: RED, BLUE ya da yol henüz başlamadıysa None.
+        """
+        # Yol, offset. sütunun ikinci hücresinden ya da sonraki sütunun ilk hücresinden başlar
+        if col < offset or (col == offset and row == 0):
+            return None
+        if row == 0:
+            # Yeni sütun: önceki sütun ile ondan offset kadar önceki sütunun boyu karşılaştırılır
+            return RED if lengths[col - 1] == lengths[col - 1 - offset] else BLUE
+        compared = lengths[col - offset]
+        # Karşılaştırılan sütunda aynı satır doluysa ya da iki satır birden boşsa düzenli sayılır
+        return BLUE if compared == row else RED
+
+    def add_result(self, winner):
+        """Yeni eli tüm yollara ekler.
+
+        Args:
+            winner (str): 'P' veya 'B'.
+
+        Returns:
+            dict: Türetilmiş yol adı -> eklenen renk (yol başlamadıysa None).
+        """
+        col, row = self.big_road.add(winner)
+        lengths = self.big_road.column_lengths
+        colors = {}
+        for name, offset in DERIVED_ROADS.items():
+            color = self._derived_color(col, row, offset, lengths)
+            if color is not None:
+                self.derived[name].add(color)
+            colors[name] = color
+        return colors
+
+    def preview(self, winner):
+        """Sonraki el winner olursa türetilmiş yollara eklenecek renkleri döndürür (yollar değişmez).
+
+        Args:
+            winner (str): 'P' veya 'B'.
+
+        Returns:
+            dict: Türetilmiş yol adı -> renk (RED, BLUE veya None).
+        """
+        lengths = self.big_road.column_lengths
+        values = self.big_road.column_values
+        if values and values[-1] == winner:
+            col, row = len(lengths) - 1, lengths[-1]
+        else:
+            col, row = len(lengths), 0
+        return {name: self._derived_color(col, row, offset, lengths) for name, offset in DERIVED_ROADS.items()}
+
+    def road(self, name):
+        """Adı verilen yolu döndürür ('big_road' veya DERIVED_ROADS içinden)."""
+        return self.big_road if name == 'big_road' else self.derived[name]
\ No newline at end of file
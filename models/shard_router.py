@@ -0,0 +1,271 @@
+"""
+Birden fazla masayı aynı anda izlemek için masa başına veritabanı yönlendiricisi.
+Her masa kendi SQLite dosyasında tutulur (get_db_file); masanın sonuç deposu,
+shoe'lar arası desen modeli ve Markov sayımları ilk kullanımda açılır ve açık
+masa sayısı en son kullanılmayanı (LRU) kapatarak sınırlanır. Her masanın kendi
+kilidi vardır, farklı masalara yazmalar birbirini beklemez.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from config import MAX_OPEN_SHARDS, SIMULATION_DB_FILE, SIMULATION_SHARD_FILE_PATTERN
+from models.database import DatabaseManager
+from models.cross_shoe import CrossShoePatternModel
+from models.hand_features import HandFeatureStore
+
+try:
+    # Markov modeli isteğe bağlı numpy paketini gerektirir
+    from models.markov import MarkovChainModel
+except ImportError:
+    MarkovChainModel = None
+
+class TableShard:
+    """Bir masanın sonuç deposunu ve masa başına tutulan tahmin modellerini bir arada tutan sınıf.
+
+    Bağlantılar yönlendiricinin thread'lerinden de kullanılır; erişim masa kilidiyle sıralanır.
+    """
+
+    def __init__(self, table_id, storage_layout=None, in_memory=False):
+        """
+        Args:
+            table_id (int): Masa ID'si.
+            storage_layout (str, optional): Masa veritabanının sonuç saklama düzeni.
+            in_memory (bool, optional): True ise masanın bellek içi simülasyon veritabanı kullanılır.
+        """
+        self.table_id = table_id
+        snapshot_file = (SIMULATION_DB_FILE if table_id is None
+                         else SIMULATION_SHARD_FILE_PATTERN.format(table_id=table_id))
+        self.results = DatabaseManager(storage_layout, table_id=table_id, check_same_thread=False,
+                                       in_memory=in_memory, snapshot_file=snapshot_file)
+        self.cross_shoe = CrossShoePatternModel(table_id=table_id, in_memory=in_memory, check_same_thread=False)
+        self.cross_shoe.set_shoe_id(self.results.current_shoe_id)
+        self.markov = MarkovChainModel(table_id=table_id, in_memory=in_memory) if MarkovChainModel else None
+        if self.markov is not None:
+            self.markov.set_shoe_id(self.results.current_shoe_id)
+        # Mevcut shoe'nun sonuçları; desen ve Markov durumları buradan okunur
+        self.history = self.results.get_current_shoe_results() if self.results.connection else []
+        self.features = HandFeatureStore()
+        self.features.load(self.history)
+
+    def add_result(self, winner, is_win=None, kasa=None):
+        """Sonucu masanın yazma tamponuna ekler ve modellerin sayımlarını günceller.
+
+        Args:
+            winner (str): Kazananı temsil eden 'P' veya 'B' değeri.
+            is_win (bool, optional): Bahis sonucu; bahis yapılmadıysa None.
+            kasa (float, optional): El sonrası kasa değeri.
+        """
+        # Sayımlar sonuçtan önceki durumla güncellenir
+        self.cross_shoe.observe(self.features.suffix(self.cross_shoe.lookback), winner)
+        if self.markov is not None:
+            self.markov.observe(self.features.code(self.markov.order), winner)
+        self.results.add_result(winner, is_win, kasa)
+        self.history.append(winner)
+        self.features.add_result(winner)
+
+    def new_shoe_detected(self):
+        """Masada yeni shoe başladığında depoyu ve modelleri yeni shoe'ya geçirir."""
+        self.flush()
+        self.results.new_shoe_detected()
+        self.cross_shoe.set_shoe_id(self.results.current_shoe_id)
+        if self.markov is not None:
+            self.markov.set_shoe_id(self.results.current_shoe_id)
+        self.history = []
+        self.features.clear()
+
+    def predict(self):
+        """Masanın mevcut shoe durumuna göre model tahminlerini döndürür.
+
+        Returns:
+            dict: Model adı ('Veritabanı', 'Çapraz Shoe', 'Markov') -> tahmin ('P', 'B' veya '?').
+        """
+        predictions = {
+            'Veritabanı': self.results.predict_from_history(self.history),
+            'Çapraz Shoe': self.cross_shoe.predict(self.features.suffix(self.cross_shoe.lookback)),
+        }
+        if self.markov is not None:
+            predictions['Markov'] = self.markov.predict(self.features.code(self.markov.order))
+        return predictions
+
+    def flush(self):
+        """Masanın tamponlanmış yazmalarını veritabanına yazar."""
+        self.results.flush_buffer()
+        self.cross_shoe.flush()
+
+    def close(self):
+        """Tamponları yazar ve masanın bağlantılarını kapatır."""
+        self.results.close()
+        self.cross_shoe.close()
+
+class ShardRouter:
+    """Masa ID'sine göre TableShard örneklerini yöneten sınıf."""
+
+    def __init__(self, max_open=MAX_OPEN_SHARDS, storage_layout=None, in_memory=False):
+        """
+        Args:
+            max_open (int, optional): Aynı anda açık tutulacak en fazla masa veritabanı sayısı.
+            storage_layout (str, optional): Masa veritabanlarının sonuç saklama düzeni.
+            in_memory (bool, optional): True ise masaların bellek içi simülasyon veritabanları kullanılır.
+        """
+        self.max_open = max(1, max_open)
+        self.storage_layout = storage_layout
+        self.in_memory = in_memory
+        self._shards = OrderedDict()  # table_id -> TableShard (en son kullanılan sonda)
+        self._table_locks = {}  # table_id -> threading.Lock
+        self._router_lock = threading.Lock()  # Sadece sözlük işlemleri için, SQL sırasında tutulmaz
+
+    def _table_lock(self, table_id):
+        """Masanın kilidini döndürür (yoksa oluşturur). _router_lock tutulurken çağrılmalıdır."""
+        lock = self._table_locks.get(table_id)
+        if lock is None:
+            lock = self._table_locks[table_id] = threading.Lock()
+        return lock
+
+    def _evict(self):
+        """Sınır aşıldıysa en son kullanılmayan masaları kapatır. _router_lock tutulurken çağrılmalıdır.
+
+        Returns:
+            list: Kapatılması gereken (masa kilidi, TableShard) çiftleri.
+        """
+        evicted = []
+        while len(self._shards) > self.max_open:
+            table_id, shard = self._shards.popitem(last=False)
+            evicted.append((self._table_locks[table_id], shard))
+        return evicted
+
+    def acquire(self, table_id):
+        """Masanın parçasını ve kilidini döndürür, gerekirse bağlantıları açar.
+
+        Args:
+            table_id (int): Masa ID'si.
+
+        Returns:
+            tuple: (TableShard, threading.Lock). Parça kullanılırken kilit tutulmalıdır.
+        """
+        with self._router_lock:
+            lock = self._table_lock(table_id)
+            shard = self._shards.get(table_id)
+            if shard is not None:
+                self._shards.move_to_end(table_id)
+                return shard, lock
+
+        with lock:
+            with self._router_lock:
+                # Başka bir thread aynı masayı bu arada açmış olabilir
+                shard = self._shards.get(table_id)
+                if shard is not None:
+                    self._shards.move_to_end(table_id)
+                    return shard, lock
+
+            # Dosya açma, göçler ve sayımların yüklenmesi masa kilidi altında, yönlendirici kilidi dışında yapılır
+            shard = TableShard(table_id, self.storage_layout, self.in_memory)
+            with self._router_lock:
+                self._shards[table_id] = shard
+                evicted = self._evict()
+
+        for evicted_lock, evicted_shard in evicted:
+            with evicted_lock:
+                evicted_shard.close()
+        return shard, lock
+
+    @contextmanager
+    def table(self, table_id):
+        """Masanın parçasını masa kilidi altında kullandırır.
+
+        Parça, kilit alınmadan hemen önce LRU ile kapatılmışsa yeniden açılır.
+
+        Args:
+            table_id (int): Masa ID'si.
+
+        Yields:
+            TableShard: Masanın açık parçası.
+        """
+        while True:
+            shard, lock = self.acquire(table_id)
+            with lock:
+                with self._router_lock:
+                    still_open = self._shards.get(table_id) is shard
+                if still_open:
+                    yield shard
+                    return
+
+    def shard(self, table_id):
+        """Masanın parçasını döndürür (tek thread'den kullanım için; kilit tutulmaz).
+
+        Args:
+            table_id (int): Masa ID'si.
+
+        Returns:
+            TableShard: Masanın açık parçası.
+        """
+        return self.acquire(table_id)[0]
+
+    def add_result(self, table_id, winner, is_win=None, kasa=None):
+        """Sonucu masanın yazma tamponuna ekler.
+
+        Args:
+            table_id (int): Masa ID'si.
+            winner (str): Kazananı temsil eden 'P' veya 'B' değeri.
+            is_win (bool, optional): Bahis sonucu; bahis yapılmadıysa None.
+            kasa (float, optional): El sonrası kasa değeri.
+        """
+        with self.table(table_id) as shard:
+            shard.add_result(winner, is_win, kasa)
+
+    def new_shoe_detected(self, table_id):
+        """Masada yeni shoe başladığında çağrılır.
+
+        Args:
+            table_id (int): Masa ID'si.
+        """
+        with self.table(table_id) as shard:
+            shard.new_shoe_detected()
+
+    def predict(self, table_id):
+        """Masanın mevcut shoe durumuna göre model tahminlerini döndürür.
+
+        Args:
+            table_id (int): Masa ID'si.
+
+        Returns:
+            dict: Model adı -> tahmin ('P', 'B' veya '?').
+        """
+        with self.table(table_id) as shard:
+            return shard.predict()
+
+    def flush_table(self, table_id):
+        """Tek bir masanın tamponunu yazar (masa açık değilse bir şey yapmaz)."""
+        with self._router_lock:
+            shard = self._shards.get(table_id)
+            lock = self._table_locks.get(table_id)
+        if shard is not None:
+            with lock:
+                shard.flush()
+
+    def flush_all(self):
+        """Açık tüm masaların tamponlarını paralel olarak yazar.
+
+        Her masa ayrı dosyada olduğu için yazmalar SQLite kilidi için yarışmaz.
+        """
+        with self._router_lock:
+            table_ids = list(self._shards)
+        if not table_ids:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(table_ids), self.max_open)) as executor:
+            list(executor.map(self.flush_table, table_ids))
+
+    def open_tables(self):
+        """Açık masa ID'lerini en eski kullanılandan başlayarak döndürür."""
+        with self._router_lock:
+            return list(self._shards)
+
+    def close_all(self):
+        """Tüm masaların tamponlarını yazar ve bağlantılarını kapatır."""
+        with self._router_lock:
+            shards = list(self._shards.items())
+            self._shards.clear()
+        for table_id, shard in shards:
+            with self._table_locks[table_id]:
+                shard.close()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Shoe başına özet satırlarını (shoe_summary tablosu) artımlı olarak güncelleyen modül.
+Her yeni el özet sözlüğüne O(1) maliyetle eklenir; panolar ve shoe'lar arası
+analizler results tablosunu taramak yerine shoe başına tek satır okur.
+"""
+from models.packed_storage import iter_shoe_results
+
+SUMMARY_COLUMNS = ['hands', 'player_count', 'banker_count', 'longest_p_run', 'longest_b_run',
+                   'run_winner', 'run_length', 'win_count', 'loss_count', 'final_kasa']
+
+UPSERT_SUMMARY_SQL = f"""
+    INSERT INTO shoe_summary (shoe_id, {', '.join(SUMMARY_COLUMNS)}, updated_at)
+    VALUES (?, {', '.join('?' for _ in SUMMARY_COLUMNS)}, CURRENT_TIMESTAMP)
+    ON CONFLICT(shoe_id) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in SUMMARY_COLUMNS)},
+        updated_at = excluded.updated_at
+"""
+
+def new_summary():
+    """Boş bir shoe özeti döndürür."""
+    summary = dict.fromkeys(SUMMARY_COLUMNS, 0)
+    summary['run_winner'] = None
+    summary['final_kasa'] = None
+    return summary
+
+def update_summary(summary, winner, is_win=None, kasa=None):
+    """Bir eli özete ekler.
+
+    Args:
+        summary (dict): new_summary ile oluşturulmuş özet (yerinde güncellenir).
+        winner (str): 'P' veya 'B' değeri.
+        is_win (bool, optional): Bahis sonucu; bahis yapılmadıysa None.
+        kasa (float, optional): El sonrası kasa değeri.
+    """
+    summary['hands'] += 1
+    if winner == 'P':
+        summary['player_count'] += 1
+    elif winner == 'B':
+        summary['banker_count'] += 1
+
+    if winner == summary['run_winner']:
+        summary['run_length'] += 1
+    else:
+        summary['run_winner'] = winner
+        summary['run_length'] = 1
+    if winner == 'P':
+        summary['longest_p_run'] = max(summary['longest_p_run'], summary['run_length'])
+    elif winner == 'B':
+        summary['longest_b_run'] = max(summary['longest_b_run'], summary['run_length'])
+
+    if is_win is not None:
+        summary['win_count' if is_win else 'loss_count'] += 1
+    if kasa is not None:
+        summary['final_kasa'] = kasa
+
+def load_summary(cursor, shoe_id):
+    """Shoe özetini veritabanından okur, yoksa boş özet döndürür.
+
+    Args:
+        cursor (sqlite3.Cursor): Veritabanı cursor'u.
+        shoe_id (int): Shoe ID'si.
+
+    Returns:
+        dict: Shoe özeti.
+    """
+    cursor.execute(f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM shoe_summary WHERE shoe_id = ?", (shoe_id,))
+    row = cursor.fetchone()
+    return dict(zip(SUMMARY_COLUMNS, row)) if row else new_summary()
+
+def save_summary(cursor, shoe_id, summary):
+    """Shoe özetini yazar (commit çağırana aittir)."""
+    cursor.execute(UPSERT_SUMMARY_SQL, (shoe_id, *(summary[column] for column in SUMMARY_COLUMNS)))
+
+def backfill_summaries(cursor, shoe_ids=None):
+    """Kayıtlı sonuçlardan shoe özetlerini yeniden oluşturur.
+
+    El sayıları ve seriler sonuçlardan hesaplanır; sonuçlardan çıkarılamayan
+    W/L sayıları ve kasa mevcut özet satırından korunur.
+
+    Args:
+        cursor (sqlite3.Cursor): Veritabanı cursor'u.
+        shoe_ids (set, optional): Yalnızca bu shoe'lar (varsayılan tümü).
+    """
+    for shoe_id, winners in list(iter_shoe_results(cursor.connection)):
+        if shoe_ids is not None and shoe_id not in shoe_ids:
+            continue
+        existing = load_summary(cursor, shoe_id)
+        summary = new_summary()
+        for winner in winners:
+            update_summary(summary, winner)
+        for column in ('win_count', 'loss_count', 'final_kasa'):
+            summary[column] = existing[column]
+        save_summary(cursor, shoe_id, summary)
\ No newline at end of file
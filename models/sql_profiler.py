@@ -0,0 +1,250 @@
+"""
+SQL cümleleri için basit profilleme katmanı.
+ProfiledConnection, sqlite3 bağlantısını sarar ve cursor üzerindeki her
+execute/executemany çağrısının süresini, dönen/etkilenen satır sayısını
+normalize edilmiş cümle bazında SQLProfiler'a kaydeder. İstenirse her cümlenin
+ilk çalışmasında EXPLAIN QUERY PLAN çıktısı da saklanır. Yüzdelikler her
+cümlenin son window çalıştırmasını tutan sabit boyutlu halka tampondan hesaplanır.
+"""
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+from config import SQL_PROFILE_WINDOW
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+def normalize_statement(sql):
+    """SQL cümlesini gruplamak için normalize eder.
+
+    Boşluklar teke indirilir, metin ve sayı sabitleri '?' ile değiştirilir.
+
+    Args:
+        sql (str): SQL cümlesi.
+
+    Returns:
+        str: Normalize edilmiş cümle.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+def _percentile(sorted_values, percent):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik değeri döndürür."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class SQLProfiler:
+    """Cümle bazında çağrı sayısı, süre ve satır istatistiklerini tutan sınıf."""
+
+    def __init__(self, name="SQL", explain=False, window=SQL_PROFILE_WINDOW):
+        """
+        Args:
+            name (str, optional): Raporda kullanılacak ad.
+            explain (bool, optional): True ise her cümlenin ilk çalışmasında sorgu planı saklanır.
+            window (int, optional): Yüzdelik hesabı için cümle başına tutulan son ölçüm sayısı.
+        """
+        self.name = name
+        self.explain = explain
+        self.window = window
+        self.stats = {}
+        self.plans = {}
+        # Aynı profil arka plandaki yazıcı thread'in bağlantısıyla paylaşılabilir
+        self._lock = threading.Lock()
+
+    def _entry(self, statement):
+        """Cümlenin istatistik kaydını döndürür (yoksa oluşturur)."""
+        entry = self.stats.get(statement)
+        if entry is None:
+            entry = self.stats[statement] = {
+                'count': 0, 'total': 0.0, 'rows': 0,
+                'latencies': array('d', bytes(8 * self.window)),  # Halka tampon (saniye)
+                'position': 0,
+            }
+        return entry
+
+    def record(self, statement, elapsed, rows=0):
+        """Bir çalıştırmayı kaydeder.
+
+        Args:
+            statement (str): Normalize edilmiş cümle.
+            elapsed (float): Süre (saniye).
+            rows (int, optional): Etkilenen satır sayısı.
+        """
+        with self._lock:
+            entry = self._entry(statement)
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['rows'] += max(0, rows)
+            entry['latencies'][entry['position']] = elapsed
+            entry['position'] = (entry['position'] + 1) % self.window
+
+    def record_fetch(self, statement, elapsed, rows):
+        """Sonuç okuma süresini ve satırlarını cümlenin son çalıştırmasına ekler.
+
+        Args:
+            statement (str): Normalize edilmiş cümle.
+            elapsed (float): Okuma süresi (saniye).
+            rows (int): Okunan satır sayısı.
+        """
+        with self._lock:
+            entry = self.stats.get(statement)
+            if entry is None or not entry['count']:
+                return
+            entry['total'] += elapsed
+            entry['rows'] += rows
+            entry['latencies'][(entry['position'] - 1) % self.window] += elapsed
+
+    def capture_plan(self, connection, statement, sql, parameters=()):
+        """Cümlenin sorgu planını ilk çalışmada saklar.
+
+        Args:
+            connection (sqlite3.Connection): Sarılmamış veritabanı bağlantısı.
+            statement (str): Normalize edilmiş cümle.
+            sql (str): Çalıştırılacak asıl cümle.
+            parameters (tuple, optional): Cümle parametreleri.
+        """
+        if not self.explain or statement in self.plans:
+            return
+        if not statement.upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            return
+        try:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            plan = [row[-1] for row in rows]
+        except sqlite3.Error as e:
+            plan = [f"plan alınamadı: {e}"]
+        with self._lock:
+            self.plans.setdefault(statement, plan)
+
+    def summary(self):
+        """Cümle istatistiklerini toplam süreye göre azalan sırada döndürür.
+
+        Returns:
+            list: Her cümle için count, total, p50, p95, p99 (milisaniye) ve rows içeren sözlükler.
+        """
+        rows = []
+        with self._lock:
+            entries = [(statement, dict(entry, latencies=entry['latencies'][:min(entry['count'], self.window)]))
+                       for statement, entry in self.stats.items()]
+            plans = dict(self.plans)
+        for statement, entry in entries:
+            latencies = sorted(entry['latencies'])
+            rows.append({
+                'statement': statement,
+                'count': entry['count'],
+                'total_ms': entry['total'] * 1000,
+                'p50_ms': _percentile(latencies, 50) * 1000,
+                'p95_ms': _percentile(latencies, 95) * 1000,
+                'p99_ms': _percentile(latencies, 99) * 1000,
+                'rows': entry['rows'],
+                'plan': plans.get(statement, []),
+            })
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def report(self):
+        """Okunabilir profil raporu üretir.
+
+        Returns:
+            str: Rapor metni.
+        """
+        lines = [f"--- {self.name} SQL profili ---"]
+        for row in self.summary():
+            lines.append(f"{row['count']:>7} çağrı  toplam {row['total_ms']:9.2f} ms  "
+                         f"p50 {row['p50_ms']:7.3f}  p95 {row['p95_ms']:7.3f}  p99 {row['p99_ms']:7.3f} ms  "
+                         f"{row['rows']:>8} satır  {row['statement'][:100]}")
+            for detail in row['plan']:
+                lines.append(f"{'':>10}plan: {detail}")
+        return "\n".join(lines)
+
+    def reset(self):
+        """Toplanan istatistikleri temizler."""
+        with self._lock:
+            self.stats.clear()
+            self.plans.clear()
+
+class ProfiledCursor:
+    """sqlite3.Cursor çağrılarını ölçen sarmalayıcı."""
+
+    def __init__(self, cursor, profiler, connection):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._connection = connection
+        self._statement = None
+
+    def execute(self, sql, parameters=()):
+        statement = normalize_statement(sql)
+        self._profiler.capture_plan(self._connection, statement, sql, parameters)
+        start_time = time.perf_counter()
+        self._cursor.execute(sql, parameters)
+        self._profiler.record(statement, time.perf_counter() - start_time, self._cursor.rowcount)
+        self._statement = statement
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        statement = normalize_statement(sql)
+        seq_of_parameters = list(seq_of_parameters)
+        if seq_of_parameters:
+            self._profiler.capture_plan(self._connection, statement, sql, seq_of_parameters[0])
+        start_time = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_parameters)
+        self._profiler.record(statement, time.perf_counter() - start_time, self._cursor.rowcount)
+        self._statement = statement
+        return self
+
+    def fetchone(self):
+        start_time = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._profiler.record_fetch(self._statement, time.perf_counter() - start_time, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start_time = time.perf_counter()
+        rows = self._cursor.fetchmany(size or self._cursor.arraysize)
+        self._profiler.record_fetch(self._statement, time.perf_counter() - start_time, len(rows))
+        return rows
+
+    def fetchall(self):
+        start_time = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._profiler.record_fetch(self._statement, time.perf_counter() - start_time, len(rows))
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class ProfiledConnection:
+    """sqlite3.Connection sarmalayıcısı; cursor() ve execute() ölçülür, diğer her şey aynen iletilir."""
+
+    def __init__(self, connection, profiler):
+        """
+        Args:
+            connection (sqlite3.Connection): Sarılacak bağlantı.
+            profiler (SQLProfiler): Ölçümlerin kaydedileceği profil nesnesi.
+        """
+        self._connection = connection
+        self.profiler = profiler
+
+    def cursor(self):
+        return ProfiledCursor(self._connection.cursor(), self.profiler, self._connection)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Değişken dereceli (1-8) adaptif öğrenme modeli.
+Tüm derecelerin hata sayıları tek bir sonek ağacında (trie) tutulur: kökten
+itibaren en son sonuç, bir önceki sonuç... şeklinde inilir, böylece k. derinlikteki
+düğüm son k sonucun bağlamıdır. Bağlam, son max_order sonucun 2 bitlik desen
+anahtarından (HandFeatureStore.pattern_key) okunur; geçmiş listesi kesilmez. Kısa bağlamlar uzun bağlamların ortak önekidir,
+bellek sekiz ayrı tabloya göre çok daha azdır ve her el tek geçişte işlenir.
+"""
+from config import ADAPTIVE_MAX_ORDER, ADAPTIVE_MIN_SUPPORT
+from models.pattern_keys import CELL_BITS, CELL_CODES, CELL_MASK, CODE_CELLS, encode_sequence
+
+# Düğüm: [P hatası, B hatası, P çocuğu, B çocuğu]
+_P_WRONG, _B_WRONG, _P_CHILD, _B_CHILD = 0, 1, 2, 3
+_WRONG_INDEX = {'P': _P_WRONG, 'B': _B_WRONG}
+_CELL_CHILD_INDEX = {CELL_CODES['P']: _P_CHILD, CELL_CODES['B']: _B_CHILD}
+
+def _new_node():
+    return [0, 0, None, None]
+
+class VariableOrderAdaptiveModel:
+    """Yeterli desteği olan en uzun bağlama göre tahmin yapan, hatalardan öğrenen model."""
+
+    def __init__(self, max_order=ADAPTIVE_MAX_ORDER, min_support=ADAPTIVE_MIN_SUPPORT):
+        """
+        Args:
+            max_order (int, optional): En uzun bağlam uzunluğu.
+            min_support (int, optional): Bir bağlamın tahminde kullanılması için gereken en az hata sayısı.
+        """
+        self.max_order = max_order
+        self.min_support = min_support
+        self.current_shoe_id = 1
+        self.root = _new_node()
+        self.node_count = 1
+
+    def _context_nodes(self, context_key, create=False):
+        """Son sonuçlardan geriye doğru inerek 1..max_order derinlikteki düğümleri döndürür.
+
+        Args:
+            context_key (int): Son max_order sonucun desen anahtarı (en yeni sonuç en düşük hücrede).
+                Boş hücrede (geçmiş max_order'dan kısaysa) inilmez.
+            create (bool, optional): True ise eksik düğümler oluşturulur.
+
+        Returns:
+            list: Derinlik sırasıyla düğümler (en kısa bağlam başta).
+        """
+        nodes = []
+        node = self.root
+        for _ in range(self.max_order):
+            child_index = _CELL_CHILD_INDEX.get(context_key & CELL_MASK)
+            if child_index is None:
+                break
+            context_key >>= CELL_BITS
+            child = node[child_index]
+            if child is None:
+                if not create:
+                    break
+                child = node[child_index] = _new_node()
+                self.node_count += 1
+            nodes.append(child)
+            node = child
+        return nodes
+
+    def predict(self, history):
+        """Oyun geçmişine göre tahmin yapar.
+
+        Args:
+            history (list): Oyun geçmişi.
+
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        return self.predict_key(encode_sequence(history[-self.max_order:]))
+
+    def predict_key(self, context_key):
+        """Yeterli desteği olan en uzun bağlama göre tahmin yapar.
+
+        Desteği min_support'tan az olan ya da hataları eşit olan bağlamlarda
+        bir kısa bağlama geri çekilir (back-off).
+
+        Args:
+            context_key (int): Son max_order sonucun desen anahtarı
+                (HandFeatureStore.pattern_key(max_order)).
+
+        Returns:
+            str: Tahmin edilen değer ('P', 'B' veya '?').
+        """
+        for node in reversed(self._context_nodes(context_key)):
+            p_wrong, b_wrong = node[_P_WRONG], node[_B_WRONG]
+            if p_wrong + b_wrong < self.min_support or p_wrong == b_wrong:
+                continue
+            # En çok yanlış çıkan tahminin tersi
+            return 'B' if p_wrong > b_wrong else 'P'
+        return '?'
+
+    def update_from_result(self, history, prediction, actual_result):
+        """Oyun geçmişine göre hatayı kaydeder (bkz. update_from_key).
+
+        Args:
+            history (list): Tahmin anındaki oyun geçmişi.
+            prediction (str): Modelin tahmini ('P', 'B' veya '?').
+            actual_result (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        self.update_from_key(encode_sequence(history[-self.max_order:]), prediction, actual_result)
+
+    def update_from_key(self, context_key, prediction, actual_result):
+        """Tahmin hatalıysa hatayı tüm derecelere tek geçişte kaydeder.
+
+        Model tahmin yapamadıysa ('?') hatalar 'son sonucu takip et' tahmini
+        üzerinden öğrenilir; böylece model boş hafızadan başlayabilir.
+
+        Args:
+            context_key (int): Tahmin anındaki son max_order sonucun desen anahtarı.
+            prediction (str): Modelin tahmini ('P', 'B' veya '?').
+            actual_result (str): Gerçekleşen sonuç ('P' veya 'B').
+        """
+        if prediction not in _WRONG_INDEX:
+            # Son sonuç anahtarın en düşük hücresindedir; geçmiş boşsa 'X' döner
+            prediction = CODE_CELLS[context_key & CELL_MASK]
+        if prediction == actual_result or prediction not in _WRONG_INDEX:
+            return
+
+        wrong_index = _WRONG_INDEX[prediction]
+        for node in self._context_nodes(context_key, create=True):
+            node[wrong_index] += 1
+
+    def set_shoe_id(self, shoe_id):
+        """Yeni shoe'da hafızayı sıfırlar.
+
+        Args:
+            shoe_id (int): Yeni shoe ID'si.
+        """
+        if self.current_shoe_id == shoe_id:
+            return
+        self.current_shoe_id = shoe_id
+        self.clear_memory()
+
+    def clear_memory(self):
+        """Tüm bağlamları siler."""
+        self.root = _new_node()
+        self.node_count = 1
\ No newline at end of file
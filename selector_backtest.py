@@ -0,0 +1,137 @@
+"""
+Model seçicileri için geriye dönük test (backtest).
+Kayıtlı shoe'lar sırayla bellek içi bir PredictionModel üzerinden yeniden
+oynatılır; her elde tüm seçiciler aynı model tahminlerinden birini seçer.
+Raporda her modelin tahmin süreleri (p50/p99) de yer alır.
+Pişmanlık (regret), geriye bakıldığında en çok isabet eden tek modelin isabet
+sayısı ile seçicinin isabet sayısı arasındaki farktır. Kazanç/kayıp geçmişi
+yeniden oynatılmaz; WL'ye bağlı modeller tahmin yapmaz.
+"""
+import sqlite3
+from collections import defaultdict
+
+from config import DB_FILE, GRID_SIZE, MAX_HISTORY_IN_GRID
+from models.bitboard import BeadBitboard
+from models.database import connect_database
+from models.latency_tracker import format_latency_report
+from models.migrations import apply_migrations
+from models.model_selection import SELECTORS, create_selector
+from models.packed_storage import iter_shoe_results
+from models.prediction import PredictionModel
+from models.result_store import MemoryResultStore
+from models.roads import RoadEngine
+
+def backtest_selectors(shoes, selector_names=None, seed=None):
+    """Shoe'ları yeniden oynatarak seçicilerin isabet ve pişmanlıklarını hesaplar.
+
+    Args:
+        shoes (list): (shoe_id, 'P'/'B' sonuç listesi) çiftleri (eskiden yeniye).
+        selector_names (list, optional): Karşılaştırılacak seçiciler (varsayılan tümü).
+        seed (int, optional): Thompson seçicisinin rastgele sayı tohumu.
+
+    Returns:
+        dict: 'hands', 'best_model', 'best_model_wins', seçici adı -> {'wins', 'bets', 'regret'} sözlüğü
+            içeren 'selectors' ve model tahmin sürelerini içeren 'latency'.
+    """
+    selectors = {}
+    for name in selector_names or SELECTORS:
+        selectors[name] = create_selector(name, seed=seed) if name == 'thompson' else create_selector(name)
+    selector_wins = dict.fromkeys(selectors, 0)
+    selector_bets = dict.fromkeys(selectors, 0)
+    model_wins = defaultdict(int)
+    hands = 0
+
+    # Bellek içi veritabanı kullanılır; kayıtlı hata ve seçici tabloları değişmez
+    prediction_model = PredictionModel(table_id='backtest', in_memory=True, selector='argmax')
+    store = MemoryResultStore()
+    prediction_model.set_db_prediction_function(store.predict_from_history)
+    board = BeadBitboard(GRID_SIZE, GRID_SIZE, MAX_HISTORY_IN_GRID)
+    roads = RoadEngine()
+
+    try:
+        for index, (shoe_id, winners) in enumerate(shoes):
+            if index:
+                store.new_shoe_detected()
+            prediction_model.set_current_shoe_id(shoe_id)
+            history = []
+            board.clear()
+            roads.clear()
+
+            for winner in winners:
+                prediction_model.update_grid_data(board.to_grid(), board.copy(), roads)
+                predictions = prediction_model.get_predictions(history)
+
+                for name, selector in selectors.items():
+                    chosen = selector.select(predictions)
+                    if chosen and predictions[chosen] in ('P', 'B'):
+                        selector_bets[name] += 1
+                        if predictions[chosen] == winner:
+                            selector_wins[name] += 1
+                    selector.observe(predictions, winner)
+                for model_name, prediction in predictions.items():
+                    if prediction == winner:
+                        model_wins[model_name] += 1
+
+                prediction_model.update_model_accuracy(winner, predictions)
+                store.add_result(winner)
+                store.flush_buffer()
+                history.append(winner)
+                board.push(winner)
+                roads.add_result(winner)
+                hands += 1
+        latency = prediction_model.get_latency_summary()
+    finally:
+        prediction_model.close()
+
+    best_model = max(model_wins, key=model_wins.get) if model_wins else None
+    best_wins = model_wins[best_model] if best_model else 0
+    return {
+        'hands': hands,
+        'best_model': best_model,
+        'best_model_wins': best_wins,
+        'selectors': {
+            name: {'wins': selector_wins[name], 'bets': selector_bets[name], 'regret': best_wins - selector_wins[name]}
+            for name in selectors
+        },
+        'latency': latency,
+    }
+
+def run_selector_backtest(db_file=DB_FILE, max_shoes=None, selector_names=None, seed=None):
+    """Veritabanındaki shoe'larla seçicileri karşılaştırır ve sonuçları yazdırır.
+
+    Args:
+        db_file (str, optional): Sonuçların okunacağı veritabanı dosyası.
+        max_shoes (int, optional): Yalnızca son N shoe kullanılır (varsayılan tümü).
+        selector_names (list, optional): Karşılaştırılacak seçiciler (varsayılan tümü).
+        seed (int, optional): Thompson seçicisinin rastgele sayı tohumu.
+
+    Returns:
+        dict: backtest_selectors sonucu; veritabanı okunamazsa None.
+    """
+    try:
+        connection = connect_database(db_file)
+        try:
+            # Eski ya da yeni oluşturulmuş veritabanlarında shoe_results tablosu henüz olmayabilir
+            apply_migrations(connection)
+            shoes = list(iter_shoe_results(connection))
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Veritabanı hatası: {e}")
+        return None
+
+    if max_shoes:
+        shoes = shoes[-max_shoes:]
+    if not shoes:
+        print("Geriye dönük test için kayıtlı shoe bulunamadı.")
+        return None
+
+    report = backtest_selectors(shoes, selector_names, seed)
+    print(f"\n{len(shoes)} shoe, {report['hands']} el yeniden oynatıldı.")
+    print(f"Geriye bakıldığında en iyi model: {report['best_model']} ({report['best_model_wins']} isabet)")
+    print(f"{'Seçici':<10} {'İsabet':>8} {'Bahis':>8} {'Doğruluk':>10} {'Pişmanlık':>10}")
+    for name, result in report['selectors'].items():
+        accuracy = result['wins'] / result['bets'] * 100 if result['bets'] else 0.0
+        print(f"{name:<10} {result['wins']:>8} {result['bets']:>8} {accuracy:>9.2f}% {result['regret']:>10}")
+    print(format_latency_report(report['latency']))
+    return report
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+bbaccarat veritabanı için shoe arşivleme ve sıkıştırma işi.
+Eşikten eski shoe'lar shoe_archive_summary tablosunda tek satırlık özetlere
+indirgenir, ham satırları arşiv veritabanı dosyasına taşınır ve sıcak veritabanı
+artımlı VACUUM ile küçültülür.
+"""
+import json
+import sqlite3
+from collections import defaultdict
+
+from config import DB_FILE, DB_LOOKBACK, ARCHIVE_DB_FILE, COMPACTION_KEEP_SHOES
+from models.migrations import apply_migrations
+from models.packed_storage import unpack_outcomes
+
+# shoe_id'ye göre arşive taşınan tablolar
+ARCHIVED_TABLES = ['results', 'shoe_results', 'adaptive_learning', 'grid_mistake_patterns', 'shoe_pattern_counts']
+
+def summarize_shoe(winners, lookback=DB_LOOKBACK):
+    """Bir shoe'nun sonuçlarından özet değerleri hesaplar.
+
+    Args:
+        winners (list): 'P' veya 'B' değerlerinden oluşan sonuçlar.
+        lookback (int, optional): Desen sayımlarında kullanılacak desen uzunluğu.
+
+    Returns:
+        dict: El sayısı, P/B sayıları, en uzun seriler ve desen sayımları.
+    """
+    longest = {'P': 0, 'B': 0}
+    run_winner, run_length = None, 0
+    pattern_counts = defaultdict(lambda: {'P': 0, 'B': 0})
+
+    for i, winner in enumerate(winners):
+        run_length = run_length + 1 if winner == run_winner else 1
+        run_winner = winner
+        if winner in longest:
+            longest[winner] = max(longest[winner], run_length)
+        if i >= lookback and winner in ('P', 'B'):
+            pattern_counts["".join(winners[i - lookback:i])][winner] += 1
+
+    return {
+        'hands': len(winners),
+        'player_count': winners.count('P'),
+        'banker_count': winners.count('B'),
+        'longest_p_run': longest['P'],
+        'longest_b_run': longest['B'],
+        'pattern_counts': dict(pattern_counts),
+    }
+
+def _load_shoe_winners(cursor, shoe_id):
+    """Shoe sonuçlarını el başına satır ya da paketlenmiş düzenden okur."""
+    cursor.execute("SELECT winner FROM results WHERE shoe_id = ? ORDER BY id", (shoe_id,))
+    winners = [row[0] for row in cursor.fetchall()]
+    if winners:
+        return winners
+
+    cursor.execute("SELECT outcomes, hand_count FROM shoe_results WHERE shoe_id = ?", (shoe_id,))
+    row = cursor.fetchone()
+    return unpack_outcomes(bytes(row[0]), row[1]) if row else []
+
+def _select_shoes_to_archive(cursor, keep_recent_shoes, older_than_days):
+    """Arşivlenecek shoe ID'lerini belirler; mevcut shoe hiçbir zaman arşivlenmez."""
+    cursor.execute("SELECT MAX(shoe_id) FROM shoe_tracker")
+    result = cursor.fetchone()
+    if not result or result[0] is None:
+        return []
+    threshold = result[0] - max(1, keep_recent_shoes)
+
+    query = """
+        SELECT t.shoe_id, t.start_timestamp FROM shoe_tracker t
+        WHERE t.shoe_id <= ?
+          AND NOT EXISTS (SELECT 1 FROM shoe_archive_summary s WHERE s.shoe_id = t.shoe_id)
+    """
+    params = [threshold]
+    if older_than_days is not None:
+        query += " AND t.start_timestamp < datetime('now', ?)"
+        params.append(f"-{int(older_than_days)} days")
+
+    cursor.execute(query + " ORDER BY t.shoe_id", params)
+    return cursor.fetchall()
+
+def _find_archive_conflicts(cursor):
+    """Arşivde aynı shoe_id ile satırı bulunan aday shoe'ları döndürür.
+
+    Sıfırlama sonrası shoe numaraları yeniden kullanıldığında eski arşiv satırları
+    UNIQUE kısıtlarıyla çakışır; bu shoe'lar taşınmaz, sıcak veritabanında kalır.
+    """
+    conflicts = set()
+    for table in ARCHIVED_TABLES + ['shoe_archive_summary']:
+        cursor.execute(f"""
+            SELECT DISTINCT shoe_id FROM archive.{table}
+            WHERE shoe_id IN (SELECT shoe_id FROM compaction_shoes)
+        """)
+        conflicts.update(row[0] for row in cursor.fetchall())
+    return conflicts
+
+def _subtract_pattern_aggregates(cursor):
+    """Taşınan shoe'ların ağırlıklı katkısını pattern_aggregates özetinden düşer."""
+    cursor.execute("SELECT reference_shoe_id, decay FROM main.pattern_aggregate_meta WHERE id = 1")
+    meta = cursor.fetchone()
+    if meta is None:
+        return
+    reference_shoe_id, decay = meta
+
+    cursor.execute("""
+        SELECT shoe_id, pattern, next_winner, count FROM main.shoe_pattern_counts
+        WHERE shoe_id IN (SELECT shoe_id FROM compaction_shoes)
+    """)
+    removed = defaultdict(float)
+    for shoe_id, pattern, next_winner, count in cursor.fetchall():
+        removed[(pattern, next_winner)] += count * decay ** max(0, reference_shoe_id - shoe_id)
+
+    cursor.executemany("""
+        UPDATE main.pattern_aggregates SET weighted_count = MAX(0.0, weighted_count - ?)
+        WHERE pattern = ? AND next_winner = ?
+    """, [(weight, pattern, next_winner) for (pattern, next_winner), weight in removed.items()])
+    cursor.execute("DELETE FROM main.pattern_aggregates WHERE weighted_count < 1e-9")
+
+def _enable_incremental_vacuum(connection):
+    """auto_vacuum modunu INCREMENTAL yapar; mevcut dosyalarda bir kez tam VACUUM gerekir."""
+    if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("VACUUM")
+
+def compact_database(keep_recent_shoes=COMPACTION_KEEP_SHOES, older_than_days=None,
+                     db_file=DB_FILE, archive_file=ARCHIVE_DB_FILE):
+    """Eski shoe'ları özetler, ham satırlarını arşive taşır ve veritabanını küçültür.
+
+    Args:
+        keep_recent_shoes (int, optional): Sıcak veritabanında bırakılacak son shoe sayısı.
+        older_than_days (int, optional): Yalnızca bu kadar günden eski shoe'ları arşivle.
+        db_file (str, optional): Sıcak veritabanı dosyası.
+        archive_file (str, optional): Arşiv veritabanı dosyası.
+
+    Returns:
+        int: Arşivlenen shoe sayısı.
+    """
+    # Arşiv dosyası aynı göçlerle oluşturulur, böylece şemalar her zaman eşleşir
+    archive_connection = sqlite3.connect(archive_file)
+    apply_migrations(archive_connection)
+    archive_connection.close()
+
+    connection = sqlite3.connect(db_file)
+    apply_migrations(connection)
+    cursor = connection.cursor()
+
+    shoes = _select_shoes_to_archive(cursor, keep_recent_shoes, older_than_days)
+    if not shoes:
+        print("Arşivlenecek shoe bulunamadı.")
+        connection.close()
+        return 0
+
+    try:
+        cursor.execute("ATTACH DATABASE ? AS archive", (archive_file,))
+        cursor.execute("BEGIN")
+        cursor.execute("CREATE TEMP TABLE compaction_shoes (shoe_id INTEGER PRIMARY KEY)")
+        cursor.executemany("INSERT INTO compaction_shoes (shoe_id) VALUES (?)", [(shoe_id,) for shoe_id, _ in shoes])
+
+        conflicts = _find_archive_conflicts(cursor)
+        if conflicts:
+            print(f"Uyarı: {len(conflicts)} shoe arşivde aynı ID ile zaten var, taşınmadı: "
+                  f"{', '.join(str(shoe_id) for shoe_id in sorted(conflicts))}")
+            cursor.executemany("DELETE FROM compaction_shoes WHERE shoe_id = ?", [(shoe_id,) for shoe_id in conflicts])
+            shoes = [shoe for shoe in shoes if shoe[0] not in conflicts]
+
+        for shoe_id, start_timestamp in shoes:
+            summary = summarize_shoe(_load_shoe_winners(cursor, shoe_id))
+            cursor.execute("SELECT COALESCE(SUM(frequency), 0) FROM adaptive_learning WHERE shoe_id = ?", (shoe_id,))
+            mistake_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COALESCE(SUM(frequency), 0) FROM grid_mistake_patterns WHERE shoe_id = ?", (shoe_id,))
+            grid_mistake_count = cursor.fetchone()[0]
+
+            row = (shoe_id, start_timestamp, summary['hands'], summary['player_count'],
+                   summary['banker_count'], summary['longest_p_run'], summary['longest_b_run'],
+                   json.dumps(summary['pattern_counts'], sort_keys=True), mistake_count, grid_mistake_count)
+            for target in ('main', 'archive'):
+                # Çakışma olursa işlem geri alınır; önceki özetin üzerine yazılmaz
+                cursor.execute(f"""
+                    INSERT INTO {target}.shoe_archive_summary
+                    (shoe_id, start_timestamp, hands, player_count, banker_count, longest_p_run,
+                     longest_b_run, pattern_counts, mistake_count, grid_mistake_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, row)
+
+        # Taşınan shoe'ların desen sayımları yakınlık ağırlıklı özetten de çıkarılır
+        _subtract_pattern_aggregates(cursor)
+
+        for table in ARCHIVED_TABLES:
+            # id kolonları arşivde yeniden üretilir; sıfırlama sonrası çakışma olmaz
+            cursor.execute(f"PRAGMA main.table_info({table})")
+            columns = ", ".join(column[1] for column in cursor.fetchall() if column[1] != 'id')
+            order = "ORDER BY id" if table in ('results', 'adaptive_learning', 'grid_mistake_patterns') else ""
+            cursor.execute(f"SELECT COUNT(*) FROM main.{table} WHERE shoe_id IN (SELECT shoe_id FROM compaction_shoes)")
+            expected = cursor.fetchone()[0]
+            cursor.execute(f"""
+                INSERT INTO archive.{table} ({columns})
+                SELECT {columns} FROM main.{table}
+                WHERE shoe_id IN (SELECT shoe_id FROM compaction_shoes) {order}
+            """)
+            # Satırlar ancak hepsi arşive yazıldıysa silinir
+            if cursor.rowcount != expected:
+                raise sqlite3.DatabaseError(f"{table}: {expected} satırdan {cursor.rowcount} satır arşive yazıldı")
+            cursor.execute(f"DELETE FROM main.{table} WHERE shoe_id IN (SELECT shoe_id FROM compaction_shoes)")
+
+        connection.commit()
+    except sqlite3.Error as e:
+        connection.rollback()
+        connection.close()
+        print(f"Sıkıştırma hatası: {e}")
+        return 0
+
+    cursor.execute("DROP TABLE temp.compaction_shoes")
+    cursor.execute("DETACH DATABASE archive")
+
+    # Boşalan sayfalar dosyadan geri verilir
+    _enable_incremental_vacuum(connection)
+    connection.execute("PRAGMA incremental_vacuum")
+    connection.execute("ANALYZE")
+    connection.commit()
+    connection.close()
+
+    print(f"{len(shoes)} shoe özetlendi ve '{archive_file}' arşivine taşındı.")
+    return len(shoes)
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+ShardRouter testleri: masalar ayrı dosyalarda açılır, farklı masalara yazmalar
+birbirini beklemez ve LRU ile kapatılan masaların tamponları kaybolmaz.
+"""
+import threading
+
+import pytest
+
+from models.shard_router import ShardRouter
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    # Masa veritabanı dosyaları çalışma klasöründe oluşturulur
+    monkeypatch.chdir(tmp_path)
+    router = ShardRouter(max_open=2)
+    yield router
+    router.close_all()
+
+def _write_hands(router, table_id, winners, start):
+    start.wait(timeout=5)
+    for winner in winners:
+        router.add_result(table_id, winner)
+    router.flush_table(table_id)
+
+def test_two_tables_write_at_the_same_time(router):
+    sequences = {1: list("PBPPBBPB" * 25), 2: list("BBPBPPPB" * 25)}
+    start = threading.Barrier(len(sequences))
+    writers = [threading.Thread(target=_write_hands, args=(router, table_id, winners, start))
+               for table_id, winners in sequences.items()]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(timeout=30)
+    assert not any(writer.is_alive() for writer in writers)
+
+    for table_id, winners in sequences.items():
+        with router.table(table_id) as shard:
+            assert shard.results.get_current_shoe_results() == winners
+
+def test_locked_table_does_not_block_other_table(router):
+    router.add_result(2, 'P')
+    done = threading.Event()
+
+    def write_other_table():
+        router.add_result(2, 'B')
+        router.flush_table(2)
+        done.set()
+
+    # Masa 1'in kilidi tutulurken masa 2'ye yazma tamamlanmalıdır
+    with router.table(1):
+        writer = threading.Thread(target=write_other_table)
+        writer.start()
+        assert done.wait(timeout=10)
+    writer.join()
+
+    with router.table(2) as shard:
+        assert shard.results.get_current_shoe_results() == ['P', 'B']
+
+def test_flush_all_writes_every_open_table(router):
+    router.add_result(1, 'P')
+    router.add_result(2, 'B')
+    router.flush_all()
+
+    for table_id, expected in ((1, ['P']), (2, ['B'])):
+        with router.table(table_id) as shard:
+            assert shard.results.get_current_shoe_results() == expected
+
+def test_least_recently_used_table_is_closed_and_flushed(router):
+    router.add_result(1, 'B')
+    router.add_result(2, 'P')
+    router.add_result(3, 'P')
+    assert router.open_tables() == [2, 3]
+
+    # Kapatılan masanın tamponu yazılmıştır; yeniden açılınca sonuç okunur
+    with router.table(1) as shard:
+        assert shard.results.get_current_shoe_results() == ['B']
+
+def test_shard_models_follow_the_table(router):
+    for winner in "PBPBPBPB":
+        router.add_result(1, winner)
+    router.new_shoe_detected(1)
+    for winner in "PBPB":
+        router.add_result(1, winner)
+
+    with router.table(1) as shard:
+        assert shard.cross_shoe.current_shoe_id == shard.results.current_shoe_id == 2
+    # Önceki shoe'daki PBPB -> P geçişleri yeni shoe'da kullanılır
+    assert router.predict(1)['Çapraz Shoe'] == 'P'
+
+def _stored_aggregates(cross_shoe):
+    cursor = cross_shoe.connection.cursor()
+    cursor.execute("SELECT pattern, next_winner, weighted_count FROM pattern_aggregates")
+    return {(pattern, winner): weight for pattern, winner, weight in cursor.fetchall()}
+
+def test_cross_shoe_counts_are_written_with_the_table_flush(router):
+    for winner in "PBPBPBPB":
+        router.add_result(1, winner)
+    with router.table(1) as shard:
+        # Sayımlar hafızadadır, veritabanına henüz yazılmamıştır
+        assert shard.cross_shoe.predict("PBPB") == 'P'
+        assert _stored_aggregates(shard.cross_shoe) == {}
+
+    router.new_shoe_detected(1)
+    for winner in "PBPBB":
+        router.add_result(1, winner)
+    router.flush_table(1)
+
+    with router.table(1) as shard:
+        cross_shoe = shard.cross_shoe
+        stored = _stored_aggregates(cross_shoe)
+        expected = {(pattern, winner): weight for pattern, counts in cross_shoe.aggregates.items()
+                    for winner, weight in counts.items() if weight > 0}
+        assert stored == pytest.approx(expected)
+        # Önceki shoe'nun sayımları bir kez sönümlenmiştir, yeni shoe'nunkiler tam ağırlıktadır
+        assert stored[("PBPB", 'P')] == pytest.approx(2 * cross_shoe.decay)
+        assert stored[("PBPB", 'B')] == pytest.approx(1.0)
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Sonuç deposu arka uçları için uyumluluk testleri.
+Her arka uç aynı senaryolardan geçirilir; MainWindow ve PredictionModel'in
+dayandığı davranışların (sıralı okuma, desen araması, shoe geçişi, temizleme
+ve kalıcılık) tüm depolarda aynı olduğu doğrulanır.
+"""
+import pytest
+
+from models.result_store import RESULT_STORE_BACKENDS, ResultStore, create_result_store
+
+SEQUENCE = list("PBPBPBPBBP")
+
+@pytest.fixture(params=RESULT_STORE_BACKENDS)
+def open_store(request, tmp_path):
+    """Arka ucu geçici klasördeki dosyalarla açan işlevi döndürür; açılan depolar test sonunda kapatılır."""
+    backend = request.param
+    opened = []
+
+    def _open():
+        if backend == 'sqlite':
+            store = create_result_store(backend, db_file=str(tmp_path / 'conformance.db'))
+        elif backend == 'binlog':
+            store = create_result_store(backend, log_file=str(tmp_path / 'conformance.binlog'))
+        else:
+            store = create_result_store(backend)
+        opened.append(store)
+        return store
+
+    yield _open
+    for store in opened:
+        store.close()
+
+def _reopen(open_store, store):
+    store.close()
+    return open_store()
+
+def test_new_store_is_empty(open_store):
+    store = open_store()
+    assert isinstance(store, ResultStore)
+    assert store.current_shoe_id == 1
+    assert store.get_current_shoe_results() == []
+
+def test_results_are_read_in_insertion_order(open_store):
+    store = open_store()
+    for winner in SEQUENCE:
+        store.add_result(winner, True, 1000.0)
+    store.flush_buffer()
+    assert store.get_current_shoe_results() == SEQUENCE
+
+    # Boş tampon yazmak veriyi değiştirmez
+    store.flush_buffer()
+    assert store.get_current_shoe_results() == SEQUENCE
+
+def test_pattern_lookup(open_store):
+    store = open_store()
+    for winner in SEQUENCE:
+        store.add_result(winner)
+    store.flush_buffer()
+
+    # PBPB'den sonra iki kez P, bir kez B geldi
+    assert store.predict_from_history(list("PBPB")) == 'P'
+    assert store.predict_from_history(list("BBBB")) == '?'
+    assert store.predict_from_history(list("PB")) == '?'
+
+def test_new_shoe_keeps_results_apart(open_store):
+    store = open_store()
+    for winner in SEQUENCE:
+        store.add_result(winner)
+    store.flush_buffer()
+
+    store.new_shoe_detected()
+    assert store.current_shoe_id == 2
+    assert store.get_current_shoe_results() == []
+    store.add_result('B')
+    store.add_result('P')
+    store.flush_buffer()
+    assert store.get_current_shoe_results() == ['B', 'P']
+
+def test_close_flushes_and_reopen_restores_shoe(open_store):
+    store = open_store()
+    if not store.durable:
+        pytest.skip("bellek içi depo kalıcı değildir")
+    store.add_result('P')
+    store.flush_buffer()
+    store.new_shoe_detected()
+    store.add_result('B')
+    store.flush_buffer()
+    store.add_result('P')
+
+    store = _reopen(open_store, store)
+    assert store.current_shoe_id == 2
+    assert store.get_current_shoe_results() == ['B', 'P']
+
+def test_clear_current_shoe(open_store):
+    store = open_store()
+    store.add_result('P')
+    store.flush_buffer()
+    store.new_shoe_detected()
+    store.add_result('B')
+    store.flush_buffer()
+
+    assert store.clear_current_shoe_data()
+    assert store.get_current_shoe_results() == []
+    assert store.current_shoe_id == 2
+
+    if store.durable:
+        store = _reopen(open_store, store)
+        assert (store.current_shoe_id, store.get_current_shoe_results()) == (2, [])
+
+def test_clear_table_resets_shoe_id(open_store):
+    store = open_store()
+    store.add_result('P')
+    store.flush_buffer()
+    store.new_shoe_detected()
+    store.add_result('B')
+
+    assert store.clear_table()
+    assert store.current_shoe_id == 1
+    assert store.get_current_shoe_results() == []
+    store.add_result('P')
+    store.flush_buffer()
+    assert store.get_current_shoe_results() == ['P']
+
+    if store.durable:
+        store = _reopen(open_store, store)
+        assert (store.current_shoe_id, store.get_current_shoe_results()) == (1, ['P'])
+
+@pytest.mark.parametrize('backend', [backend for backend in RESULT_STORE_BACKENDS if backend != 'sqlite'])
+def test_first_shoe_id_continues_numbering(backend, tmp_path):
+    # SQLite dışındaki depolar tahmin veritabanındaki son shoe'dan devam eder
+    kwargs = {'log_file': str(tmp_path / 'seeded.binlog')} if backend == 'binlog' else {}
+    store = create_result_store(backend, first_shoe_id=7, **kwargs)
+    try:
+        assert store.current_shoe_id == 7
+        store.new_shoe_detected()
+        assert store.current_shoe_id == 8
+    finally:
+        store.close()
+
+    if backend == 'binlog':
+        store = create_result_store(backend, first_shoe_id=1, **kwargs)
+        try:
+            assert store.current_shoe_id == 8
+        finally:
+            store.close()
\ No newline at end of file
@@ -129,6 +129,40 @@ class ModelDetailsWindow(QDialog):
             model_layout.addWidget(lbl_acc, 2, 0)
             model_layout.addWidget(val_acc, 2, 1, Qt.AlignmentFlag.AlignRight)
             
+            # Son tahminlerdeki ve sönümlü başarı oranları
+            tracker = model.get('tracker')
+            if tracker:
+                lbl_recent = QLabel(f"Son {' / '.join(str(w) for w in tracker.windows)}:")
+                lbl_recent.setObjectName("DetailLabel")
+                val_recent = QLabel(" / ".join(f"{tracker.window_accuracy(w):.1f}%" for w in tracker.windows))
+                val_recent.setObjectName("DetailValue")
+                model_layout.addWidget(lbl_recent, 3, 0)
+                model_layout.addWidget(val_recent, 3, 1, Qt.AlignmentFlag.AlignRight)
+                
+                lbl_decayed = QLabel("Sönümlü Başarı:")
+                lbl_decayed.setObjectName("DetailLabel")
+                val_decayed = QLabel(f"{tracker.decayed_accuracy():.1f}%")
+                val_decayed.setObjectName("DetailValue")
+                model_layout.addWidget(lbl_decayed, 4, 0)
+                model_layout.addWidget(val_decayed, 4, 1, Qt.AlignmentFlag.AlignRight)
+
+            # Tahmin süreleri (son ölçümlerin p50 / p99 değerleri)
+            latency = model.get('latency')
+            if latency and latency.count:
+                lbl_latency = QLabel("Tahmin Süresi (p50 / p99):")
+                lbl_latency.setObjectName("DetailLabel")
+                val_latency = QLabel(f"{latency.percentile(50):.1f} / {latency.percentile(99):.1f} µs")
+                val_latency.setObjectName("DetailValue")
+                model_layout.addWidget(lbl_latency, 5, 0)
+                model_layout.addWidget(val_latency, 5, 1, Qt.AlignmentFlag.AlignRight)
+
+                lbl_calls = QLabel("Tahmin Çağrısı:")
+                lbl_calls.setObjectName("DetailLabel")
+                val_calls = QLabel(str(latency.count))
+                val_calls.setObjectName("DetailValue")
+                model_layout.addWidget(lbl_calls, 6, 0)
+                model_layout.addWidget(val_calls, 6, 1, Qt.AlignmentFlag.AlignRight)
+
             self.scroll_layout.addWidget(model_group)
             
         self.scroll_layout.addStretch(1)
\ No newline at end of file
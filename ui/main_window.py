@@ -5,7 +5,7 @@ import sys
 import random
 from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QMessageBox
 from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
 from config import WINDOW_TITLE, INITIAL_KASA, DB_WRITE_INTERVAL
 from ui.panels.left_panel import LeftPanel
@@ -109,7 +109,10 @@ class MainWindow(QMainWindow):
         self.wl_weight_timer.start(60000)  # Her 1 dakikada bir
         
         # Arayüz ayarları
-        self.setWindowTitle(WINDOW_TITLE)
+        if getattr(db_manager, 'table_id', None) is not None:
+            self.setWindowTitle(f"{WINDOW_TITLE} - Masa {db_manager.table_id}")
+        else:
+            self.setWindowTitle(WINDOW_TITLE)
         self.resize(950, 650)
         
         self.modern_font = get_modern_font()
@@ -152,6 +155,11 @@ class MainWindow(QMainWindow):
         self.left_panel.action_buttons["reset"].clicked.connect(self.reset_all)
         self.left_panel.action_buttons["simulate"].clicked.connect(self.toggle_simulation)
         self.left_panel.action_buttons["stats"].clicked.connect(self.open_model_details_window)
+        
+        # Bellek içi veritabanı için isteğe bağlı anlık görüntü
+        if getattr(self.db_manager, 'in_memory', False):
+            self.snapshot_shortcut = QShortcut(QKeySequence("Ctrl+S"), self)
+            self.snapshot_shortcut.activated.connect(self.db_manager.snapshot)
     
     def add_result(self, winner):
         """Yeni bir sonuç ekler.
@@ -159,17 +167,8 @@ class MainWindow(QMainWindow):
         Args:
             winner (str): Kazananı temsil eden 'P' veya 'B' değeri.
         """
-        # Desen türünü belirle
-        pattern_type = "mixed"
-        if len(self.game_history.win_loss_history) >= 4:
-            last_four = self.game_history.win_loss_history[-4:]
-            
-            # Streak (WWWW veya LLLL)
-            if all(x == 'W' for x in last_four) or all(x == 'L' for x in last_four):
-                pattern_type = "streak"
-            # Alternating (WLWL veya LWLW)
-            elif (last_four == ['W', 'L', 'W', 'L'] or last_four == ['L', 'W', 'L', 'W']):
-                pattern_type = "alternating"
+        # Desen türü (streak, alternating, mixed) özellik deposundan okunur
+        pattern_type = self.game_history.features.wl_pattern_type
         
         # Mevcut tahmini al
         current_prediction, should_reverse_bet = self.get_current_prediction()
@@ -213,7 +212,7 @@ class MainWindow(QMainWindow):
             self.pause_simulation = False
         
         # Veritabanına ekle
-        self.db_manager.add_result(winner)
+        self.db_manager.add_result(winner, is_win, self.game_history.kasa)
         
         # Model doğruluk oranlarını güncelle
         self.prediction_model.update_model_accuracy(winner, model_predictions)
@@ -238,16 +237,7 @@ class MainWindow(QMainWindow):
             tuple: (prediction, should_reverse_bet) - Tahmin değeri ('P', 'B' veya '?') ve ters bahis yapılıp yapılmayacağı.
         """
         # Önce desen türünü belirle
-        pattern_type = "mixed"
-        if len(self.game_history.win_loss_history) >= 4:
-            last_four = self.game_history.win_loss_history[-4:]
-            
-            # Streak (WWWW veya LLLL)
-            if all(x == 'W' for x in last_four) or all(x == 'L' for x in last_four):
-                pattern_type = "streak"
-            # Alternating (WLWL veya LWLW)
-            elif (last_four == ['W', 'L', 'W', 'L'] or last_four == ['L', 'W', 'L', 'W']):
-                pattern_type = "alternating"
+        pattern_type = self.game_history.features.wl_pattern_type
         
         # WL based prediction with possible reverse bet, desen türünü de geçir
         prediction, should_reverse_bet = self.prediction_model.get_best_model_prediction(
@@ -261,6 +251,8 @@ class MainWindow(QMainWindow):
     def flush_db_buffer(self):
         """Veritabanı tamponunu temizler."""
         self.db_manager.flush_buffer()
+        # Shoe'lar arası desen sayımları sonuçlarla aynı aralıkta yazılır
+        self.prediction_model.flush_writes()
     
     def update_wl_weights(self):
         """WL tahmin ağırlıklarını günceller."""
@@ -279,6 +271,8 @@ class MainWindow(QMainWindow):
                 stats['vertical_wl_accuracy'] / 100.0,
                 momentum=0.7
             )
+        # WL ağırlıkları değişti, önbellekteki WL kararları geçersiz
+        self.prediction_model.invalidate_predictions()
     
     def toggle_simulation(self):
         """Simülasyonu başlatır veya durdurur."""
@@ -341,15 +335,15 @@ class MainWindow(QMainWindow):
         
         if confirm == QMessageBox.StandardButton.Yes:
             self.game_history.reset()
-            self.prediction_model.reset_models()
+            self.prediction_model.reset_models(clear_all=True)
             
             # Tüm veritabanı verilerini temizle
             if self.db_manager:
                 self.db_manager.clear_table()
                 
-            # Adaptif model için de shoe ID'yi sıfırla
+            # Adaptif model için de shoe ID'yi sıfırla (shoe'lar arası sayımlar da silinir)
             if hasattr(self.prediction_model, 'set_current_shoe_id'):
-                self.prediction_model.set_current_shoe_id(1)
+                self.prediction_model.set_current_shoe_id(1, reset=True)
                 
             # Simülasyon değişkenlerini sıfırla
             self.current_hand_in_shoe = 0
@@ -388,31 +382,29 @@ class MainWindow(QMainWindow):
         
         # Bahis yapılıp yapılmayacağını belirle
         if self.pause_simulation:
-            # Bahis yapmadan devam et
-            self.game_history.history.append(winner)
-            self.game_history._rebuild_grid_from_history()
+            # Bahis yapmadan devam et; sayım tabanlı modeller izlenen eli de öğrenir
+            self.prediction_model.observe_result(self.game_history.history, winner)
+            self.game_history.add_result(winner)
             # Veritabanına ekle
-            self.db_manager.add_result(winner)
+            self.db_manager.add_result(winner, None, self.game_history.kasa)
             # UI'yi güncelle
             self._full_ui_update()
             print(f"Simülasyon: El #{self.current_hand_in_shoe} - Sonuç: {winner} - Bahis yapılmıyor (izleme modu)")
         else:
             # Desen türünü belirle
-            pattern_type = "mixed"
-            if len(self.game_history.win_loss_history) >= 4:
-                last_four = self.game_history.win_loss_history[-4:]
-                
-                # Streak (WWWW veya LLLL)
-                if all(x == 'W' for x in last_four) or all(x == 'L' for x in last_four):
-                    pattern_type = "streak"
-                # Alternating (WLWL veya LWLW)
-                elif (last_four == ['W', 'L', 'W', 'L'] or last_four == ['L', 'W', 'L', 'W']):
-                    pattern_type = "alternating"
+            pattern_type = self.game_history.features.wl_pattern_type
             
             # Bahis yaparak devam et
             # Mevcut tahmini al (ve ters bahis yapılıp yapılmayacağını)
             current_prediction, should_reverse_bet = self.get_current_prediction()
             
+            # Tüm modellerin tahminlerini sonuç eklenmeden önce topla; modeller
+            # (Çapraz Shoe, Markov, seçici) bu elin durumundan öğrenir
+            model_predictions = self.prediction_model.get_predictions(
+                self.game_history.history,
+                self.game_history.win_loss_history
+            )
+            
             # WL tahminlerini kaydet
             self.game_history.set_wl_predictions(
                 self.prediction_model.wl_model.last_horizontal_pred,
@@ -429,13 +421,7 @@ class MainWindow(QMainWindow):
             result_info = self.game_history.add_result(winner, is_win, should_reverse_bet)
             
             # Veritabanına ekle
-            self.db_manager.add_result(winner)
-            
-            # Tüm modellerin tahminlerini topla
-            model_predictions = self.prediction_model.get_predictions(
-                self.game_history.history,
-                self.game_history.win_loss_history
-            )
+            self.db_manager.add_result(winner, is_win, self.game_history.kasa)
             
             # Model doğruluk oranlarını güncelle
             self.prediction_model.update_model_accuracy(winner, model_predictions)
@@ -471,7 +457,9 @@ class MainWindow(QMainWindow):
     def _full_ui_update(self):
         """Tüm arayüzü günceller."""
         # Grid verilerini güncelle
-        self.prediction_model.update_grid_data(self.game_history.grid_data)
+        # Bitboard'un kopyası verilir; GameHistory sonraki elde kendi maskelerini günceller
+        self.prediction_model.update_grid_data(self.game_history.grid_data, self.game_history.bead_board.copy(),
+                                               self.game_history.roads)
         
         # Sol panel güncellemeleri
         stats = self.game_history.get_statistics()
@@ -498,6 +486,7 @@ class MainWindow(QMainWindow):
         # Sağ panel güncellemeleri
         self.right_panel.update_result_grid(self.game_history.grid_data)
         self.right_panel.update_wl_grid(self.game_history.win_loss_history)
+        self.right_panel.update_roads(self.game_history.roads)
         self.right_panel.update_models(self.prediction_model.models)
     
     def closeEvent(self, event):
@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from config import WL_GRID_ROWS, WL_GRID_COLS, MAX_WL_DISPLAY
 from ui.widgets.grid_display import ResultGridWidget, WinLossGridWidget
+from ui.widgets.road_display import RoadsWidget
 
 class ModelStatRowWidget(QWidget):
     """Model istatistik satırını gösteren widget."""
@@ -46,12 +47,8 @@ class ModelStatWidget(QWidget):
             self.layout.addWidget(row)
     
     def update_models(self, models, min_predictions=5):
-        # Yeterli tahmini olan modelleri sırala
-        ranked_models = sorted(
-            [m for m in models if m['total'] >= min_predictions],
-            key=lambda m: m['accuracy'],
-            reverse=True
-        )
+        # Yeterli tahmini olan ilk modeller (sıralama artımlı tutulur)
+        ranked_models = models.top(len(self.model_rows), min_predictions)
         
         # Model satırlarını güncelle
         for i, row in enumerate(self.model_rows):
@@ -80,6 +77,7 @@ class RightPanel(QWidget):
         self.model_stat_widget = None
         self.result_grid_widget = None
         self.wl_grid_widget = None
+        self.roads_widget = None
         
         self._init_ui()
     
@@ -87,6 +85,7 @@ class RightPanel(QWidget):
         """Kullanıcı arayüzünü başlatır."""
         self._create_model_stats_ui()
         self._create_results_history_ui()
+        self._create_roads_ui()
         
         # Alt boşluk ekle
         self.layout.addStretch(1)
@@ -146,11 +145,22 @@ class RightPanel(QWidget):
         
         self.layout.addWidget(results_group_box)
     
+    def _create_roads_ui(self):
+        """Big Road ve türetilmiş yollar bölümünü oluşturur."""
+        roads_group_box = QGroupBox("Yollar")
+        roads_layout = QVBoxLayout(roads_group_box)
+        roads_layout.setContentsMargins(10, 10, 10, 10)
+        
+        self.roads_widget = RoadsWidget()
+        roads_layout.addWidget(self.roads_widget)
+        
+        self.layout.addWidget(roads_group_box)
+    
     def update_models(self, models, min_predictions=5):
         """Model istatistiklerini günceller.
         
         Args:
-            models (list): Model verileri listesi.
+            models (ModelLeaderboard): Sıralamayı tutan model listesi.
             min_predictions (int, optional): Minimum tahmin sayısı.
         """
         self.model_stat_widget.update_models(models, min_predictions)
@@ -169,4 +179,12 @@ class RightPanel(QWidget):
         Args:
             wl_history (list): Kazanma/Kaybetme geçmişi.
         """
-        self.wl_grid_widget.update_display(wl_history, MAX_WL_DISPLAY)
\ No newline at end of file
+        self.wl_grid_widget.update_display(wl_history, MAX_WL_DISPLAY)
+    
+    def update_roads(self, roads):
+        """Big Road ve türetilmiş yol ızgaralarını günceller.
+        
+        Args:
+            roads (RoadEngine): GameHistory'nin yol motoru.
+        """
+        self.roads_widget.update_roads(roads)
\ No newline at end of file
@@ -1,4 +1,5 @@
 # ui/widgets/__init__.py
 from ui.widgets.grid_display import ResultGridWidget, WinLossGridWidget
 from ui.widgets.prediction_view import PredictionLabel
+from ui.widgets.road_display import RoadGridWidget, RoadsWidget
 from ui.widgets.stat_widgets import KasaStatWidget, TableStatWidget, ModelStatWidget
\ No newline at end of file
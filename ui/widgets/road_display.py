@@ -0,0 +1,119 @@
+"""
+Big Road ve türetilmiş yolları (Big Eye Boy, Small Road, Cockroach Pig) gösteren widget modülü.
+Hücreler GameHistory'nin RoadEngine'inden okunur; yollar burada yeniden hesaplanmaz.
+"""
+from PyQt6.QtWidgets import QWidget, QGridLayout, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+from config import ROAD_ROWS, ROAD_DISPLAY_COLS, BORDER_COLOR, EMPTY_COLOR, PLAYER_COLOR, BANKER_COLOR
+from models.roads import RED, BLUE
+
+# Yol adı -> başlık (gösterim sırasıyla)
+ROAD_TITLES = {
+    'big_road': "Big Road",
+    'big_eye_boy': "Big Eye Boy",
+    'small_road': "Small Road",
+    'cockroach_pig': "Cockroach Pig",
+}
+
+# Hücre değeri -> (metin, arka plan rengi)
+ROAD_CELL_STYLES = {
+    'P': ('P', PLAYER_COLOR),
+    'B': ('B', BANKER_COLOR),
+    RED: ('', BANKER_COLOR),
+    BLUE: ('', PLAYER_COLOR),
+}
+
+class RoadGridWidget(QWidget):
+    """Tek bir yolun fiziksel yerleşimini ızgara şeklinde gösteren widget."""
+
+    def __init__(self, rows=ROAD_ROWS, cols=ROAD_DISPLAY_COLS, parent=None):
+        """
+        Args:
+            rows (int, optional): Satır sayısı.
+            cols (int, optional): Gösterilecek son sütun sayısı.
+            parent (QWidget, optional): Ebeveyn widget.
+        """
+        super().__init__(parent)
+
+        self.rows = rows
+        self.cols = cols
+
+        self.grid_layout = QGridLayout(self)
+        self.grid_layout.setSpacing(1)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.grid_labels = [[None for _ in range(cols)] for _ in range(rows)]
+        # Son çizilen değerler; yalnızca değişen hücrelerin stili yenilenir
+        self._shown = [[False for _ in range(cols)] for _ in range(rows)]
+
+        self._init_grid()
+
+    def _init_grid(self):
+        """Izgara etiketlerini başlatır."""
+        for r in range(self.rows):
+            for c in range(self.cols):
+                label = QLabel("")
+                label.setObjectName("RoadLabel")
+                label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+                self.grid_labels[r][c] = label
+                self.grid_layout.addWidget(label, r, c)
+
+    def update_display(self, road):
+        """Izgara görünümünü yolun son sütunlarıyla günceller.
+
+        Args:
+            road (RoadLayout): Gösterilecek yol.
+        """
+        grid = road.to_grid(self.cols)
+        for r in range(self.rows):
+            for c in range(self.cols):
+                value = grid[r][c]
+                if self._shown[r][c] == value:
+                    continue
+                self._shown[r][c] = value
+
+                text, bg_color = ROAD_CELL_STYLES.get(value, ('', EMPTY_COLOR))
+                label = self.grid_labels[r][c]
+                label.setText(text)
+                label.setStyleSheet(
+                    f"QLabel#RoadLabel {{ "
+                    f"background-color: {bg_color.name()}; "
+                    f"color: white; "
+                    f"border: 1px solid {BORDER_COLOR.name()}; "
+                    f"border-radius: 2px; "
+                    f"}}"
+                )
+
+class RoadsWidget(QWidget):
+    """Big Road'u ve üç türetilmiş yolu alt alta gösteren widget."""
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent (QWidget, optional): Ebeveyn widget.
+        """
+        super().__init__(parent)
+
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setSpacing(4)
+
+        self.road_grids = {}
+        for name, title in ROAD_TITLES.items():
+            title_label = QLabel(title)
+            title_label.setObjectName("RoadTitleLabel")
+            self.layout.addWidget(title_label)
+
+            grid = RoadGridWidget()
+            self.road_grids[name] = grid
+            self.layout.addWidget(grid)
+
+    def update_roads(self, roads):
+        """Tüm yol ızgaralarını günceller.
+
+        Args:
+            roads (RoadEngine): GameHistory'nin yol motoru.
+        """
+        for name, grid in self.road_grids.items():
+            grid.update_display(roads.road(name))
\ No newline at end of file
@@ -136,15 +136,11 @@ class ModelStatWidget(QWidget):
         """Model istatistiklerini günceller.
         
         Args:
-            models (list): Model verileri listesi.
+            models (ModelLeaderboard): Sıralamayı tutan model listesi.
             min_predictions (int, optional): Minimum tahmin sayısı.
         """
-        # Yeterli tahmini olan modelleri al ve doğruluk oranına göre sırala
-        ranked_models = sorted(
-            [m for m in models if m['total'] >= min_predictions],
-            key=lambda m: m['accuracy'],
-            reverse=True
-        )
+        # Yeterli tahmini olan ilk üç model (sıralama artımlı tutulur)
+        ranked_models = models.top(len(self.model_rows), min_predictions)
         
         # Her bir model satırını güncelle
         for i in range(3):